@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the build pipeline on synthetic corpora.
+
+For each corpus size (33, 1k and 10k examples by default) a synthetic
+project tree is generated with corpus.py and the main build steps are
+timed on it:
+
+    scan               scan_examples_directory
+    python segments    extract_python_segments on every Python file
+    shell segments     extract_shell_segments on every shell transcript
+    process examples   process_examples (parse + section assignment)
+    example pages      generate_example_html on an evenly spaced sample
+    index              generate_index_html
+    llms-ctx           generate_llms_ctx_txt
+
+Each run is appended to a JSON history file. Results are compared per item
+(per example, file or page) with the most recent earlier run on the same
+machine with the same corpus shape and settings, and the script exits with
+status 1 if any step got slower than the regression threshold allows.
+Steps that take less than --min-seconds in total are too noisy to judge
+and are never counted as regressions.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Make the build scripts importable
+sys.path.insert(0, str(PROJECT_ROOT / "build_examples"))
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from corpus import (
+    CorpusConfig,
+    add_corpus_arguments,
+    config_from_args,
+    generate_corpus,
+)
+from sources import SourceTree
+
+import build_static_site
+from build_examples import (
+    extract_python_segments,
+    extract_shell_segments,
+    process_examples,
+    scan_examples_directory,
+)
+from build_static_site import (
+    generate_example_html,
+    generate_index_html,
+    generate_llms_ctx_txt,
+)
+from sitegen.highlight import Highlighter
+from sitegen.navigation import Navigation
+
+DEFAULT_HISTORY_FILE = Path(__file__).parent / "history.json"
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> float:
+    """Return the best of several timings of function, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(
+    root: Path, config: CorpusConfig, repeat: int, page_sample: int
+) -> Dict[str, Dict[str, float]]:
+    """
+    Generate a corpus and time each build step on it.
+
+    Args:
+        root: Empty directory to generate the corpus in
+        config: Shape of the corpus
+        repeat: Timings per step; the best one is kept
+        page_sample: Maximum number of example pages to render
+
+    Returns:
+        Timings keyed by step name, each with the total seconds, the number
+        of items processed and the time per item in microseconds
+    """
+    examples_dir = generate_corpus(root, config)
+    output_dir = root / "docs"
+    output_dir.mkdir()
+
+    tree = SourceTree.scan(examples_dir)
+    python_files = [f.path for s in tree.examples for f in s.of_kind("python")]
+    shell_files = [f.path for s in tree.examples for f in s.of_kind("shell")]
+
+    def process():
+        # process_examples adds section info to the examples, so parse afresh
+        return process_examples(tree.examples, root)
+
+    catalog = process()
+    step = max(1, len(catalog.examples) // page_sample)
+    sampled_examples = catalog.examples[::step][:page_sample]
+
+    def render_pages():
+        # Highlight every page from scratch, like the other steps, and keep
+        # the project's own .build_cache out of the timings
+        cache_dir = Path(tempfile.mkdtemp(dir=root))
+        build_static_site.highlighter = Highlighter(cache_dir / "highlight")
+        # The navigation graph is computed once per build, as in the site build
+        navigation = Navigation(catalog.examples)
+        for example in sampled_examples:
+            generate_example_html(example, catalog, output_dir, tree, navigation)
+
+    steps = [
+        ("scan", len(tree.examples), lambda: scan_examples_directory(examples_dir)),
+        (
+            "python segments",
+            len(python_files),
+            lambda: [extract_python_segments(path) for path in python_files],
+        ),
+        (
+            "shell segments",
+            len(shell_files),
+            lambda: [extract_shell_segments(path) for path in shell_files],
+        ),
+        ("process examples", len(tree.examples), process),
+        ("example pages", len(sampled_examples), render_pages),
+        ("index", 1, lambda: generate_index_html(catalog, output_dir)),
+        ("llms-ctx", 1, lambda: generate_llms_ctx_txt(catalog, output_dir)),
+    ]
+
+    results = {}
+    for name, items, function in steps:
+        seconds = best_time(function, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "items": items,
+            "us_per_item": seconds / max(items, 1) * 1e6,
+        }
+    return results
+
+
+def current_commit() -> Optional[str]:
+    """Return the short hash of the checked-out commit, if in a git repo."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(history_file: Path) -> List[Dict[str, Any]]:
+    """Load earlier benchmark runs, oldest first."""
+    if not history_file.exists():
+        return []
+    with open(history_file, "r") as f:
+        return json.load(f)
+
+
+def find_baseline(
+    history: List[Dict[str, Any]], run: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Return the latest earlier run on the same machine and configuration."""
+    for previous in reversed(history):
+        if (
+            previous["machine"] == run["machine"]
+            and previous["config"] == run["config"]
+        ):
+            return previous
+    return None
+
+
+def report(
+    run: Dict[str, Any],
+    baseline: Optional[Dict[str, Any]],
+    threshold: float,
+    min_seconds: float,
+) -> int:
+    """
+    Print the results of a run next to its baseline.
+
+    Returns:
+        Number of steps that regressed by more than the threshold
+    """
+    if baseline is not None:
+        print(f"Comparing with {baseline['timestamp']} ({baseline['commit']})")
+
+    print(
+        f"{'examples':>8}  {'step':<17} {'items':>6} {'total s':>9} "
+        f"{'us/item':>10} {'change':>8}"
+    )
+    regressions = 0
+    for size, results in run["results"].items():
+        previous_results = baseline["results"].get(size, {}) if baseline else {}
+        for name, result in results.items():
+            change = ""
+            previous = previous_results.get(name)
+            if previous is not None and previous["us_per_item"] > 0:
+                ratio = result["us_per_item"] / previous["us_per_item"] - 1
+                change = f"{ratio:+.0%}"
+                if ratio > threshold and result["seconds"] >= min_seconds:
+                    change += " !"
+                    regressions += 1
+            print(
+                f"{size:>8}  {name:<17} {result['items']:>6} "
+                f"{result['seconds']:>9.4f} {result['us_per_item']:>10.1f} {change:>8}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the build pipeline")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[33, 1_000, 10_000],
+        help="Corpus sizes in examples",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timings per step")
+    parser.add_argument(
+        "--page-sample",
+        type=int,
+        default=500,
+        help="Maximum number of example pages rendered per corpus (default: 500)",
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=DEFAULT_HISTORY_FILE,
+        help="JSON file the results are appended to (default: benchmarks/history.json)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Slowdown per item counted as a regression (default: 0.10 = 10%%)",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.005,
+        help="Steps faster than this in total are not judged (default: 0.005)",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Do not append this run to the history"
+    )
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    # Measure the build steps, not log formatting
+    logging.disable(logging.INFO)
+
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": current_commit(),
+        "machine": f"{platform.node()} {platform.machine()}",
+        "python": platform.python_version(),
+        "config": {
+            **{
+                name: value
+                for name, value in asdict(config_from_args(args, 0)).items()
+                if name != "examples"
+            },
+            "repeat": args.repeat,
+            "page_sample": args.page_sample,
+        },
+        "results": {},
+    }
+
+    for size in args.sizes:
+        config = config_from_args(args, size)
+        print(f"Benchmarking {config.describe()}", file=sys.stderr)
+        with tempfile.TemporaryDirectory() as tmp:
+            run["results"][str(size)] = run_benchmarks(
+                Path(tmp), config, args.repeat, args.page_sample
+            )
+
+    history = load_history(args.history)
+    regressions = report(
+        run, find_baseline(history, run), args.threshold, args.min_seconds
+    )
+
+    if not args.no_save:
+        history.append(run)
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, "w") as f:
+            json.dump(history, f, indent=2)
+
+    if regressions:
+        print(f"{regressions} step(s) regressed by more than {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
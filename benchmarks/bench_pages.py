@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of example page rendering, in pages per second.
+
+Generates a synthetic corpus with corpus.py and renders every example page
+with generate_example_html, the way the site build does (one navigation
+graph for all pages). Image copying is part of a page's cost in a real
+build, so the default corpus has images; pass --images 0 to time the HTML
+alone.
+
+Run it on two commits to compare them. Page writes dominate on a disk,
+so point TMPDIR at a tmpfs to measure rendering:
+
+    TMPDIR=/dev/shm python benchmarks/bench_pages.py --examples 1000
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Make the build scripts importable
+sys.path.insert(0, str(PROJECT_ROOT / "build_examples"))
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from corpus import add_corpus_arguments, config_from_args, generate_corpus
+from sources import SourceTree
+
+import build_static_site
+from build_examples import process_examples
+from build_static_site import generate_example_html
+from sitegen.highlight import Highlighter
+from sitegen.navigation import Navigation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure example pages per second")
+    parser.add_argument(
+        "--examples", type=int, default=1_000, help="Corpus size (default: 1000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed renders of the corpus"
+    )
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    # Measure rendering, not log formatting
+    logging.disable(logging.INFO)
+
+    config = config_from_args(args, args.examples)
+    print(f"Rendering {config.describe()}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        tree = SourceTree.scan(generate_corpus(root, config))
+        catalog = process_examples(tree.examples, root)
+        navigation = Navigation(catalog.examples)
+        output_dir = root / "docs"
+        # Leave the project's own .build_cache alone
+        highlighter = Highlighter(root / "highlight")
+        build_static_site.highlighter = highlighter
+
+        def render_all() -> None:
+            for example in catalog.examples:
+                generate_example_html(example, catalog, output_dir, tree, navigation)
+
+        # The first pass creates the output directories and fills the
+        # highlight cache on disk, as a previous build would have
+        render_all()
+
+        timings = []
+        for _ in range(args.repeat):
+            # A new build process starts without highlighted code in memory
+            highlighter.memo.clear()
+            start = time.perf_counter()
+            render_all()
+            timings.append(time.perf_counter() - start)
+
+    pages = len(catalog.examples)
+    best = min(timings)
+    median = sorted(timings)[len(timings) // 2]
+    print(f"{pages} pages: best {best:.3f}s, median {median:.3f}s")
+    print(f"{pages / best:.0f} pages/s (best), {pages / median:.0f} pages/s (median)")
+
+
+if __name__ == "__main__":
+    main()
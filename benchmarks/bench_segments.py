@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Python segment extractor.
+
+Generates synthetic example files of increasing size (up to 100k lines) and
+times extract_python_segments on each, reporting throughput and how the
+runtime scales with file size. A linear extractor should keep the
+time-per-line roughly constant across sizes.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make the build scripts importable
+sys.path.insert(0, str(Path(__file__).parent.parent / "build_examples"))
+
+from build_examples import extract_python_segments
+
+# One repeating block: comments, code with inline comments, a docstring
+# containing a line that starts with '#', and a header with no code after it
+BLOCK = '''# Explain the next step
+# over a couple of lines
+response = client.models.generate_content(  # inline comment
+    model="gemini-2.0-flash",
+    contents="Tell me about cats",
+)
+
+def describe(value):
+    """
+    Describe a value.
+    # this line belongs to the docstring
+    """
+    return str(value)
+
+# Section header
+#
+'''
+
+
+def write_synthetic_file(path: Path, num_lines: int, docstrings: bool = True) -> None:
+    """Write a synthetic example file with roughly num_lines lines."""
+    block = BLOCK if docstrings else BLOCK.replace('"""', "#")
+    repeats = max(1, num_lines // block.count("\n"))
+    path.write_text("# Synthetic example\n# Benchmark input\n\n" + block * repeats)
+
+
+def time_extraction(path: Path, repeat: int) -> float:
+    """Return the best of several extraction timings, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_python_segments(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark extract_python_segments")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 50_000, 100_000],
+        help="Synthetic file sizes in lines",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timings per size")
+    parser.add_argument(
+        "--no-docstrings",
+        action="store_true",
+        help="Generate files without multi-line strings (prefix-check fast path)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'lines':>10} {'seconds':>10} {'lines/s':>12} {'us/line':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            path = Path(tmp_dir) / f"synthetic-{size}.py"
+            write_synthetic_file(path, size, docstrings=not args.no_docstrings)
+            num_lines = path.read_text().count("\n")
+            seconds = time_extraction(path, args.repeat)
+            print(
+                f"{num_lines:>10} {seconds:>10.4f} {num_lines / seconds:>12,.0f} "
+                f"{seconds / num_lines * 1e6:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Fuzz and throughput benchmark for the shell transcript parser.
+
+The fuzz mode generates random transcripts from a small vocabulary of
+tricky lines and checks extract_shell_segments against the regex it
+replaced. The throughput mode times the parser on large synthetic
+transcripts with multi-megabyte command outputs.
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make the build scripts importable
+sys.path.insert(0, str(Path(__file__).parent.parent / "build_examples"))
+
+from build_examples import extract_shell_segments
+
+# The regex-based parser extract_shell_segments used to run over the whole file
+REFERENCE_PATTERN = re.compile(
+    r"(?:^|\n)(?:# (.+?)(?:\n|$))?(?:\$ (.+?)(?:\n|$))((?:(?!\n\$|\n#).+?\n?)*)",
+    re.MULTILINE,
+)
+
+FUZZ_LINES = [
+    "",
+    "",
+    "$ python example.py",
+    "$ pip install google-genai",
+    "$ ",
+    "$",
+    "$  ",
+    " $ indented",
+    "# Run the example",
+    "# ",
+    "#",
+    "#no-space",
+    "output line",
+    "  padded output  ",
+    "   ",
+    "\t",
+    "$$ odd",
+    "# $ commented command",
+]
+
+
+def reference_segments(content: str) -> list:
+    """Parse a transcript with the original regex."""
+    return [
+        {
+            "explanation": match.group(1) or "",
+            "command": match.group(2).strip(),
+            "output": match.group(3).strip(),
+        }
+        for match in REFERENCE_PATTERN.finditer(content)
+    ]
+
+
+def run_fuzz(iterations: int, seed: int, tmp_dir: Path) -> int:
+    """Compare the parser with the reference on random transcripts."""
+    rng = random.Random(seed)
+    path = tmp_dir / "fuzz.sh"
+    failures = 0
+    for i in range(iterations):
+        lines = [rng.choice(FUZZ_LINES) for _ in range(rng.randint(0, 30))]
+        content = "\n".join(lines) + rng.choice(["", "\n", "\n\n"])
+        path.write_text(content)
+        expected = reference_segments(content)
+        # The reference returns segments as they were before ShellSegment
+        actual = [segment.to_dict() for segment in extract_shell_segments(path)]
+        if actual != expected:
+            failures += 1
+            if failures <= 3:
+                print(f"Mismatch on iteration {i}: {content!r}")
+                print(f"  expected: {expected}")
+                print(f"  actual:   {actual}")
+    print(f"Fuzz: {iterations - failures}/{iterations} transcripts matched")
+    return failures
+
+
+def write_transcript(path: Path, output_lines: int, commands: int) -> None:
+    """Write a transcript with long outputs, like pasted transcription logs."""
+    with open(path, "w") as f:
+        for i in range(commands):
+            f.write(f"# Step {i}\n$ python transcribe.py part-{i}.mp3\n")
+            f.writelines(
+                f"[{j:06d}] speaker {j % 3}: some transcribed words here\n"
+                for j in range(output_lines)
+            )
+            f.write("\n")
+
+
+def run_throughput(sizes: list, commands: int, tmp_dir: Path, reference: bool) -> None:
+    """Time the parser (and optionally the reference) on large transcripts."""
+    header = f"{'MB':>8} {'parser s':>10} {'MB/s':>8}"
+    print(header + (f" {'regex s':>10}" if reference else ""))
+    for output_lines in sizes:
+        path = tmp_dir / f"transcript-{output_lines}.sh"
+        write_transcript(path, output_lines, commands)
+        megabytes = path.stat().st_size / 1e6
+
+        start = time.perf_counter()
+        extract_shell_segments(path)
+        seconds = time.perf_counter() - start
+        row = f"{megabytes:>8.2f} {seconds:>10.4f} {megabytes / seconds:>8.1f}"
+
+        if reference:
+            content = path.read_text()
+            start = time.perf_counter()
+            reference_segments(content)
+            row += f" {time.perf_counter() - start:>10.4f}"
+        print(row)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fuzz and benchmark the shell parser")
+    parser.add_argument("--iterations", type=int, default=5000, help="Fuzz cases")
+    parser.add_argument("--seed", type=int, default=0, help="Fuzz random seed")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 50_000, 100_000],
+        help="Output lines per command in the throughput transcripts",
+    )
+    parser.add_argument(
+        "--commands", type=int, default=4, help="Commands per transcript"
+    )
+    parser.add_argument(
+        "--reference",
+        action="store_true",
+        help="Also time the original regex for comparison",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        failures = run_fuzz(args.iterations, args.seed, tmp_dir)
+        run_throughput(args.sizes, args.commands, tmp_dir, args.reference)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
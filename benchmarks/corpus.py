@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Synthetic example corpus for benchmarking the build pipeline.
+
+generate_corpus writes a project tree shaped like the real one: an
+examples/ directory with N numbered example directories (a Python file, a
+shell transcript, a documentation links file and optional images each)
+and a data/sections.json that groups them into sections, leaving a few
+uncategorized so the default section is exercised too. The output is
+fully determined by the arguments, so runs are comparable.
+
+Run it directly to write a corpus for manual inspection:
+
+    python benchmarks/corpus.py /tmp/corpus --examples 1000
+"""
+
+import argparse
+import json
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class CorpusConfig:
+    """Shape of a synthetic corpus."""
+
+    # Number of example directories
+    examples: int = 33
+    # Comment + code blocks in each Python file
+    code_blocks: int = 8
+    # Comment lines above each code block
+    comment_lines: int = 2
+    # Code lines in each code block
+    code_lines: int = 4
+    # Commands in each shell transcript
+    shell_commands: int = 3
+    # Output lines after each command
+    shell_output_lines: int = 5
+    # Images in every fourth example
+    images: int = 1
+    # Width and height of each generated PNG
+    image_size: int = 64
+    # Examples per section
+    section_size: int = 10
+
+    def describe(self) -> str:
+        return (
+            f"{self.examples} examples, {self.code_blocks}x({self.comment_lines}+"
+            f"{self.code_lines}) code lines, {self.shell_commands}x"
+            f"{self.shell_output_lines} shell lines, {self.images} image(s) "
+            f"of {self.image_size}px every 4th example"
+        )
+
+
+def png_bytes(size: int, seed: int) -> bytes:
+    """Return a valid RGB gradient PNG of size x size pixels."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+        )
+
+    rows = b"".join(
+        b"\0" + bytes((x * 7 + y * 3 + seed) & 0xFF for x in range(size * 3))
+        for y in range(size)
+    )
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def python_source(index: int, config: CorpusConfig) -> str:
+    """Return the Python file of one synthetic example."""
+    lines = [
+        f"# Synthetic example {index}",
+        (
+            f"# Benchmark example number {index}. It calls the API a few times "
+            "and prints the results."
+        ),
+        "",
+    ]
+    for block in range(config.code_blocks):
+        if block % 3 == 2:
+            # A header comment with no code directly after it
+            lines.append(f"# Step {block}")
+            lines.append("")
+        for line in range(config.comment_lines):
+            lines.append(f"# Explain line {line} of block {block} in example {index}.")
+        for line in range(config.code_lines):
+            lines.append(
+                f"value_{block}_{line} = client.models.generate_content("
+                f'model="gemini-2.0-flash", contents="prompt {line}")  # call {line}'
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def shell_source(index: int, config: CorpusConfig) -> str:
+    """Return the shell transcript of one synthetic example."""
+    lines = []
+    for command in range(config.shell_commands):
+        lines.append(f"# Run step {command} of example {index}")
+        lines.append(f"$ python example_{index}.py --step {command}")
+        for line in range(config.shell_output_lines):
+            lines.append(f"Output line {line}: the model answered something useful")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_corpus(root: Path, config: CorpusConfig) -> Path:
+    """
+    Write a synthetic project tree.
+
+    Args:
+        root: Directory to create the tree in
+        config: Shape of the corpus
+
+    Returns:
+        Path to the examples directory inside root
+    """
+    examples_dir = root / "examples"
+    examples_dir.mkdir(parents=True, exist_ok=True)
+
+    example_ids = []
+    for index in range(1, config.examples + 1):
+        name = f"synthetic-{index}"
+        example_id = f"{index:05d}-{name}"
+        example_ids.append(example_id)
+        example_dir = examples_dir / example_id
+        example_dir.mkdir(exist_ok=True)
+
+        (example_dir / f"{name}.py").write_text(python_source(index, config))
+        (example_dir / f"{name}.sh").write_text(shell_source(index, config))
+        (example_dir / f"{name}_links.txt").write_text(
+            f"https://ai.google.dev/gemini-api/docs/example-{index}\n"
+        )
+        if index % 4 == 0:
+            for image in range(config.images):
+                (example_dir / f"{image + 1:02d}-output-{image}.png").write_bytes(
+                    png_bytes(config.image_size, index + image)
+                )
+
+    # Group examples into sections, leaving the last few uncategorized
+    categorized = example_ids[: max(0, len(example_ids) - 3)]
+    sections = []
+    for start in range(0, len(categorized), config.section_size):
+        number = len(sections) + 1
+        sections.append(
+            {
+                "id": f"{number:03d}-section-{number}",
+                "title": f"Section {number}",
+                "description": f"Synthetic section number {number}",
+                "order": number,
+                "examples": categorized[start : start + config.section_size],
+            }
+        )
+
+    data_dir = root / "data"
+    data_dir.mkdir(exist_ok=True)
+    with open(data_dir / "sections.json", "w") as f:
+        json.dump({"sections": sections}, f, indent=2)
+
+    return examples_dir
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add one option per CorpusConfig field to a parser."""
+    defaults = CorpusConfig()
+    for name in CorpusConfig.__dataclass_fields__:
+        if name == "examples":
+            continue
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=int,
+            default=getattr(defaults, name),
+            help=f"(default: {getattr(defaults, name)})",
+        )
+
+
+def config_from_args(args: argparse.Namespace, examples: int) -> CorpusConfig:
+    """Build a CorpusConfig from parsed add_corpus_arguments options."""
+    values = {
+        name: getattr(args, name)
+        for name in CorpusConfig.__dataclass_fields__
+        if name != "examples"
+    }
+    return CorpusConfig(examples=examples, **values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic example corpus")
+    parser.add_argument("root", type=Path, help="Directory to create the corpus in")
+    parser.add_argument("--examples", type=int, default=33, help="Number of examples")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    config = config_from_args(args, args.examples)
+    generate_corpus(args.root, config)
+    print(f"Wrote {config.describe()} to {args.root}")
+
+
+if __name__ == "__main__":
+    main()
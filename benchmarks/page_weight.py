@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Page weight of a built site: the size of every HTML page, raw and gzipped.
+
+Pass one docs directory to list its pages, or two to compare builds, e.g.
+a build of the previous commit against the current one:
+
+    git worktree add /tmp/before HEAD~1
+    (cd /tmp/before && python build_static_site.py)
+    python build_static_site.py
+    python benchmarks/page_weight.py /tmp/before/docs docs
+
+Only the HTML is counted; stylesheets, scripts and images are cached across
+pages or loaded lazily.
+"""
+
+import argparse
+import gzip
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+def page_weights(docs_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """Return the raw and gzipped size of each page, keyed by relative path."""
+    weights = {}
+    for page in sorted(docs_dir.rglob("*.html")):
+        data = page.read_bytes()
+        weights[page.relative_to(docs_dir).as_posix()] = (
+            len(data),
+            len(gzip.compress(data, compresslevel=9, mtime=0)),
+        )
+    return weights
+
+
+def _change(before: int, after: int) -> str:
+    return f"{(after - before) / before:+.0%}" if before else ""
+
+
+def format_row(label: str, width: int, cells: List[Tuple[int, int]]) -> str:
+    """Format the (raw, gzipped) sizes of a page in one or two builds."""
+    if len(cells) == 1:
+        ((raw, gzipped),) = cells
+        return f"{label:<{width}}  {raw:>9,}  {gzipped:>9,}"
+    (raw_before, gzip_before), (raw_after, gzip_after) = cells
+    return (
+        f"{label:<{width}}  {raw_before:>9,}  {raw_after:>9,}  "
+        f"{_change(raw_before, raw_after):>6}  {gzip_before:>9,}  "
+        f"{gzip_after:>9,}  {_change(gzip_before, gzip_after):>6}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report the page weight of a site")
+    parser.add_argument(
+        "docs", type=Path, nargs="+", help="One or two docs directories"
+    )
+    args = parser.parse_args()
+    if len(args.docs) > 2:
+        parser.error("pass one docs directory, or two to compare")
+
+    builds = [page_weights(docs_dir) for docs_dir in args.docs]
+    pages = sorted(set().union(*builds))
+    width = max(len(page) for page in pages)
+
+    if len(builds) == 1:
+        print(f"{'page':<{width}}  {'bytes':>9}  {'gzip':>9}")
+    else:
+        print(
+            f"{'page':<{width}}  {'before':>9}  {'after':>9}  {'change':>6}  "
+            f"{'gz before':>9}  {'gz after':>9}  {'change':>6}"
+        )
+
+    totals = [(0, 0)] * len(builds)
+    for page in pages:
+        cells = [build.get(page, (0, 0)) for build in builds]
+        totals = [
+            (raw + total_raw, gzipped + total_gzipped)
+            for (raw, gzipped), (total_raw, total_gzipped) in zip(cells, totals)
+        ]
+        print(format_row(page, width, cells))
+    print(format_row("total", width, totals))
+
+
+if __name__ == "__main__":
+    main()
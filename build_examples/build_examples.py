@@ -7,13 +7,38 @@ shell commands, annotations) and compiles them into an optimised data format (JS
 It also supports organizing examples into sections.
 """
 
-import os
-import json
-import re
 import argparse
+import functools
+import hashlib
+import json
 import logging
+import os
+import re
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from encoding import OUTPUT_FORMATS, encode_catalog
+from models import (
+    DEFAULT_SECTION_ID,
+    DEFAULT_SECTION_ORDER,
+    CodeSegment,
+    Example,
+    ExampleCatalog,
+    ExampleImage,
+    Section,
+    ShellSegment,
+    map_comments_to_code,
+)
+from profiling import profiler
+from sources import (
+    ExampleSources,
+    SourceTree,
+    load_file_hashes,
+    save_file_hashes,
+)
+from workers import init_worker_logging, replay_logs, take_worker_logs
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +46,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Version of the build manifest format; bump when its layout changes
+MANIFEST_VERSION = 1
+
+# The build manifest, relative to the project root
+MANIFEST_FILE = Path(".build_cache") / "examples-manifest.json"
+
+# Where --profile writes its Chrome trace unless given a path
+DEFAULT_PROFILE_FILE = (
+    Path(__file__).parent.parent / ".build_cache" / "profile-trace.json"
+)
+
 
 def scan_examples_directory(examples_dir: Path) -> List[Path]:
     """
@@ -33,75 +69,114 @@ def scan_examples_directory(examples_dir: Path) -> List[Path]:
         List of paths to example directories
     """
     example_dirs = []
-    for item in os.listdir(examples_dir):
-        item_path = examples_dir / item
-        if item_path.is_dir() and re.match(r"^\d+", item):
-            example_dirs.append(item_path)
+    with os.scandir(examples_dir) as entries:
+        for entry in entries:
+            if re.match(r"^\d+", entry.name) and entry.is_dir():
+                example_dirs.append(examples_dir / entry.name)
 
     # Sort by the numeric prefix
     example_dirs.sort(key=lambda p: int(p.name.split("-")[0]))
     return example_dirs
 
 
-def extract_python_segments(file_path: Path) -> List[Dict[str, Any]]:
+def scan_source_tree(
+    examples_dir: Path, project_root: Path, use_cache: bool = True
+) -> SourceTree:
+    """
+    Build the single-pass manifest of the examples tree.
+
+    Per-file hashes are kept in the build cache, so only files whose size or
+    modification time changed since the last build are read and hashed.
+
+    Args:
+        examples_dir: Path to the examples directory
+        project_root: Path to the project root directory
+        use_cache: Whether to reuse hashes from the previous build
+
+    Returns:
+        The scanned source tree
+    """
+    with profiler.phase("scan"):
+        hashes_file = project_root / ".build_cache" / "source-files.json"
+        known_hashes = load_file_hashes(hashes_file) if use_cache else {}
+        tree = SourceTree.scan(examples_dir, known_hashes)
+        save_file_hashes(hashes_file, tree)
+    return tree
+
+
+def find_comment_lines(lines: List[str]) -> List[bool]:
+    """
+    Work out which lines of a Python file are full-line comments.
+
+    Uses the tokenize stream, so lines inside multi-line strings and
+    docstrings that happen to start with '#' count as code, and trailing
+    inline comments stay attached to their code line. If the file cannot be
+    fully tokenized, the remaining lines fall back to a simple prefix check.
+
+    Args:
+        lines: Lines of the Python file, including line endings
+
+    Returns:
+        List with one flag per line, True for comment-only lines
+    """
+    # Without multi-line strings a prefix check is exact and much cheaper
+    # than tokenizing, so only pay for the tokenizer when it matters
+    has_multiline_strings = any(
+        '"""' in line or "'''" in line or line.endswith("\\\n") for line in lines
+    )
+    if not has_multiline_strings:
+        return [line.lstrip().startswith("#") for line in lines]
+
+    is_comment = [False] * len(lines)
+    tokenized_rows = 0
+    readline = functools.partial(next, iter(lines), "")
+
+    try:
+        for token in tokenize.generate_tokens(readline):
+            row, col = token.start
+            if token.type == tokenize.COMMENT and not token.line[:col].strip():
+                is_comment[row - 1] = True
+            tokenized_rows = token.end[0]
+    except (tokenize.TokenError, SyntaxError):
+        pass
+
+    for i in range(tokenized_rows, len(lines)):
+        is_comment[i] = lines[i].lstrip().startswith("#")
+
+    return is_comment
+
+
+def extract_python_segments(file_path: Path) -> List[CodeSegment]:
     """
     Extract code segments and annotations from a Python file.
 
+    Consecutive comment lines and consecutive code lines are grouped into
+    alternating segments in a single pass over the file.
+
     Args:
         file_path: Path to the Python file
 
     Returns:
-        List of dictionaries containing segment data
+        List of code segments
     """
     with open(file_path, "r") as f:
         lines = f.readlines()
 
+    comment_flags = find_comment_lines(lines)
     segments = []
-    current_segment = None
-    line_number = 1
-
-    # Process each line
-    for i, line in enumerate(lines):
-        stripped = line.rstrip()
-
-        # Check if this is a comment line
-        is_comment = stripped.lstrip().startswith("#")
+    block_start = 0
 
-        # Start a new segment if necessary
-        if current_segment is None or current_segment["is_comment"] != is_comment:
-            # Save the current segment if it exists
-            if current_segment is not None:
-                current_segment["line_range"] = (
-                    current_segment["start_line"],
-                    line_number - 1,
-                )
-                segments.append(current_segment)
+    # Split the file into runs of lines with the same comment flag
+    for i in range(1, len(lines) + 1):
+        if i < len(lines) and comment_flags[i] == comment_flags[block_start]:
+            continue
 
-            # Start a new segment
-            current_segment = {
-                "code": line,
-                "display_code": "" if is_comment else line,
-                "annotation": stripped.lstrip("# ") if is_comment else "",
-                "is_comment": is_comment,
-                "start_line": line_number,
-            }
-        else:
-            # Continue the current segment
-            current_segment["code"] += line
-            if not is_comment:
-                current_segment["display_code"] += line
-            elif stripped.lstrip().startswith("#"):
-                # Append to annotation for multi-line comments
-                if current_segment["annotation"]:
-                    current_segment["annotation"] += "\n"
-                current_segment["annotation"] += stripped.lstrip("# ")
-
-        line_number += 1
-
-    # Add the last segment
-    if current_segment is not None:
-        current_segment["line_range"] = (current_segment["start_line"], line_number - 1)
-        segments.append(current_segment)
+        segments.append(
+            CodeSegment.from_lines(
+                lines[block_start:i], block_start + 1, comment_flags[block_start]
+            )
+        )
+        block_start = i
 
     # Map comments to code
     map_comments_to_code(segments)
@@ -109,83 +184,71 @@ def extract_python_segments(file_path: Path) -> List[Dict[str, Any]]:
     return segments
 
 
-def map_comments_to_code(segments: List[Dict[str, Any]]) -> None:
-    """
-    Determine which code blocks each comment should align with.
-    Modifies the segments list in place.
-
-    Args:
-        segments: List of segment dictionaries
-    """
-    for i, segment in enumerate(segments):
-        if segment["is_comment"]:
-            # Look for the next code segment
-            next_code_index = None
-            for j in range(i + 1, len(segments)):
-                if not segments[j]["is_comment"]:
-                    next_code_index = j
-                    break
-
-            if next_code_index is not None:
-                # Found a code segment after this comment
-                next_code = segments[next_code_index]
-                segment["target_line_range"] = next_code["line_range"]
-            elif i > 0 and not segments[i - 1]["is_comment"]:
-                # No code after, but there's code before
-                segment["target_line_range"] = segments[i - 1]["line_range"]
-            else:
-                # No related code found
-                segment["target_line_range"] = segment["line_range"]
-
-
-def extract_shell_segments(file_path: Path) -> List[Dict[str, Any]]:
+def extract_shell_segments(file_path: Path) -> List[ShellSegment]:
     """
     Extract command and output segments from a shell file.
 
+    The file is streamed line by line through a small state machine, so the
+    cost is linear in the file size no matter how long the outputs are.
+    A segment starts at a line beginning with '$ ', optionally explained by
+    a '# ' line directly above it, and its output runs until the next blank
+    line.
+
     Args:
         file_path: Path to the shell file
 
     Returns:
-        List of dictionaries containing shell segment data
+        List of shell segments
     """
-    with open(file_path, "r") as f:
-        content = f.read()
-
     segments = []
+    current_segment = None
+    output_lines = []
+    previous_line = None
 
-    # Extract commands and their outputs
-    # Format is typically:
-    # $ command
-    # output
-    pattern = (
-        r"(?:^|\n)(?:# (.+?)(?:\n|$))?(?:\$ (.+?)(?:\n|$))((?:(?!\n\$|\n#).+?\n?)*)"
-    )
-    matches = re.finditer(pattern, content, re.MULTILINE)
+    with open(file_path, "r") as f:
+        for line in f:
+            line = line.removesuffix("\n")
 
-    for match in matches:
-        explanation = match.group(1) or ""
-        command = match.group(2).strip()
-        output = match.group(3).strip()
+            # Inside a command's output: everything up to a blank line
+            if current_segment is not None:
+                if line:
+                    output_lines.append(line)
+                    continue
+                current_segment.output = "\n".join(output_lines).strip()
+                segments.append(current_segment)
+                current_segment = None
+
+            elif line.startswith("$ ") and len(line) > 2:
+                explanation = ""
+                if previous_line is not None and previous_line.startswith("# "):
+                    explanation = previous_line[2:]
+                current_segment = ShellSegment(
+                    explanation=explanation, command=line[2:].strip(), output=""
+                )
+                output_lines = []
+                continue
 
-        segments.append(
-            {"explanation": explanation, "command": command, "output": output}
-        )
+            previous_line = line
+
+    if current_segment is not None:
+        current_segment.output = "\n".join(output_lines).strip()
+        segments.append(current_segment)
 
     return segments
 
 
-def extract_title_and_description(segments: List[Dict[str, Any]]) -> Tuple[str, str]:
+def extract_title_and_description(segments: List[CodeSegment]) -> Tuple[str, str]:
     """
     Extract title and description from the first comment segment.
 
     Args:
-        segments: List of segment dictionaries
+        segments: List of code segments
 
     Returns:
         Tuple containing (title, description)
     """
-    if segments and segments[0]["is_comment"]:
-        lines = segments[0]["annotation"].split("\n")
+    if segments and segments[0].is_comment:
+        lines = segments[0].annotation.split("\n")
         # First line is title
         title = lines[0].strip()
         # The rest is the intro paragraph/description
@@ -200,36 +263,38 @@ def extract_title_and_description(segments: List[Dict[str, Any]]) -> Tuple[str,
     return "Untitled Example", ""
 
 
-def process_example_directory(example_dir: Path) -> Dict[str, Any]:
+def process_example_directory(
+    example_dir: Path, sources: Optional[ExampleSources] = None
+) -> Optional[Example]:
     """
     Process a single example directory and compile its data.
 
     Args:
         example_dir: Path to the example directory
+        sources: Manifest entry for the directory. If not given, the
+            directory is scanned on the spot.
 
     Returns:
-        Dictionary containing compiled example data
+        The compiled example, or None if the directory has no Python file
     """
+    if sources is None:
+        sources = ExampleSources.scan(example_dir)
+
     example_id = example_dir.name
     order = int(example_id.split("-")[0])
 
     # Find Python and shell files (excluding *_requests.py files)
-    python_files = [f for f in example_dir.glob("*.py") if not f.name.endswith("_requests.py")]
-    shell_files = list(example_dir.glob("*.sh"))
-    
-    # Find image files (PNG, JPG, JPEG, GIF)
-    image_files = list(example_dir.glob("*.png")) + list(example_dir.glob("*.jpg")) + \
-                  list(example_dir.glob("*.jpeg")) + list(example_dir.glob("*.gif"))
-    
-    # Sort image files by name for consistent order
-    image_files.sort(key=lambda p: p.name)
-    
+    python_files = [f.path for f in sources.of_kind("python")]
+    shell_files = [f.path for f in sources.of_kind("shell")]
+
+    # Find image files (PNG, JPG, JPEG, GIF), already sorted by name
+    image_files = [f.path for f in sources.of_kind("image")]
+
     # Find documentation links file
-    example_name = example_id.split("-", 1)[1]
-    links_file = example_dir / f"{example_name}_links.txt"
     documentation_links = []
-    if links_file.exists():
-        with open(links_file, "r") as f:
+    links_files = sources.of_kind("links")
+    if links_files:
+        with open(links_files[0].path, "r") as f:
             documentation_links = [line.strip() for line in f.readlines() if line.strip()]
         logger.info(f"Found {len(documentation_links)} documentation links for {example_id}")
 
@@ -257,25 +322,96 @@ def process_example_directory(example_dir: Path) -> Dict[str, Any]:
         parts = filename.split("-", 1)
         caption = parts[1].replace("-", " ").capitalize() if len(parts) > 1 else filename
         
-        image_data.append({
-            "path": str(image_file.relative_to(example_dir.parent.parent)),
-            "filename": image_file.name,
-            "caption": caption
-        })
+        image_data.append(
+            ExampleImage(
+                path=str(image_file.relative_to(example_dir.parent.parent)),
+                filename=image_file.name,
+                caption=caption,
+            )
+        )
 
     # Compile the example data
-    example_data = {
-        "id": example_id,
-        "title": title,
-        "description": description,
-        "order": order,
-        "code_segments": code_segments,
-        "shell_segments": shell_segments,
-        "image_data": image_data,
-        "documentation_links": documentation_links
+    return Example(
+        id=example_id,
+        title=title,
+        description=description,
+        order=order,
+        code_segments=code_segments,
+        shell_segments=shell_segments,
+        image_data=image_data,
+        documentation_links=documentation_links,
+    )
+
+
+def parser_fingerprint() -> str:
+    """
+    Compute a hash of the build scripts themselves.
+
+    Cached example data is only valid for the parser that produced it, so any
+    change to the build code invalidates the whole manifest.
+    """
+    digest = hashlib.sha256()
+    for source_file in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source_file.read_bytes())
+    return digest.hexdigest()
+
+
+def load_build_manifest(manifest_file: Path) -> Dict[str, Any]:
+    """
+    Load the persistent build manifest from a previous run.
+
+    The manifest maps each example id to the hash of its inputs and the
+    example data compiled from them, and records the data file written last
+    (see write_examples_data). A missing, unreadable or outdated manifest
+    yields one without examples, which results in a full rebuild.
+
+    Args:
+        manifest_file: Path to the manifest file
+
+    Returns:
+        Dictionary containing the manifest data
+    """
+    empty_manifest = {
+        "version": MANIFEST_VERSION,
+        "parser": parser_fingerprint(),
+        "examples": {},
     }
+    if not manifest_file.exists():
+        return empty_manifest
+
+    try:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable build manifest {manifest_file}: {e}")
+        return empty_manifest
 
-    return example_data
+    if (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("parser") != empty_manifest["parser"]
+    ):
+        logger.info("Build scripts changed since the last run, rebuilding all examples")
+        # The data file is checked by its hash, whichever parser wrote it
+        if "data_file" in manifest:
+            empty_manifest["data_file"] = manifest["data_file"]
+        return empty_manifest
+
+    return manifest
+
+
+def save_build_manifest(manifest_file: Path, manifest: Dict[str, Any]) -> None:
+    """
+    Write the build manifest so the next run can reuse unchanged examples.
+
+    Args:
+        manifest_file: Path to the manifest file
+        manifest: Manifest data as returned by process_examples
+    """
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = manifest_file.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_file, manifest_file)
 
 
 def load_sections(project_root: Path) -> Dict[str, Any]:
@@ -301,96 +437,327 @@ def load_sections(project_root: Path) -> Dict[str, Any]:
         return {"sections": []}
 
 
-def process_examples(example_dirs: List[Path], project_root: Path) -> Dict[str, Any]:
+def _parse_in_worker(
+    example_dir: Path, sources: ExampleSources
+) -> Tuple[Optional[Example], list]:
+    """Parse one example directory and return the log records it produced."""
+    return process_example_directory(example_dir, sources), take_worker_logs()
+
+
+def parse_example_directories(
+    example_sources: List[ExampleSources], jobs: int = 1
+) -> Dict[str, Optional[Example]]:
+    """
+    Run process_example_directory over several directories.
+
+    With more than one job the directories are parsed in a process pool.
+    Results are keyed by directory name, so callers can reassemble them in
+    a deterministic order regardless of which worker finished first, and
+    the workers' log lines are replayed in directory order as well.
+
+    Args:
+        example_sources: Manifest entries of the directories to parse
+        jobs: Number of worker processes to use
+
+    Returns:
+        Dictionary mapping directory names to compiled examples
     """
-    Process all example directories and compile them into a JSON structure.
+    for sources in example_sources:
+        logger.info(f"Processing example: {sources.name}")
+
+    if jobs <= 1 or len(example_sources) <= 1:
+        compiled = {}
+        for sources in example_sources:
+            with profiler.phase("parse example", example=sources.name):
+                compiled[sources.name] = process_example_directory(sources.path, sources)
+        return compiled
+
+    workers = min(jobs, len(example_sources))
+    chunksize = max(1, len(example_sources) // (workers * 4))
+    compiled = {}
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker_logging
+    ) as executor:
+        results = executor.map(
+            _parse_in_worker,
+            [s.path for s in example_sources],
+            example_sources,
+            chunksize=chunksize,
+        )
+        # Replay worker logs in directory order, whichever worker finished first
+        for sources, (data, records) in zip(example_sources, results):
+            replay_logs(records)
+            compiled[sources.name] = data
+    return compiled
+
+
+def process_examples(
+    example_sources: List[ExampleSources],
+    project_root: Path,
+    manifest: Optional[Dict[str, Any]] = None,
+    jobs: int = 1,
+) -> ExampleCatalog:
+    """
+    Process all example directories and compile them into a catalog.
     Organizes examples into sections if sections.json is available.
 
     Args:
-        example_dirs: List of paths to example directories
+        example_sources: Manifest entries of the example directories
         project_root: Path to the project root directory
+        manifest: Optional build manifest from a previous run. Examples whose
+            inputs are unchanged are reused from it instead of being parsed
+            again, and the manifest is updated in place for the next run.
+        jobs: Number of worker processes used to parse changed examples
 
     Returns:
-        Dictionary representing the compiled examples data with sections
+        Catalog of the compiled examples and their sections
     """
     # Process all examples
     examples = []
-    example_ids = set()
+    cached_entries = manifest.get("examples", {}) if manifest is not None else {}
+    manifest_entries = {}
+
+    # Work out which examples can be reused and which need parsing
+    compiled = {}
+    sources_to_parse = []
+    for sources in example_sources:
+        cached = cached_entries.get(sources.name)
+        if cached is not None and cached["hash"] == sources.input_hash():
+            logger.debug(f"Reusing cached example: {sources.name}")
+            cached_data = cached["data"]
+            compiled[sources.name] = (
+                Example.from_dict(cached_data) if cached_data else None
+            )
+        else:
+            sources_to_parse.append(sources)
+
+    reused_count = len(compiled)
+    with profiler.phase("parse", examples=len(sources_to_parse), jobs=jobs):
+        compiled.update(parse_example_directories(sources_to_parse, jobs))
+
+    # Assemble in directory order so the output does not depend on scheduling
+    for sources in example_sources:
+        example = compiled[sources.name]
+
+        if manifest is not None:
+            # Snapshot before section info is added below
+            manifest_entries[sources.name] = {
+                "hash": sources.input_hash(),
+                "data": example.to_dict() if example else None,
+            }
+
+        if example:
+            examples.append(example)
 
-    for example_dir in example_dirs:
-        logger.info(f"Processing example: {example_dir.name}")
-        example_data = process_example_directory(example_dir)
-        if example_data:
-            examples.append(example_data)
-            example_ids.add(example_data["id"])
+    if manifest is not None:
+        # Entries for removed examples are dropped here
+        manifest["examples"] = manifest_entries
+        logger.info(
+            f"Reused {reused_count} unchanged examples, "
+            f"parsed {len(example_sources) - reused_count}"
+        )
 
     # Sort examples by order
-    examples.sort(key=lambda e: e["order"])
-    
+    examples.sort(key=lambda e: e.order)
+
+    with profiler.phase("section assignment"):
+        return assign_sections(examples, project_root)
+
+
+def assign_sections(examples: List[Example], project_root: Path) -> ExampleCatalog:
+    """
+    Assign examples to the sections defined in sections.json.
+
+    Examples not listed in any section go to a default "Miscellaneous"
+    section, which is only added when it is needed.
+
+    Args:
+        examples: Compiled examples, sorted by order
+        project_root: Path to the project root directory
+
+    Returns:
+        Catalog of the examples and their sections
+    """
     # Load sections if available
     sections_data = load_sections(project_root)
-    sections = sections_data.get("sections", [])
-    
+    sections = [Section.from_dict(s) for s in sections_data.get("sections", [])]
+
     # If we have sections defined, organize examples by section
     if sections:
         # Add section information to each example
+        examples_by_id = {example.id: example for example in examples}
         for section in sections:
-            section_id = section["id"]
-            for example_id in section.get("examples", []):
-                if example_id in example_ids:
-                    # Find the example and add section info
-                    for example in examples:
-                        if example["id"] == example_id:
-                            example["section_id"] = section_id
-                            example["section_title"] = section["title"]
-                            break
-        
+            for example_id in section.examples or []:
+                example = examples_by_id.get(example_id)
+                if example is not None:
+                    example.section_id = section.id
+                    example.section_title = section.title
+
         # For examples not assigned to a section, create a default section
-        uncategorized_examples = [e for e in examples if "section_id" not in e]
+        uncategorized_examples = [e for e in examples if e.section_id is None]
         if uncategorized_examples:
-            default_section = {
-                "id": "999-misc",
-                "title": "Miscellaneous Examples",
-                "description": "Additional examples that don't fit into other categories",
-                "order": 999
-            }
+            default_section = Section(
+                id=DEFAULT_SECTION_ID,
+                title="Miscellaneous Examples",
+                description="Additional examples that don't fit into other categories",
+                order=DEFAULT_SECTION_ORDER,
+            )
             for example in uncategorized_examples:
-                example["section_id"] = default_section["id"]
-                example["section_title"] = default_section["title"]
-            
+                example.section_id = default_section.id
+                example.section_title = default_section.title
+
             # Add default section if needed
             sections.append(default_section)
-        
-        # Final sorted list based on section order then example order
-        sorted_examples = sorted(
-            examples, 
-            key=lambda e: (
-                next((s["order"] for s in sections if s["id"] == e.get("section_id", "999-misc")), 999),
-                e["order"]
-            )
-        )
-        
-        return {
-            "examples": sorted_examples,
-            "sections": sections
+
+    # The catalog orders examples by section order, then example order
+    return ExampleCatalog(examples, sections)
+
+
+def build_examples_data(
+    examples_dir: Path,
+    project_root: Path,
+    use_cache: bool = True,
+    jobs: int = 1,
+    tree: Optional[SourceTree] = None,
+) -> ExampleCatalog:
+    """
+    Scan, parse and organize all examples into a catalog.
+
+    Args:
+        examples_dir: Path to the examples directory
+        project_root: Path to the project root directory
+        use_cache: Whether to reuse unchanged examples from the build manifest
+        jobs: Number of worker processes used to parse changed examples
+        tree: Manifest of the examples tree, if the caller already scanned it
+
+    Returns:
+        Catalog of the compiled examples and their sections
+    """
+    if tree is None:
+        logger.info(f"Scanning examples directory: {examples_dir}")
+        tree = scan_source_tree(examples_dir, project_root, use_cache)
+    logger.info(f"Found {len(tree.examples)} example directories")
+
+    manifest_file = project_root / MANIFEST_FILE
+    with profiler.phase("load manifest"):
+        manifest = load_build_manifest(manifest_file) if use_cache else None
+
+    logger.info("Processing examples...")
+    catalog = process_examples(tree.examples, project_root, manifest, jobs=jobs)
+
+    if manifest is not None:
+        with profiler.phase("save manifest"):
+            save_build_manifest(manifest_file, manifest)
+
+    return catalog
+
+
+def write_examples_data(
+    catalog: ExampleCatalog,
+    output_file: Path,
+    output_format: str = "json",
+    manifest_file: Optional[Path] = None,
+) -> None:
+    """
+    Write the compiled catalog to a data file.
+
+    Args:
+        catalog: Catalog of the compiled examples
+        output_file: Path to the output data file
+        output_format: One of the formats in encoding.OUTPUT_FORMATS
+        manifest_file: Build manifest to record the file and the hash of its
+            content in, so readers can find it (see recorded_data_file)
+    """
+    logger.info(f"Writing {output_format} output to {output_file}")
+    with profiler.phase("write data", format=output_format):
+        data = encode_catalog(catalog, output_format)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        output_file.write_bytes(data)
+
+    if manifest_file is not None:
+        manifest = load_build_manifest(manifest_file)
+        manifest["data_file"] = {
+            "path": str(output_file.resolve()),
+            "sha256": hashlib.sha256(data).hexdigest(),
         }
-    
-    # If no sections, return flat structure
-    return {"examples": examples}
+        save_build_manifest(manifest_file, manifest)
 
 
-def parse_args() -> argparse.Namespace:
+def recorded_data_file(manifest_file: Path) -> Optional[Path]:
+    """
+    Find the data file written last, if it still holds what was written.
+
+    Args:
+        manifest_file: Build manifest the data file was recorded in
+
+    Returns:
+        The data file, or None if none was recorded or it has since been
+        changed or deleted (e.g. by checking out another version of it)
+    """
+    # The record is checked against the file itself, so unlike the cached
+    # examples it holds whichever build scripts wrote the manifest
+    try:
+        with open(manifest_file, "r") as f:
+            record = json.load(f).get("data_file")
+        if record is None:
+            return None
+        data_file = Path(record["path"])
+        digest = hashlib.sha256(data_file.read_bytes()).hexdigest()
+    except Exception as e:
+        logger.debug(f"No usable data file record in {manifest_file}: {e}")
+        return None
+    return data_file if digest == record["sha256"] else None
+
+
+def default_output_file(project_root: Path, output_format: str) -> Path:
+    """Return the default data file path for an output format."""
+    filename = "examples.msgpack" if output_format == "msgpack" else "examples.json"
+    return project_root / "data" / filename
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Build Gemini by Example website data")
     parser.add_argument("--examples-dir", type=str, help="Path to examples directory")
-    parser.add_argument("--output", type=str, help="Path to output JSON file")
+    parser.add_argument("--output", type=str, help="Path to output data file")
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Output encoding: indented JSON (default), compact JSON or msgpack",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
-    return parser.parse_args()
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the build manifest and re-parse every example",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes used to parse examples (default: 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=str(DEFAULT_PROFILE_FILE),
+        metavar="TRACE_FILE",
+        help="Time each build phase, log a summary table and write a Chrome "
+        "trace to TRACE_FILE (default: .build_cache/profile-trace.json)",
+    )
+    return parser.parse_args(argv)
 
 
-def main():
-    """Main entry point for the build script."""
-    args = parse_args()
+def main(argv: Optional[List[str]] = None) -> ExampleCatalog:
+    """
+    Main entry point for the build script.
+
+    Returns:
+        The compiled catalog, so callers can use it without re-reading the file
+    """
+    args = parse_args(argv)
 
     # Set verbose logging if requested
     if args.verbose:
@@ -404,22 +771,23 @@ def main():
         Path(args.examples_dir) if args.examples_dir else project_root / "examples"
     )
     output_file = (
-        Path(args.output) if args.output else project_root / "data" / "examples.json"
+        Path(args.output)
+        if args.output
+        else default_output_file(project_root, args.format)
     )
 
-    logger.info(f"Scanning examples directory: {examples_dir}")
-    example_dirs = scan_examples_directory(examples_dir)
-    logger.info(f"Found {len(example_dirs)} example directories")
+    if args.profile:
+        profiler.enable()
 
-    logger.info("Processing examples...")
-    data = process_examples(example_dirs, project_root)
-
-    logger.info(f"Writing output to {output_file}")
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, "w") as f:
-        json.dump(data, f, indent=2)
+    catalog = build_examples_data(
+        examples_dir, project_root, use_cache=not args.no_cache, jobs=args.jobs
+    )
+    write_examples_data(catalog, output_file, args.format, project_root / MANIFEST_FILE)
 
     logger.info("Build complete!")
+    if args.profile:
+        profiler.report(Path(args.profile))
+    return catalog
 
 
 if __name__ == "__main__":
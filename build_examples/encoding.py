@@ -0,0 +1,178 @@
+"""
+Encodings for the compiled examples data.
+
+The default "json" format is the indented data/examples.json the site has
+always used. The "compact" format drops everything that can be derived
+from the source lines: display_code, annotations and line ranges are
+rebuilt on load, so each line of code is stored once, and the JSON is
+written without whitespace. "msgpack" stores the compact structure in
+binary form and needs the optional msgpack package.
+
+decode_catalog accepts any of the three, so readers never need to know
+which one was written.
+"""
+
+import json
+from typing import Any, Dict, List
+
+from models import (
+    CodeSegment,
+    Example,
+    ExampleCatalog,
+    ExampleImage,
+    Section,
+    ShellSegment,
+    map_comments_to_code,
+)
+
+# Marker stored in compact documents so they can be told apart on load
+COMPACT_FORMAT = "gbe-compact/1"
+
+OUTPUT_FORMATS = ("json", "compact", "msgpack")
+
+
+def _split_lines(code: str) -> List[str]:
+    """Split code into lines the same way readlines() does."""
+    parts = code.split("\n")
+    lines = [part + "\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines
+
+
+def catalog_to_compact(catalog: ExampleCatalog) -> Dict[str, Any]:
+    """
+    Convert a catalog into the compact document structure.
+
+    Code segments become [start_line, is_comment, code] triples, shell
+    segments and images become plain lists, and each example refers to its
+    section by position in the sections list.
+
+    Args:
+        catalog: The catalog to convert
+
+    Returns:
+        Dictionary ready to be serialized as JSON or msgpack
+    """
+    section_index = {}
+    for i, section in enumerate(catalog.sections):
+        section_index[(section.id, section.title)] = i
+
+    examples = []
+    for example in catalog.examples:
+        compact_example = {
+            "id": example.id,
+            "title": example.title,
+            "description": example.description,
+            "order": example.order,
+            "code": [
+                [s.start_line, int(s.is_comment), s.code] for s in example.code_segments
+            ],
+            "shell": [
+                [s.explanation, s.command, s.output] for s in example.shell_segments
+            ],
+            "images": [[i.path, i.filename, i.caption] for i in example.image_data],
+            "links": example.documentation_links,
+        }
+        if example.section_id is not None:
+            compact_example["section"] = section_index[
+                (example.section_id, example.section_title)
+            ]
+        examples.append(compact_example)
+
+    return {
+        "format": COMPACT_FORMAT,
+        "sections": [section.to_dict() for section in catalog.sections],
+        "examples": examples,
+    }
+
+
+def catalog_from_compact(data: Dict[str, Any]) -> ExampleCatalog:
+    """
+    Rebuild a catalog from the compact document structure.
+
+    Args:
+        data: Dictionary produced by catalog_to_compact
+
+    Returns:
+        The catalog, identical to the one that was encoded
+    """
+    sections = [Section.from_dict(s) for s in data.get("sections", [])]
+
+    examples = []
+    for compact_example in data.get("examples", []):
+        code_segments = [
+            CodeSegment.from_lines(_split_lines(code), start_line, bool(is_comment))
+            for start_line, is_comment, code in compact_example["code"]
+        ]
+        map_comments_to_code(code_segments)
+
+        example = Example(
+            id=compact_example["id"],
+            title=compact_example["title"],
+            description=compact_example["description"],
+            order=compact_example["order"],
+            code_segments=code_segments,
+            shell_segments=[ShellSegment(*s) for s in compact_example["shell"]],
+            image_data=[ExampleImage(*i) for i in compact_example["images"]],
+            documentation_links=list(compact_example["links"]),
+        )
+        if "section" in compact_example:
+            section = sections[compact_example["section"]]
+            example.section_id = section.id
+            example.section_title = section.title
+        examples.append(example)
+
+    return ExampleCatalog(examples, sections)
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "The msgpack format needs the msgpack package (pip install msgpack)"
+        ) from e
+    return msgpack
+
+
+def encode_catalog(catalog: ExampleCatalog, output_format: str = "json") -> bytes:
+    """
+    Serialize a catalog in one of the supported output formats.
+
+    Args:
+        catalog: The catalog to serialize
+        output_format: One of OUTPUT_FORMATS
+
+    Returns:
+        The encoded bytes
+    """
+    if output_format == "json":
+        return json.dumps(catalog.to_dict(), indent=2).encode("utf-8")
+    if output_format == "compact":
+        return json.dumps(
+            catalog_to_compact(catalog), separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+    if output_format == "msgpack":
+        return _import_msgpack().packb(catalog_to_compact(catalog), use_bin_type=True)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+def decode_catalog(raw: bytes) -> ExampleCatalog:
+    """
+    Deserialize a catalog written in any of the supported formats.
+
+    Args:
+        raw: The encoded bytes
+
+    Returns:
+        The decoded catalog
+    """
+    if raw.lstrip()[:1] == b"{":
+        data = json.loads(raw)
+    else:
+        data = _import_msgpack().unpackb(raw, raw=False)
+
+    if data.get("format") == COMPACT_FORMAT:
+        return catalog_from_compact(data)
+    return ExampleCatalog.from_dict(data)
@@ -0,0 +1,299 @@
+"""
+Data model shared by the Gemini by Example build scripts.
+
+build_examples.py compiles example directories into these objects and
+build_static_site.py renders them. Every class converts to and from the
+dictionaries stored in data/examples.json, so the JSON format is unchanged.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Section that examples without an explicit section are assigned to
+DEFAULT_SECTION_ID = "999-misc"
+DEFAULT_SECTION_ORDER = 999
+
+
+@dataclass(slots=True)
+class CodeSegment:
+    """A run of comment lines or code lines from an example's Python file."""
+
+    code: str
+    display_code: str
+    annotation: str
+    is_comment: bool
+    start_line: int
+    line_range: Tuple[int, int]
+    target_line_range: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def from_lines(
+        cls, lines: List[str], start_line: int, is_comment: bool
+    ) -> "CodeSegment":
+        """
+        Build a segment from a run of source lines.
+
+        Args:
+            lines: The lines of the segment, including line endings
+            start_line: 1-based line number of the first line
+            is_comment: Whether the lines are full-line comments
+
+        Returns:
+            The segment, without a target line range
+        """
+        code = "".join(lines)
+        annotation = ""
+        if is_comment:
+            # Leading empty comment lines do not add blank lines
+            annotation = "\n".join(line.rstrip().lstrip("# ") for line in lines)
+            annotation = annotation.lstrip("\n")
+
+        return cls(
+            code=code,
+            display_code="" if is_comment else code,
+            annotation=annotation,
+            is_comment=is_comment,
+            start_line=start_line,
+            line_range=(start_line, start_line + len(lines) - 1),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CodeSegment":
+        target_line_range = data.get("target_line_range")
+        return cls(
+            code=data["code"],
+            display_code=data["display_code"],
+            annotation=data["annotation"],
+            is_comment=data["is_comment"],
+            start_line=data["start_line"],
+            line_range=tuple(data["line_range"]),
+            target_line_range=tuple(target_line_range) if target_line_range else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "code": self.code,
+            "display_code": self.display_code,
+            "annotation": self.annotation,
+            "is_comment": self.is_comment,
+            "start_line": self.start_line,
+            "line_range": self.line_range,
+        }
+        if self.target_line_range is not None:
+            data["target_line_range"] = self.target_line_range
+        return data
+
+
+def map_comments_to_code(segments: List[CodeSegment]) -> None:
+    """
+    Determine which code blocks each comment should align with.
+    Modifies the segments list in place.
+
+    Args:
+        segments: List of code segments
+    """
+    # Walk backwards so the next code segment is always known
+    next_code = None
+    for i in range(len(segments) - 1, -1, -1):
+        segment = segments[i]
+        if not segment.is_comment:
+            next_code = segment
+            continue
+
+        if next_code is not None:
+            # Found a code segment after this comment
+            segment.target_line_range = next_code.line_range
+        elif i > 0 and not segments[i - 1].is_comment:
+            # No code after, but there's code before
+            segment.target_line_range = segments[i - 1].line_range
+        else:
+            # No related code found
+            segment.target_line_range = segment.line_range
+
+
+@dataclass(slots=True)
+class ShellSegment:
+    """A command from an example's shell file with its explanation and output."""
+
+    explanation: str
+    command: str
+    output: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ShellSegment":
+        return cls(
+            explanation=data.get("explanation", ""),
+            command=data.get("command", ""),
+            output=data.get("output", ""),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "explanation": self.explanation,
+            "command": self.command,
+            "output": self.output,
+        }
+
+
+@dataclass(slots=True)
+class ExampleImage:
+    """An image shown at the bottom of an example page."""
+
+    path: str
+    filename: str
+    caption: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExampleImage":
+        return cls(
+            path=data["path"],
+            filename=data.get("filename", ""),
+            caption=data.get("caption", ""),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "filename": self.filename, "caption": self.caption}
+
+
+@dataclass(slots=True)
+class Example:
+    """A compiled example, built from one directory under examples/."""
+
+    id: str
+    title: str
+    description: str
+    order: int
+    code_segments: List[CodeSegment] = field(default_factory=list)
+    shell_segments: List[ShellSegment] = field(default_factory=list)
+    image_data: List[ExampleImage] = field(default_factory=list)
+    documentation_links: List[str] = field(default_factory=list)
+    section_id: Optional[str] = None
+    section_title: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Example":
+        return cls(
+            id=data["id"],
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+            order=data["order"],
+            code_segments=[
+                CodeSegment.from_dict(s) for s in data.get("code_segments", [])
+            ],
+            shell_segments=[
+                ShellSegment.from_dict(s) for s in data.get("shell_segments", [])
+            ],
+            image_data=[ExampleImage.from_dict(i) for i in data.get("image_data", [])],
+            documentation_links=list(data.get("documentation_links", [])),
+            section_id=data.get("section_id"),
+            section_title=data.get("section_title"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "order": self.order,
+            "code_segments": [s.to_dict() for s in self.code_segments],
+            "shell_segments": [s.to_dict() for s in self.shell_segments],
+            "image_data": [i.to_dict() for i in self.image_data],
+            "documentation_links": self.documentation_links,
+        }
+        if self.section_id is not None:
+            data["section_id"] = self.section_id
+            data["section_title"] = self.section_title
+        return data
+
+
+@dataclass(slots=True)
+class Section:
+    """A group of examples shown together on the index page."""
+
+    id: str
+    title: str
+    description: str
+    order: int
+    examples: Optional[List[str]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Section":
+        examples = data.get("examples")
+        return cls(
+            id=data["id"],
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+            order=data.get("order", DEFAULT_SECTION_ORDER),
+            examples=list(examples) if examples is not None else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "order": self.order,
+        }
+        if self.examples is not None:
+            data["examples"] = self.examples
+        return data
+
+
+class ExampleCatalog:
+    """
+    All compiled examples and sections, with lookup indexes built once.
+
+    Attributes:
+        examples: Examples in reading order (section order, then example order)
+        sections: Sections in the order they were defined
+        by_id: Examples keyed by id
+        sections_by_id: Sections keyed by id
+        ordered_sections: Sections sorted by their order
+        by_section: Examples of each section id, sorted by example order
+    """
+
+    __slots__ = (
+        "by_id",
+        "by_section",
+        "examples",
+        "ordered_sections",
+        "sections",
+        "sections_by_id",
+    )
+
+    def __init__(self, examples: List[Example], sections: List[Section]):
+        self.sections = sections
+
+        # First definition wins if a section id is repeated
+        self.sections_by_id: Dict[str, Section] = {}
+        for section in sections:
+            self.sections_by_id.setdefault(section.id, section)
+        self.ordered_sections = sorted(sections, key=lambda s: s.order)
+
+        self.examples = sorted(examples, key=lambda e: (self.section_order(e), e.order))
+        self.by_id = {example.id: example for example in self.examples}
+
+        self.by_section: Dict[str, List[Example]] = {}
+        for example in self.examples:
+            section_id = example.section_id or DEFAULT_SECTION_ID
+            self.by_section.setdefault(section_id, []).append(example)
+        for section_examples in self.by_section.values():
+            section_examples.sort(key=lambda e: e.order)
+
+    def section_order(self, example: Example) -> int:
+        """Return the order of the section an example belongs to."""
+        section = self.sections_by_id.get(example.section_id or DEFAULT_SECTION_ID)
+        return section.order if section is not None else DEFAULT_SECTION_ORDER
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExampleCatalog":
+        return cls(
+            [Example.from_dict(e) for e in data.get("examples", [])],
+            [Section.from_dict(s) for s in data.get("sections", [])],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"examples": [example.to_dict() for example in self.examples]}
+        if self.sections:
+            data["sections"] = [section.to_dict() for section in self.sections]
+        return data
@@ -0,0 +1,149 @@
+"""
+Per-phase timing for the build scripts.
+
+Build code wraps each phase in profiler.phase("name"). While the profiler
+is disabled (the default) that is a no-op, so the instrumentation stays in
+place at no cost. With --profile, every phase is recorded and written as a
+Chrome trace_event file (open it in chrome://tracing or ui.perfetto.dev),
+and a summary table of where the time went is logged.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    """
+    Collects timed phases of a build.
+
+    Attributes:
+        enabled: Whether phases are being recorded
+        events: Recorded phases with their start and duration in nanoseconds
+    """
+
+    __slots__ = ("_origin_ns", "enabled", "events")
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+        self._origin_ns = time.perf_counter_ns()
+
+    def enable(self) -> None:
+        """Start recording phases, discarding anything recorded before."""
+        self.enabled = True
+        self.events = []
+        self._origin_ns = time.perf_counter_ns()
+
+    def phase(self, name: str, **args: Any):
+        """
+        Time a phase of the build.
+
+        Args:
+            name: Phase name. Repeated phases (e.g. one per example page)
+                share a name and are aggregated in the summary.
+            **args: Details shown with the event in the trace viewer
+
+        Returns:
+            A context manager timing its body
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._record(name, args)
+
+    @contextmanager
+    def _record(self, name: str, args: Dict[str, Any]) -> Iterator[None]:
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.events.append(
+                {
+                    "name": name,
+                    "start_ns": start_ns - self._origin_ns,
+                    "duration_ns": time.perf_counter_ns() - start_ns,
+                    "thread": threading.get_ident(),
+                    "args": args,
+                }
+            )
+
+    def trace_events(self) -> Dict[str, Any]:
+        """Return the recorded phases in Chrome trace_event format."""
+        pid = os.getpid()
+        thread_ids: Dict[int, int] = {}
+        trace = []
+        for event in sorted(self.events, key=lambda e: e["start_ns"]):
+            trace.append(
+                {
+                    "name": event["name"],
+                    "cat": "build",
+                    "ph": "X",
+                    "ts": event["start_ns"] / 1000,
+                    "dur": event["duration_ns"] / 1000,
+                    "pid": pid,
+                    "tid": thread_ids.setdefault(event["thread"], len(thread_ids)),
+                    "args": event["args"],
+                }
+            )
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def write_trace(self, trace_file: Path) -> None:
+        """Write the recorded phases to a Chrome trace_event JSON file."""
+        trace_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(trace_file, "w") as f:
+            json.dump(self.trace_events(), f)
+
+    def summary(self) -> str:
+        """
+        Summarize the recorded phases as a table, slowest first.
+
+        Phases are grouped by name. The share column is relative to the
+        wall time between the first phase starting and the last one ending,
+        so nested phases are counted in their parent as well.
+        """
+        if not self.events:
+            return "No phases recorded"
+
+        wall_ns = max(e["start_ns"] + e["duration_ns"] for e in self.events) - min(
+            e["start_ns"] for e in self.events
+        )
+
+        totals: Dict[str, List[int]] = {}
+        for event in self.events:
+            totals.setdefault(event["name"], []).append(event["duration_ns"])
+
+        name_width = max(len("Phase"), *(len(name) for name in totals))
+        lines = [
+            (
+                f"{'Phase':<{name_width}}  {'Calls':>6}  {'Total ms':>10}  "
+                f"{'Mean ms':>9}  {'Max ms':>9}  {'Share':>6}"
+            )
+        ]
+        lines.append("-" * len(lines[0]))
+        for name, durations in sorted(totals.items(), key=lambda item: -sum(item[1])):
+            total_ns = sum(durations)
+            lines.append(
+                f"{name:<{name_width}}  {len(durations):>6}  "
+                f"{total_ns / 1e6:>10.2f}  {total_ns / len(durations) / 1e6:>9.3f}  "
+                f"{max(durations) / 1e6:>9.3f}  "
+                f"{100 * total_ns / wall_ns if wall_ns else 0:>5.1f}%"
+            )
+        lines.append("-" * len(lines[0]))
+        lines.append(f"{'Wall time':<{name_width}}  {'':>6}  {wall_ns / 1e6:>10.2f}")
+        return "\n".join(lines)
+
+    def report(self, trace_file: Path) -> None:
+        """Write the trace file and log the summary table."""
+        self.write_trace(trace_file)
+        logger.info(f"Build profile (trace written to {trace_file}):\n{self.summary()}")
+
+
+# Shared by both build stages, so a combined build produces a single trace
+profiler = Profiler()
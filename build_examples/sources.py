@@ -0,0 +1,243 @@
+"""
+Single-pass manifest of the examples source tree.
+
+SourceTree.scan walks examples/ once with os.scandir and records the kind,
+size, modification time and content hash of every file in every example
+directory. Both build stages read from it instead of globbing and stat-ing
+the same files again. Hashes are persisted between runs and only
+recomputed for files whose size or modification time changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Image formats that are shown on example pages
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif")
+
+# File kinds that feed into an example's compiled data
+INPUT_KINDS = ("python", "shell", "links", "image")
+
+
+def classify_file(name: str, example_name: str) -> str:
+    """
+    Work out what role a file plays in an example directory.
+
+    Args:
+        name: The file name
+        example_name: Example id without its numeric prefix
+
+    Returns:
+        One of "python", "requests", "shell", "links", "image" or "other"
+    """
+    # Hidden files are never picked up by the build
+    if name.startswith("."):
+        return "other"
+    if name.endswith("_requests.py"):
+        return "requests"
+    if name.endswith(".py"):
+        return "python"
+    if name.endswith(".sh"):
+        return "shell"
+    if name == f"{example_name}_links.txt":
+        return "links"
+    if name.endswith(IMAGE_SUFFIXES):
+        return "image"
+    return "other"
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class SourceFile:
+    """A single file inside an example directory."""
+
+    name: str
+    path: Path
+    kind: str
+    size: int
+    mtime_ns: int
+    hash: str
+
+
+@dataclass(slots=True)
+class ExampleSources:
+    """All files of one example directory, sorted by name."""
+
+    path: Path
+    files: List[SourceFile] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def of_kind(self, kind: str) -> List[SourceFile]:
+        """Return the files of one kind, sorted by name."""
+        return [f for f in self.files if f.kind == kind]
+
+    def get(self, name: str) -> Optional[SourceFile]:
+        """Return the file with the given name, if present."""
+        for source_file in self.files:
+            if source_file.name == name:
+                return source_file
+        return None
+
+    @classmethod
+    def scan(
+        cls, example_path: Path, known_hashes: Optional[Dict[str, list]] = None
+    ) -> "ExampleSources":
+        """
+        Record every file of one example directory.
+
+        Args:
+            example_path: Path to the example directory
+            known_hashes: Hashes from a previous scan (see SourceTree.scan)
+
+        Returns:
+            The files of the directory, sorted by name
+        """
+        known_hashes = known_hashes or {}
+        example_name = example_path.name.split("-", 1)[-1]
+        files = []
+        with os.scandir(example_path) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                known = known_hashes.get(f"{example_path.name}/{entry.name}")
+                unchanged = (
+                    known is not None
+                    and known[0] == stat.st_size
+                    and known[1] == stat.st_mtime_ns
+                )
+                files.append(
+                    SourceFile(
+                        name=entry.name,
+                        path=example_path / entry.name,
+                        kind=classify_file(entry.name, example_name),
+                        size=stat.st_size,
+                        mtime_ns=stat.st_mtime_ns,
+                        hash=known[2] if unchanged else hash_file(Path(entry.path)),
+                    )
+                )
+        files.sort(key=lambda f: f.name)
+        return cls(path=example_path, files=files)
+
+    def input_hash(self) -> str:
+        """
+        Hash of all files that make up the example's compiled data.
+
+        Covers the Python and shell files, the documentation links file and
+        the images, so a change to any of them changes the hash.
+        """
+        digest = hashlib.sha256()
+        for source_file in self.files:
+            if source_file.kind in INPUT_KINDS:
+                digest.update(source_file.name.encode("utf-8") + b"\0")
+                digest.update(bytes.fromhex(source_file.hash))
+        return digest.hexdigest()
+
+
+class SourceTree:
+    """
+    Manifest of every example directory under examples/.
+
+    Attributes:
+        examples_dir: Path to the examples directory
+        examples: Example directories sorted by numeric prefix
+        by_name: Example directories keyed by directory name
+    """
+
+    __slots__ = ("by_name", "examples", "examples_dir")
+
+    def __init__(self, examples_dir: Path, examples: List[ExampleSources]):
+        self.examples_dir = examples_dir
+        self.examples = examples
+        self.by_name = {sources.name: sources for sources in examples}
+
+    @classmethod
+    def scan(
+        cls, examples_dir: Path, known_hashes: Optional[Dict[str, list]] = None
+    ) -> "SourceTree":
+        """
+        Walk the examples directory once and record every file.
+
+        Args:
+            examples_dir: Path to the examples directory
+            known_hashes: Hashes from a previous scan, keyed by path relative
+                to examples_dir as [size, mtime_ns, hash]. Files whose size
+                and modification time still match are not read again.
+
+        Returns:
+            The scanned source tree
+        """
+        examples = []
+        with os.scandir(examples_dir) as entries:
+            example_entries = [
+                entry
+                for entry in entries
+                if re.match(r"^\d+", entry.name) and entry.is_dir()
+            ]
+
+        for example_entry in example_entries:
+            examples.append(
+                ExampleSources.scan(examples_dir / example_entry.name, known_hashes)
+            )
+
+        # Sort by the numeric prefix
+        examples.sort(key=lambda s: int(s.name.split("-")[0]))
+        return cls(examples_dir, examples)
+
+    def find(self, path: Path) -> Optional[SourceFile]:
+        """Look up a file by path without touching the filesystem."""
+        try:
+            relative = path.relative_to(self.examples_dir)
+        except ValueError:
+            return None
+        if len(relative.parts) != 2:
+            return None
+        sources = self.by_name.get(relative.parts[0])
+        return sources.get(relative.parts[1]) if sources else None
+
+    def file_hashes(self) -> Dict[str, list]:
+        """Return the per-file hashes in the form accepted by scan()."""
+        return {
+            f"{sources.name}/{f.name}": [f.size, f.mtime_ns, f.hash]
+            for sources in self.examples
+            for f in sources.files
+        }
+
+
+def load_file_hashes(hashes_file: Path) -> Dict[str, list]:
+    """Load per-file hashes saved by a previous build, if any."""
+    if not hashes_file.exists():
+        return {}
+    try:
+        with open(hashes_file, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable file hashes {hashes_file}: {e}")
+        return {}
+
+
+def save_file_hashes(hashes_file: Path, tree: SourceTree) -> None:
+    """Save the per-file hashes of a scanned tree for the next build."""
+    hashes_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = hashes_file.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(tree.file_hashes(), f)
+    os.replace(tmp_file, hashes_file)
@@ -0,0 +1,49 @@
+"""
+Deterministic logging for build steps run in worker processes.
+
+Worker processes initialized with init_worker_logging keep their log
+records instead of writing them. Each task returns its records from
+take_worker_logs, and the parent passes them to replay_logs in task
+order, so the log of a parallel build reads exactly like a serial one.
+"""
+
+import logging
+from typing import List, Tuple
+
+# (logger name, level, message)
+LogRecordTuple = Tuple[str, int, str]
+
+
+class LogCollector(logging.Handler):
+    """Keeps log records in memory until they are taken."""
+
+    def __init__(self):
+        super().__init__()
+        self.records: List[LogRecordTuple] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.name, record.levelno, record.getMessage()))
+
+
+_collector = LogCollector()
+
+
+def init_worker_logging() -> None:
+    """Route all logging in this worker process into the collector."""
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(_collector)
+
+
+def take_worker_logs() -> List[LogRecordTuple]:
+    """Return the records collected since the last call and clear them."""
+    records = _collector.records
+    _collector.records = []
+    return records
+
+
+def replay_logs(records: List[LogRecordTuple]) -> None:
+    """Log records returned by a worker as if they were logged here."""
+    for name, level, message in records:
+        logging.getLogger(name).log(level, message)
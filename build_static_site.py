@@ -6,14 +6,61 @@ This script generates a complete static site from the examples.json file,
 following the same layout and styling as the dynamic FastHTML application.
 """
 
-import json
+import argparse
+import io
 import logging
 import os
+import re
 import shutil
-from pathlib import Path
+import string
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from html import escape
-from typing import List, Dict, Any, Optional
-import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Make the build_examples modules (including the shared data model) importable
+build_examples_dir = Path(__file__).parent / "build_examples"
+if str(build_examples_dir) not in sys.path:
+    sys.path.append(str(build_examples_dir))
+
+from encoding import OUTPUT_FORMATS, decode_catalog
+from models import Example, ExampleCatalog
+from profiling import profiler
+from sources import INPUT_KINDS, SourceTree
+from workers import init_worker_logging, replay_logs, take_worker_logs
+
+from build_examples import (
+    DEFAULT_PROFILE_FILE,
+    MANIFEST_FILE,
+    build_examples_data,
+    default_output_file,
+    recorded_data_file,
+    scan_source_tree,
+    write_examples_data,
+)
+from sitegen.assets import publish_static_files
+from sitegen.compress import precompress
+from sitegen.fonts import FONT_FORMATS, publish_fonts
+from sitegen.highlight import Highlighter
+from sitegen.images import IMAGE_SIZES, PublishedImage, publish_image
+from sitegen.livereload import DEFAULT_PORT, LiveReloadServer, client_script
+from sitegen.minify import HtmlMinifier
+from sitegen.navigation import Navigation
+from sitegen.output import site_output
+from sitegen.search import write_search_index
+from sitegen.server import DEFAULT_PORT as DEFAULT_SERVE_PORT
+from sitegen.server import SiteServer, serve_site
+from sitegen.templates import load_template
+from sitegen.timestamps import (
+    format_date,
+    git_commit_times,
+    last_updated,
+    source_date_epoch,
+)
+from sitegen.watcher import FileWatcher
 
 # Configure logging
 logging.basicConfig(
@@ -25,37 +72,72 @@ logger = logging.getLogger(__name__)
 SITE_TITLE = "Gemini by Example"
 SITE_DESCRIPTION = "Learn the Gemini API through annotated examples"
 
+# Top-level docs directories holding example pages
+EXAMPLE_DIR_PATTERN = re.compile(r"^\d{3}-")
+
+# Published (fingerprinted) path of each static asset, set by copy_static_files
+STATIC_ASSETS: Dict[str, str] = {}
+
+# Highlights the code blocks of example pages, cached across builds
+highlighter = Highlighter(Path(__file__).parent / ".build_cache" / "highlight")
+
+# Whether HTML pages are minified (--minify)
+MINIFY_HTML = False
 
-def load_examples_data() -> Dict[str, Any]:
-    """Load examples and sections from the JSON file."""
+# Minifies HTML pages, cached across builds
+minifier = HtmlMinifier(Path(__file__).parent / ".build_cache" / "minify")
+
+
+def find_examples_data_file() -> Path:
+    """
+    Find the compiled examples data file.
+
+    Prefers the file the last examples build wrote, as recorded with the
+    hash of its content in the build manifest. Without such a record, or if
+    the file has changed since, falls back to examples.json, or else
+    examples.msgpack.
+    """
+    project_root = Path(__file__).parent
+    recorded = recorded_data_file(project_root / MANIFEST_FILE)
+    if recorded is not None:
+        return recorded
+    data_dir = project_root / "data"
+    for path in (data_dir / "examples.json", data_dir / "examples.msgpack"):
+        if path.exists():
+            return path
+    return data_dir / "examples.json"
+
+
+def load_examples_data() -> ExampleCatalog:
+    """Load examples and sections from the data file, in any supported format."""
     try:
-        data_file = Path(__file__).parent / "data" / "examples.json"
+        data_file = find_examples_data_file()
         logger.info("Loading examples from %s" % data_file)
-        with open(data_file, "r") as f:
-            data = json.load(f)
+        catalog = decode_catalog(data_file.read_bytes())
 
-        examples = data.get("examples", [])
-        sections = data.get("sections", [])
         logger.info(
-            "Loaded %d examples and %d sections" % (len(examples), len(sections))
+            "Loaded %d examples and %d sections"
+            % (len(catalog.examples), len(catalog.sections))
         )
-        return {"examples": examples, "sections": sections}
+        return catalog
     except Exception as e:
         logger.error("Error loading examples: %s" % e)
-        return {"examples": [], "sections": []}
+        return ExampleCatalog([], [])
 
 
-def load_examples() -> List[Dict[str, Any]]:
+def load_examples() -> List[Example]:
     """Load examples from the JSON file (backward compatibility)."""
-    return load_examples_data().get("examples", [])
+    return load_examples_data().examples
 
 
 def find_next_example(
-    examples: List[Dict[str, Any]], current_example: Dict[str, Any]
-) -> Optional[Dict[str, Any]]:
+    examples: List[Example], current_example: Example
+) -> Optional[Example]:
     """
     Find the next example based on the example order and section.
     This function respects section organization, continuing to the next section when needed.
+    Site builds use sitegen.navigation.Navigation, which computes the same
+    links for every page at once.
 
     Args:
         examples: List of all examples
@@ -64,33 +146,35 @@ def find_next_example(
     Returns:
         The next example or None if there is no next example
     """
-    current_order = current_example["order"]
-    current_section_id = current_example.get("section_id")
+    current_order = current_example.order
+    current_section_id = current_example.section_id
 
     # First, try to find the next example in the same section
     if current_section_id:
         same_section_examples = [
-            e for e in examples if e.get("section_id") == current_section_id
+            e for e in examples if e.section_id == current_section_id
         ]
-        for example in sorted(same_section_examples, key=lambda e: e["order"]):
-            if example["order"] > current_order:
+        for example in sorted(same_section_examples, key=lambda e: e.order):
+            if example.order > current_order:
                 return example
 
     # If we're at the end of a section or there's no section info,
     # find the next example in any section
-    for example in sorted(examples, key=lambda e: e["order"]):
-        if example["order"] > current_order:
+    for example in sorted(examples, key=lambda e: e.order):
+        if example.order > current_order:
             return example
 
     return None
 
 
 def find_prev_example(
-    examples: List[Dict[str, Any]], current_example: Dict[str, Any]
-) -> Optional[Dict[str, Any]]:
+    examples: List[Example], current_example: Example
+) -> Optional[Example]:
     """
     Find the previous example based on the example order and section.
     This function respects section organization, going back to the previous section when needed.
+    Site builds use sitegen.navigation.Navigation, which computes the same
+    links for every page at once.
 
     Args:
         examples: List of all examples
@@ -99,33 +183,98 @@ def find_prev_example(
     Returns:
         The previous example or None if there is no previous example
     """
-    current_order = current_example["order"]
-    current_section_id = current_example.get("section_id")
+    current_order = current_example.order
+    current_section_id = current_example.section_id
 
     # First, try to find the previous example in the same section
     if current_section_id:
         same_section_examples = [
-            e for e in examples if e.get("section_id") == current_section_id
+            e for e in examples if e.section_id == current_section_id
         ]
         prev_example = None
         for example in sorted(
-            same_section_examples, key=lambda e: e["order"], reverse=True
+            same_section_examples, key=lambda e: e.order, reverse=True
         ):
-            if example["order"] < current_order:
+            if example.order < current_order:
                 return example
 
     # If we're at the beginning of a section or there's no section info,
     # find the previous example in any section
     prev_example = None
-    for example in sorted(examples, key=lambda e: e["order"], reverse=True):
-        if example["order"] < current_order:
+    for example in sorted(examples, key=lambda e: e.order, reverse=True):
+        if example.order < current_order:
             return example
 
     return None
 
 
+def static_url(name: str, base_url: str = ".") -> str:
+    """
+    Return the URL of a file in the static directory.
+
+    Args:
+        name: Path of the file inside static/, e.g. "css/site.css"
+        base_url: The base URL for relative links
+
+    Returns:
+        The URL of the file as published, fingerprinted if it is an asset
+    """
+    return f"{base_url}/static/{STATIC_ASSETS.get(name, name)}"
+
+
+def generate_font_links(base_url: str = ".") -> str:
+    """
+    Generate the links to the web fonts of a page.
+
+    The fonts published by copy_static_files are preloaded, so the browser
+    fetches them along with the stylesheets rather than after them. Without
+    them, code blocks use the fallback fonts of static/css/code.css.
+
+    Args:
+        base_url: The base URL for relative links
+    """
+    if "css/fonts.css" not in STATIC_ASSETS:
+        return ""
+    links = []
+    for name in STATIC_ASSETS:
+        if name.startswith("fonts/"):
+            mime_type = FONT_FORMATS[Path(name).suffix][1]
+            links.append(
+                f'    <link rel="preload" href="{static_url(name, base_url)}" '
+                f'as="font" type="{mime_type}" crossorigin>\n'
+            )
+    links.append(
+        f'    <link rel="stylesheet" href="{static_url("css/fonts.css", base_url)}">\n'
+    )
+    return "".join(links)
+
+
+def code_characters(catalog: ExampleCatalog) -> str:
+    """
+    Return every character code blocks can show, for subsetting fonts.
+
+    Besides the code and shell sessions of the examples, this includes
+    their annotations and descriptions, which may contain inline code, and
+    all printable ASCII characters.
+    """
+    characters = set(string.printable)
+    for example in catalog.examples:
+        characters.update(example.description)
+        for segment in example.code_segments:
+            characters.update(segment.display_code)
+            characters.update(segment.annotation or "")
+        for shell in example.shell_segments:
+            characters.update(shell.command)
+            characters.update(shell.output)
+            characters.update(shell.explanation or "")
+    return "".join(sorted(characters))
+
+
 def generate_html_head(
-    title: str, include_main_css: bool = True, base_url: str = "."
+    title: str,
+    include_main_css: bool = True,
+    base_url: str = ".",
+    prefetch: Optional[str] = None,
 ) -> str:
     """Generate HTML head section.
 
@@ -133,7 +282,13 @@ def generate_html_head(
         title: The page title
         include_main_css: Whether to include CSS styles
         base_url: The base URL for relative links (default: "." for current directory)
+        prefetch: URL of the page the reader is likely to open next, which
+            the browser may fetch in the background
     """
+    prefetch_link = (
+        f'    <link rel="prefetch" href="{escape(prefetch)}">\n' if prefetch else ""
+    )
+    font_links = generate_font_links(base_url)
     head = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -141,700 +296,485 @@ def generate_html_head(
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{escape(title)}</title>
     <meta name="description" content="{escape(SITE_DESCRIPTION)}">
-    <script defer data-domain="geminibyexample.com"
+{prefetch_link}    <script defer data-domain="geminibyexample.com"
     src="https://plausible.io/js/script.js"></script>
-    <link rel='stylesheet' href='https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/default.min.css'>
-    <script src='https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js'></script>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/firacode@6.2.0/distr/fira_code.css">
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=JetBrains+Mono&display=swap');
-        
-        code, pre code, .hljs {{
-            font-family: 'Fira Code', 'JetBrains Mono', monospace;
-            font-feature-settings: "liga" 1;
-        }}
-        
-        @supports (font-variation-settings: normal) {{
-            code, pre code, .hljs {{
-                font-family: 'Fira Code VF', 'JetBrains Mono', monospace;
-            }}
-        }}
-    </style>
-    <script>
-        document.addEventListener('DOMContentLoaded', (event) => {{
-            hljs.highlightAll();
-        }});
-    </script>
+{font_links}    <link rel="stylesheet" href="{static_url('css/code.css', base_url)}">
 """
     if include_main_css:
-        head += """    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Helvetica, Arial, sans-serif;
-            line-height: 1.5;
-            color: #222;
-            margin: 0;
-            padding: 0;
-        }
-        .container {
-            max-width: 1100px;
-            margin: 0 auto;
-            padding: 0 20px;
-        }
-        header {
-            border-bottom: 1px solid #eee;
-            padding: 15px 0;
-            margin-bottom: 20px;
-        }
-        .site-title {
-            text-decoration: none;
-            color: #375EAB;
-            font-weight: 500;
-            font-size: 20px;
-        }
-        main {
-            padding-bottom: 40px;
-        }
-        footer {
-            border-top: 1px solid #eee;
-            padding: 15px 0;
-            margin-top: 20px;
-            color: #666;
-            font-size: 0.9em;
-        }
-        h1 {
-            font-size: 36px;
-            font-weight: 500;
-            margin: 0 0 25px 0;
-            color: #333;
-        }
-        p {
-            margin: 20px 0;
-            color: #444;
-            line-height: 1.6;
-        }
-        a {
-            color: #375EAB;
-            text-decoration: none;
-        }
-        a:hover {
-            text-decoration: underline;
-        }
-        .example-link {
-            margin: 4px 0;
-            line-height: 1.3;
-        }
-        .row {
-            display: flex;
-            width: 100%;
-            margin-bottom: 30px;
-            gap: 40px;
-        }
-        .docs {
-            flex: 0.75;
-            min-width: 0;
-            color: #444;
-            line-height: 1.6;
-            font-size: 1em;
-        }
-        .code {
-            flex: 2.25;
-            min-width: 0;
-            position: relative;
-        }
-        pre {
-            margin: 0;
-            padding: 20px;
-            background-color: #f8f8f8;
-            border-radius: 5px;
-            overflow-x: auto;
-            line-height: 1.5;
-        }
-        /* Prevent double styling from highlight.js */
-        pre code.hljs, pre code {
-            background-color: transparent;
-            padding: 0;
-            margin: 0;
-            border: none;
-        }
-        .leading {
-            margin-bottom: 5px;
-        }
-        hr {
-            border: none;
-            border-top: 1px solid #eee;
-            margin: 20px 0;
-        }
-        .buttons {
-            position: absolute;
-            top: 5px;
-            right: 5px;
-            z-index: 10;
-        }
-        .copy {
-            cursor: pointer;
-            width: 18px;
-            height: 18px;
-            opacity: 0.6;
-            color: #666;
-            background-color: #f8f8f8;
-            border-radius: 3px;
-            padding: 3px;
-        }
-        .copy:hover {
-            opacity: 1;
-            color: #375EAB;
-        }
-        .tooltip {
-            position: absolute;
-            background: #333;
-            color: white;
-            padding: 2px 8px;
-            border-radius: 4px;
-            font-size: 12px;
-            top: -25px;
-            right: 0;
-        }
-        .command-prompt {
-            color: #888;
-        }
-        .command-text {
-            font-weight: bold;
-        }
-        .navigation {
-            margin-top: 30px;
-            padding-top: 15px;
-            border-top: 1px solid #eee;
-            display: flex;
-            justify-content: space-between;
-            flex-wrap: wrap;
-        }
-        .prev, .next {
-            margin: 5px 0;
-            font-weight: 500;
-        }
-        .prev {
-            margin-right: auto;
-        }
-        .next {
-            margin-left: auto;
-        }
-        .prev span, .next span {
-            color: #666;
-            font-weight: normal;
-        }
-        @media (max-width: 900px) {
-            .row {
-                flex-direction: column;
-            }
-            .docs, .code {
-                width: 100%;
-            }
-        }
-    </style>
+        head += f"""    <link rel="stylesheet" href="{static_url('css/site.css', base_url)}">
 """
     head += f"""</head>
 <body>
     <div class="container">
         <header>
             <a href="{base_url}/" class="site-title">Gemini by Example</a>
+            <div class="search">
+                <input type="search" id="search" placeholder="Search examples"
+                    aria-label="Search examples" autocomplete="off"
+                    data-root="{base_url}">
+                <ol id="search-results" hidden></ol>
+            </div>
         </header>
         <main>
 """
     return head
 
 
-def generate_html_footer() -> str:
-    """Generate HTML footer section with current date."""
-    from datetime import datetime
+def generate_html_footer(base_url: str = ".", updated: Optional[int] = None) -> str:
+    """Generate HTML footer section with the date the content was last updated.
 
-    current_date = datetime.now().strftime("%B %-d, %Y")
+    Args:
+        base_url: The base URL for relative links (default: "." for current directory)
+        updated: Timestamp of the page's newest input (see site_dates). The
+            current date is shown if it is not known.
+    """
+    current_date = format_date(updated)
 
     return (
         """        </main>
         <footer>
-            <p>by <a href="https://linkedin.com/in/strickvl">Alex Strick van Linschoten</a> | <a href="https://mlops.systems">Blog</a> | <a href="https://github.com/strickvl/geminibyexample">Source</a> | <span style="color: #888; font-size: 0.9em;">Last updated: """
+            <p>by <a href="https://linkedin.com/in/strickvl">Alex Strick van Linschoten</a> | <a href="https://mlops.systems">Blog</a> | <a href="https://github.com/strickvl/geminibyexample">Source</a> | <span class="updated">Last updated: """
         + current_date
-        + """</span></p>
+        + f"""</span></p>
         </footer>
     </div>
-    <script>
-        // Function to copy code to clipboard
-        function copyCode(button) {
-            const codeBlock = button.closest('.code').querySelector('pre');
-            const code = codeBlock.textContent;
-            copyToClipboard(code, button);
-        }
-        
-        // Function to copy all Python code
-        document.addEventListener('DOMContentLoaded', function() {
-            const copyAllButton = document.getElementById('copy-all-python');
-            if (copyAllButton) {
-                copyAllButton.addEventListener('click', function() {
-                    const allCodeElement = document.getElementById('all-python-code');
-                    const code = allCodeElement.textContent;
-                    copyToClipboard(code, copyAllButton);
-                });
-            }
-        });
-        
-        // Shared function to copy text and show tooltip
-        function copyToClipboard(text, element) {
-            // For older browsers, fallback to textarea method
-            if (!navigator.clipboard) {
-                const textArea = document.createElement('textarea');
-                textArea.value = text;
-                textArea.style.position = 'fixed';  // Avoid scrolling to bottom
-                document.body.appendChild(textArea);
-                textArea.focus();
-                textArea.select();
-                
-                try {
-                    document.execCommand('copy');
-                    showTooltip(element, 'Copied!');
-                } catch (err) {
-                    console.error('Failed to copy text: ', err);
-                    showTooltip(element, 'Error!');
-                }
-                
-                document.body.removeChild(textArea);
-                return;
-            }
-            
-            // Use clipboard API if available
-            navigator.clipboard.writeText(text).then(() => {
-                showTooltip(element, 'Copied!');
-            }).catch(err => {
-                console.error('Failed to copy text: ', err);
-                showTooltip(element, 'Error!');
-            });
-        }
-        
-        // Helper to show tooltip
-        function showTooltip(element, message) {
-            // Check if there's already a tooltip
-            let tooltip = element.parentElement.querySelector('.tooltip');
-            if (tooltip) {
-                tooltip.textContent = message;
-            } else {
-                // Create and append new tooltip
-                tooltip = document.createElement('span');
-                tooltip.textContent = message;
-                tooltip.className = 'tooltip';
-                tooltip.style.position = 'absolute';
-                tooltip.style.background = '#333';
-                tooltip.style.color = 'white';
-                tooltip.style.padding = '2px 8px';
-                tooltip.style.borderRadius = '4px';
-                tooltip.style.fontSize = '12px';
-                tooltip.style.top = '-25px';
-                tooltip.style.right = '0';
-                
-                // Make sure the parent has position relative for tooltip positioning
-                if (getComputedStyle(element.parentElement).position === 'static') {
-                    element.parentElement.style.position = 'relative';
-                }
-                
-                element.parentElement.appendChild(tooltip);
-            }
-            
-            // Remove tooltip after 1.5 seconds
-            setTimeout(() => tooltip.remove(), 1500);
-        }
-
-        // Enable keyboard navigation between examples
-        document.addEventListener('keydown', function(e) {
-            if (e.ctrlKey || e.altKey || e.shiftKey || e.metaKey) {
-                return;
-            }
-            
-            if (e.key === 'ArrowRight') {
-                const nextLink = document.querySelector('.next a');
-                if (nextLink) {
-                    window.location.href = nextLink.getAttribute('href');
-                }
-            }
-            
-            if (e.key === 'ArrowLeft') {
-                const prevLink = document.querySelector('.prev a');
-                if (prevLink) {
-                    window.location.href = prevLink.getAttribute('href');
-                }
-            }
-        });
-    </script>
+    <script src="{static_url('js/script.js', base_url)}"></script>
+    <script src="{static_url('js/search.js', base_url)}" defer></script>
 </body>
 </html>
 """
     )
 
 
+def write_page(path: Path, page: bytes) -> None:
+    """Write an HTML page, minified if MINIFY_HTML is set."""
+    if MINIFY_HTML:
+        with profiler.phase("minify", path=str(path)):
+            page = minifier(page)
+    site_output.write(path, page)
+
+
 def generate_index_html(
-    examples: List[Dict[str, Any]], sections: List[Dict[str, Any]], output_dir: Path
+    catalog: ExampleCatalog, output_dir: Path, updated: Optional[int] = None
 ) -> None:
     """Generate index.html page with section grouping."""
+    examples = catalog.examples
     logger.info(
         "Generating index page with %d examples and %d sections"
-        % (len(examples), len(sections))
+        % (len(examples), len(catalog.sections))
     )
 
     output_file = output_dir / "index.html"
-    with open(output_file, "w") as f:
+    with io.StringIO() as f:
         f.write(generate_html_head(SITE_TITLE, base_url="."))
 
         # Page content
         f.write(f"""
-            <p style="margin: 20px 0; color: #444; line-height: 1.6;">
+            <p>
                 Gemini is Google's most capable AI model for generating text, code, images, and more. Please visit the <a href="https://ai.google.dev/gemini-api/docs" target="_blank">official documentation</a> to learn more.
             </p>
-            <p style="margin: 20px 0; color: #444; line-height: 1.6;">
-                Gemini by Example is a hands-on introduction to Google's Gemini SDK and API using annotated code examples. Check out the <a href="{examples[0]["id"]}/">first example</a> 
+            <p>
+                Gemini by Example is a hands-on introduction to Google's Gemini SDK and API using annotated code examples. Check out the <a href="{examples[0].id}/">first example</a> 
                 or browse the full list of sections below. This site takes
                 inspiration from <a href="https://gobyexample.com"
                 target="_blank">gobyexample.com</a>, from which I learned many
                 things about the Go programming language. You may use arrow keys to navigate between examples.
             </p>
-            <p style="margin: 20px 0; color: #444; line-height: 1.6;">
+            <p>
                 Examples here assume Python <code>&gt;=3.9</code> and
                 the latest version of the Gemini SDK/API (the <a href="https://pypi.org/project/google-genai/" target="_blank"><code>google-genai</code></a> package).
                 Try to upgrade to the latest versions if something isn't working.
             </p>
-            <div style="margin-top: 20px;">
+            <div class="example-list">
 """)
 
         # If we have sections defined, group examples by section
-        if sections:
-            # Group examples by section_id
-            examples_by_section = {}
-            for example in examples:
-                section_id = example.get("section_id", "999-misc")
-                if section_id not in examples_by_section:
-                    examples_by_section[section_id] = []
-                examples_by_section[section_id].append(example)
-
+        if catalog.sections:
             # Display sections and their examples
-            for section in sorted(sections, key=lambda s: s["order"]):
-                section_examples = examples_by_section.get(section["id"], [])
+            for section in catalog.ordered_sections:
+                section_examples = catalog.by_section.get(section.id, [])
                 if not section_examples:
                     continue
 
                 # Section header
-                f.write(f"""                <h3 style="margin-top: 25px; margin-bottom: 10px; color: #333; font-size: 1.3em;">{section["title"]}</h3>
+                f.write(f"""                <h3>{section.title}</h3>
 """)
                 # Only include description paragraph if it's not empty
-                description = section.get("description", "")
+                description = section.description
                 if description:
-                    f.write(f"""                <p style="margin: 0 0 10px 0; color: #555; font-size: 0.9em;">{description}</p>
+                    f.write(f"""                <p class="section-description">{description}</p>
 """)
 
                 # Example links for this section
-                for example in sorted(section_examples, key=lambda e: e["order"]):
+                for example in section_examples:
                     f.write(f"""                <div class="example-link">
-                        <a href="{example["id"]}/">{example["title"]}</a>
+                        <a href="{example.id}/">{example.title}</a>
                     </div>
 """)
         else:
             # Fallback to flat list if no sections
             for example in examples:
                 f.write(f"""                <div class="example-link">
-                        <a href="{example["id"]}/">{example["title"]}</a>
+                        <a href="{example.id}/">{example.title}</a>
                     </div>
 """)
 
         f.write("            </div>\n")
-        f.write(generate_html_footer())
+        f.write(generate_html_footer(updated=updated))
+        page = f.getvalue()
+    write_page(output_file, page.encode())
 
     logger.info("Generated index page at %s" % output_file)
 
 
-def copy_example_images(
-    example: Dict[str, Any], project_root: Path, output_dir: Path
-) -> None:
+def publish_example_images(
+    example: Example,
+    project_root: Path,
+    output_dir: Path,
+    tree: Optional[SourceTree] = None,
+) -> List[PublishedImage]:
     """
-    Copy images from the example directory to the output directory.
+    Publish the images of an example into its output directory.
+
+    Unchanged images are left alone, and WebP/AVIF variants are generated
+    once and cached (see sitegen.images).
 
     Args:
         example: The example data
         project_root: Project root path
         output_dir: Output directory for the example
+        tree: Manifest of the examples tree. When given, it is used to check
+            that the images exist instead of stat-ing them again.
+
+    Returns:
+        The images to show on the page, in order. Missing images are shown
+        without their size.
     """
-    image_data = example.get("image_data", [])
+    image_data = example.image_data
     if not image_data:
-        return
+        return []
 
     # Create images directory in the example output directory
     images_dir = output_dir / "images"
     images_dir.mkdir(exist_ok=True, parents=True)
+    cache_dir = project_root / ".build_cache" / "images"
 
-    # Copy each image
+    images = []
     for image in image_data:
-        src_path = project_root / image["path"]
-        dst_path = images_dir / image["filename"]
+        src_path = project_root / image.path
+        published = PublishedImage(image.filename)
+
+        source_hash = None
+        if tree is not None:
+            source_file = tree.find(src_path)
+            src_exists = source_file is not None
+            if source_file is not None:
+                source_hash = source_file.hash
+        else:
+            src_exists = src_path.exists()
 
-        if src_path.exists():
+        if src_exists:
             try:
-                shutil.copy2(src_path, dst_path)
-                logger.info(f"Copied image {src_path} to {dst_path}")
+                published = publish_image(
+                    src_path, images_dir, image.filename, cache_dir, source_hash
+                )
             except Exception as e:
                 logger.error(f"Failed to copy image {src_path}: {e}")
         else:
             logger.warning(f"Image file not found: {src_path}")
+        images.append(published)
+    return images
+
+
+# Values templates/example.html is rendered with
+EXAMPLE_TEMPLATE_PARAMS = (
+    "example",
+    "section_title",
+    "script_name",
+    "sections",
+    "prev_example",
+    "next_example",
+    "images",
+    "image_sizes",
+    "highlight",
+)
 
 
-def generate_example_html(
-    example: Dict[str, Any], examples: List[Dict[str, Any]], output_dir: Path
-) -> None:
-    """Generate an individual example page."""
-    logger.info(
-        "Generating page for example: %s - %s" % (example["id"], example["title"])
-    )
-
-    # Create directory for example
-    example_dir = output_dir / example["id"]
-    example_dir.mkdir(exist_ok=True, parents=True)
+def example_script_name(example: Example) -> str:
+    """
+    Return the file name an example's code is published under.
 
-    # Copy images if any
-    script_dir = Path(__file__).parent
-    copy_example_images(example, script_dir, example_dir)
+    This is the example's directory name without its number, which is also
+    the name of its script in examples/, e.g. "basic-generation.py".
+    """
+    return EXAMPLE_DIR_PATTERN.sub("", example.id) + ".py"
 
-    # Create index.html in the example directory
-    output_file = example_dir / "index.html"
 
-    # Find the next and previous examples
-    next_example = find_next_example(examples, example)
-    prev_example = find_prev_example(examples, example)
+def group_code_sections(example: Example) -> List[List[Tuple[str, str]]]:
+    """
+    Group an example's code segments under their section headers.
 
-    with open(output_file, "w") as f:
-        f.write(generate_html_head(f"{example['title']} - {SITE_TITLE}", base_url=".."))
+    A segment with an annotation but no code is a section header. Each
+    following segment becomes a row of that section, with the header shown
+    above its annotation. Segments before the first header are not shown.
 
-        # Collect all Python code for the "Copy All" button first
-        all_python_code = ""
-        for segment in example["code_segments"]:
-            code_text = segment.get("display_code", "").strip()
-            if code_text:
-                all_python_code += code_text + "\n"
+    Args:
+        example: The example to group
 
-        # Section and page title with "Copy All" button
-        section_title = example.get("section_title", "")
+    Returns:
+        The (annotation HTML, code) rows of each section
+    """
+    sections = []
+    header = None
+    rows: List[Tuple[str, str]] = []
 
-        # Header container with flexbox to position title and button
-        f.write("""            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 20px;">
-                <div>
-""")
+    for segment in example.code_segments:
+        annotation = segment.annotation
+        code_text = segment.display_code.strip()
 
-        # Title part
-        if section_title:
-            f.write(f"""                    <div style="margin-bottom: 10px; color: #666; font-size: 0.9em;">
-                        <a href="../" style="text-decoration: none; color: #666;">{section_title}</a>
-                    </div>
-                    <h1 style="margin: 0; margin-bottom: 10px;">{example["title"]}</h1>
-""")
-        else:
-            f.write(f"""                    <h1 style="margin: 0; margin-bottom: 10px;">{example["title"]}</h1>
-""")
+        # Skip completely empty segments
+        if not annotation and not code_text:
+            continue
 
-        f.write("""                </div>
-""")
+        if annotation and not code_text:
+            # Close the previous section and start a new one
+            if header:
+                sections.append(rows)
+            header = annotation
+            rows = []
+        elif header:
+            header_html = f"<div class='segment-header'>{header}</div>"
+            rows.append((f"{header_html}\n{annotation or ''}", code_text))
 
-        # Button part (if we have Python code)
-        if all_python_code:
-            f.write("""                <div style="position: relative; margin-top: 10px;">
-                    <button id="copy-all-python" style="background-color: #f1f8ff; border: 1px solid #c8e1ff; border-radius: 6px; padding: 6px 12px; font-size: 14px; color: #0366d6; cursor: pointer; display: flex; align-items: center; gap: 6px;">
-                        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-                            <path d="M16 1H4C2.9 1 2 1.9 2 3V17H4V3H16V1ZM19 5H8C6.9 5 6 5.9 6 7V21C6 22.1 6.9 23 8 23H19C20.1 23 21 22.1 21 21V7C21 5.9 20.1 5 19 5ZM19 21H8V7H19V21Z" fill="currentColor"/>
-                        </svg>
-                        Copy All Python
-                    </button>"""
-                    + f"""
-                    <div id="all-python-code" style="display: none;">{escape(all_python_code)}</div>
-                </div>""")
-
-        # Close header container
-        f.write("""            </div>
-""")
+    # Add the final section
+    if header and rows:
+        sections.append(rows)
 
-        # Description if available
-        if example.get("description"):
-            f.write(f"""            <p style="margin: 20px 0 40px 0; color: #444; line-height: 1.6; font-size: 1.1em;">
-                {example["description"]}
-            </p>
-""")
+    return sections
 
-        # Group segments by section headers
-        sections = []
-        current_section = None
-        current_segments = []
 
-        for segment in example["code_segments"]:
-            annotation = segment.get("annotation", "")
-            code_text = segment.get("display_code", "").strip()
+def generate_example_html(
+    example: Example,
+    catalog: ExampleCatalog,
+    output_dir: Path,
+    tree: Optional[SourceTree] = None,
+    navigation: Optional[Navigation] = None,
+    updated: Optional[int] = None,
+) -> None:
+    """
+    Generate an individual example page.
 
-            # Skip completely empty segments
-            if not annotation and not code_text:
-                continue
+    Args:
+        example: The example to render
+        catalog: Catalog the example belongs to
+        output_dir: Path to the docs directory
+        tree: Manifest of the examples tree
+        navigation: Navigation graph of the catalog. Pass it when rendering
+            many pages; without it the links are looked up for this page only.
+        updated: Timestamp of the example's newest input file
+    """
+    logger.info(
+        "Generating page for example: %s - %s" % (example.id, example.title)
+    )
 
-            # If annotation with no code, it's a section header
-            if annotation and not code_text:
-                # Add previous section if exists
-                if current_section:
-                    sections.append(
-                        {"header": current_section, "segments": current_segments}
-                    )
+    # Create directory for example
+    example_dir = output_dir / example.id
+    example_dir.mkdir(exist_ok=True, parents=True)
 
-                # Start a new section
-                current_section = annotation
-                current_segments = []
-            else:
-                # Add to current section
-                current_segments.append(segment)
-
-        # Add the final section
-        if current_section and current_segments:
-            sections.append({"header": current_section, "segments": current_segments})
-
-        # Process each section
-        for i, section in enumerate(sections):
-            # Add divider if not first section
-            if i > 0:
-                f.write("""            <hr>
-""")
+    # Copy images if any. Image paths are relative to the project root,
+    # which is the parent of the scanned examples directory.
+    project_root = Path(__file__).parent
+    if tree is not None:
+        project_root = tree.examples_dir.parent
+    with profiler.phase("copy images", example=example.id):
+        images = publish_example_images(example, project_root, example_dir, tree)
 
-            # Process segments in this section
-            for segment in section["segments"]:
-                combined_annotation = ""
-                if section["header"]:
-                    combined_annotation += f"<div style='font-size: 0.9em; color: #666;'>{section['header']}</div>\n"
+    # Create index.html in the example directory
+    output_file = example_dir / "index.html"
 
-                annotation = segment.get("annotation", "")
-                if annotation:
-                    combined_annotation += annotation
+    # Find the next and previous examples
+    if navigation is not None:
+        next_example = navigation.next(example)
+        prev_example = navigation.prev(example)
+    else:
+        next_example = find_next_example(catalog.examples, example)
+        prev_example = find_prev_example(catalog.examples, example)
+
+    head = generate_html_head(
+        f"{example.title} - {SITE_TITLE}",
+        base_url="..",
+        # Let the browser fetch the next page before the reader asks
+        prefetch=f"../{next_example.id}/" if next_example else None,
+    )
 
-                code_text = segment.get("display_code", "").strip()
+    # All Python code, published once as a script that the "Copy All"
+    # button fetches and readers can download
+    all_python_code = "".join(
+        code_text + "\n"
+        for code_text in (
+            segment.display_code.strip() for segment in example.code_segments
+        )
+        if code_text
+    )
+    script_name = None
+    if all_python_code:
+        script_name = example_script_name(example)
+        site_output.write(example_dir / script_name, all_python_code)
+
+    content = load_template("example.html", EXAMPLE_TEMPLATE_PARAMS).render_bytes(
+        example=example,
+        section_title=example.section_title or "",
+        script_name=script_name,
+        sections=group_code_sections(example),
+        prev_example=prev_example,
+        next_example=next_example,
+        images=images,
+        image_sizes=IMAGE_SIZES,
+        highlight=highlighter,
+    )
 
-                # If there's no code or annotation, skip
-                if not code_text and not combined_annotation:
-                    continue
+    footer = generate_html_footer(base_url="..", updated=updated)
 
-                # Start row
-                f.write("""            <div class="row">
-""")
+    # Write the whole page at once, if it changed
+    write_page(output_file, b"".join((head.encode(), content, footer.encode())))
 
-                # Left column (annotation)
-                if combined_annotation:
-                    f.write(f"""                <div class="docs">
-                    {combined_annotation}
-                </div>
-""")
+    logger.info("Generated example page at %s" % output_file)
 
-                # Right column (code) - without individual copy buttons
-                if code_text:
-                    f.write(f"""                <div class="code">
-                    <pre><code class="language-python">{escape(code_text)}</code></pre>
-                </div>
-""")
 
-                # End row
-                f.write("""            </div>
-""")
+# Per-process state of page rendering workers, set up by _init_page_worker
+_page_worker: Dict[str, Any] = {}
 
-        # Shell segments if available
-        shell_segments = example.get("shell_segments", [])
-        if shell_segments:
-            f.write("""            <hr>
-            <h2>Running the Example</h2>
-""")
 
-            for segment in shell_segments:
-                explanation = segment.get("explanation", "")
-                command = segment.get("command", "")
-                output = segment.get("output", "")
+def _init_page_worker(
+    catalog: ExampleCatalog,
+    output_dir: Path,
+    tree: Optional[SourceTree],
+    static_assets: Dict[str, str],
+    dates: Dict[str, int],
+    minify_html: bool,
+) -> None:
+    """Receive the catalog once per worker and collect its logs."""
+    global MINIFY_HTML
+
+    init_worker_logging()
+    STATIC_ASSETS.update(static_assets)
+    MINIFY_HTML = minify_html
+    # Forget the files the parent had produced when it forked this worker
+    site_output.take()
+    _page_worker.update(
+        catalog=catalog,
+        output_dir=output_dir,
+        tree=tree,
+        navigation=Navigation(catalog.examples),
+        dates=dates,
+    )
 
-                f.write("""            <div class="row">
-""")
 
-                # Left column (explanation)
-                if explanation:
-                    f.write(f"""                <div class="docs" style='font-size: 0.9em; color: #666;'>
-                    {escape(explanation)}
-                </div>
-""")
+def _render_page_in_worker(example_id: str) -> Tuple[list, Dict[Path, bool]]:
+    """Render one example page and return its log records and output files."""
+    catalog = _page_worker["catalog"]
+    generate_example_html(
+        catalog.by_id[example_id],
+        catalog,
+        _page_worker["output_dir"],
+        _page_worker["tree"],
+        _page_worker["navigation"],
+        _page_worker["dates"].get(example_id),
+    )
+    return take_worker_logs(), site_output.take()
 
-                # Right column (command + output)
-                f.write(f"""                <div class="code">
-                    <div class="buttons">
-                        <svg class="copy" title="Copy command" onclick="copyCode(this)" width="18" height="18" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-                            <path d="M16 1H4C2.9 1 2 1.9 2 3V17H4V3H16V1ZM19 5H8C6.9 5 6 5.9 6 7V21C6 22.1 6.9 23 8 23H19C20.1 23 21 22.1 21 21V7C21 5.9 20.1 5 19 5ZM19 21H8V7H19V21Z" fill="currentColor"/>
-                        </svg>
-                    </div>
-                    <pre><code class="language-shell"><span><span class="command-prompt">$ </span><span class="command-text">{escape(command)}</span></span>
-{escape(output)}</code></pre>
-                </div>
-""")
 
-                f.write("""            </div>
-""")
+def render_example_pages(
+    catalog: ExampleCatalog,
+    output_dir: Path,
+    tree: Optional[SourceTree] = None,
+    jobs: int = 1,
+    navigation: Optional[Navigation] = None,
+    dates: Optional[Dict[str, int]] = None,
+) -> None:
+    """
+    Render the page of every example in the catalog.
 
-        # Images section if available
-        image_data = example.get("image_data", [])
-        if image_data:
-            f.write("""            <hr>
-""")
+    Pages only depend on the catalog, so with more than one job they are
+    rendered in a process pool. Each page is written atomically, and the
+    log lines of each page are replayed in catalog order, so the output and
+    the log are the same as for a serial build.
 
-            for image in image_data:
-                filename = image.get("filename", "")
-
-                # Create a figure with the image
-                f.write(f"""            <div style="margin: 30px 0; text-align: center;">
-                <figure>
-                    <img src="images/{filename}" alt="An illustration or output
-                    from the example code" style="max-width: 100%; border: 1px solid #eee;
-                    border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                    <figcaption style="margin-top: 10px; color: #666; font-style: italic;"></figcaption>
-                </figure>
-            </div>
-""")
+    Args:
+        catalog: Catalog of the examples to render
+        output_dir: Path to the docs directory
+        tree: Manifest of the examples tree
+        jobs: Number of worker processes to use
+        navigation: Navigation graph of the catalog, if already computed
+        dates: "Last updated" timestamp of each example (see site_dates)
+    """
+    examples = catalog.examples
+    dates = dates or {}
+    if jobs <= 1 or len(examples) <= 1:
+        if navigation is None:
+            navigation = Navigation(examples)
+        for example in examples:
+            with profiler.phase("example page", example=example.id):
+                generate_example_html(
+                    example,
+                    catalog,
+                    output_dir,
+                    tree,
+                    navigation,
+                    dates.get(example.id),
+                )
+        return
 
-        # Documentation links section if available
-        documentation_links = example.get("documentation_links", [])
-        if documentation_links:
-            f.write("""            <hr>
-            <h4>Further Information</h4>
-            <ul style="font-size: 0.9em;">
-""")
-            for i, link in enumerate(documentation_links, 1):
-                f.write(f"""                <li><a href="{link}"
-                         target="_blank">Gemini docs link {i}</a></li>
-""")
-            f.write("""            </ul>
-""")
+    workers = min(jobs, len(examples))
+    chunksize = max(1, len(examples) // (workers * 4))
+    with (
+        profiler.phase("example pages", jobs=workers),
+        ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_page_worker,
+            initargs=(catalog, output_dir, tree, STATIC_ASSETS, dates, MINIFY_HTML),
+        ) as executor,
+    ):
+        results = executor.map(
+            _render_page_in_worker,
+            [example.id for example in examples],
+            chunksize=chunksize,
+        )
+        for records, produced in results:
+            replay_logs(records)
+            site_output.record(produced)
 
-        # Navigation links
-        f.write("""            <div class="navigation">
-""")
 
-        # Previous example link
-        if prev_example:
-            f.write(f"""                <p class="prev">
-                    <span>← Previous:</span> <a href="../{prev_example["id"]}/">{prev_example["title"]}</a>
-                </p>
-""")
+def generate_search_index(catalog: ExampleCatalog, output_dir: Path) -> None:
+    """
+    Write the search index that static/js/search.js queries.
 
-        # Next example link
-        if next_example:
-            f.write(f"""                <p class="next">
-                    <span>Next:</span> <a href="../{next_example["id"]}/">{next_example["title"]}</a> →
-                </p>
-""")
+    Indexes the titles, descriptions, annotations, code and shell commands
+    of every example (see sitegen.search).
+    """
+    search_dir = output_dir / "search"
+    term_count = write_search_index(catalog.examples, search_dir)
+    logger.info(f"Generated search index of {term_count} terms at {search_dir}")
 
-        f.write("""            </div>
-""")
 
-        f.write(generate_html_footer())
+def copy_static_files(
+    source_dir: Path, output_dir: Path, catalog: Optional[ExampleCatalog] = None
+) -> Dict[str, str]:
+    """
+    Copy static files to the output directory.
 
-    logger.info("Generated example page at %s" % output_file)
+    Stylesheets and scripts are published under fingerprinted names (see
+    sitegen.assets), which pages generated afterwards link to. With a
+    catalog, the web fonts are published too, subset to its characters.
 
+    Args:
+        source_dir: The static source directory
+        output_dir: Path to the docs directory
+        catalog: Examples whose code the fonts have to show
 
-def copy_static_files(source_dir: Path, output_dir: Path) -> None:
-    """Copy static files to the output directory."""
+    Returns:
+        Published path of each fingerprinted asset
+    """
     target_dir = output_dir / "static"
 
     # Create target directory
@@ -843,26 +783,39 @@ def copy_static_files(source_dir: Path, output_dir: Path) -> None:
     # Copy static files
     if source_dir.exists():
         logger.info("Copying static files from %s to %s" % (source_dir, target_dir))
-        shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
+        STATIC_ASSETS.clear()
+        STATIC_ASSETS.update(publish_static_files(source_dir, target_dir))
     else:
         logger.warning("Static directory %s does not exist" % source_dir)
 
+    if catalog is not None:
+        project_root = Path(__file__).parent
+        STATIC_ASSETS.update(
+            publish_fonts(
+                code_characters(catalog),
+                project_root / "fonts",
+                target_dir,
+                project_root / ".build_cache" / "fonts",
+            )
+        )
+    return dict(STATIC_ASSETS)
+
 
-def extract_code_from_example(example: Dict[str, Any]) -> str:
+def extract_code_from_example(example: Example) -> str:
     """Extract all Python code from an example's code segments."""
     code = ""
-    for segment in example.get("code_segments", []):
-        if segment.get("display_code", "").strip():
-            code += segment.get("display_code", "").strip() + "\n"
+    for segment in example.code_segments:
+        if segment.display_code.strip():
+            code += segment.display_code.strip() + "\n"
     return code.strip()
 
 
-def extract_shell_from_example(example: Dict[str, Any]) -> str:
+def extract_shell_from_example(example: Example) -> str:
     """Extract shell commands and outputs from an example."""
     shell = ""
-    for segment in example.get("shell_segments", []):
-        cmd = segment.get("command", "").strip()
-        out = segment.get("output", "").strip()
+    for segment in example.shell_segments:
+        cmd = segment.command.strip()
+        out = segment.output.strip()
         if cmd:
             shell += f"$ {cmd}\n"
             if out:
@@ -870,23 +823,13 @@ def extract_shell_from_example(example: Dict[str, Any]) -> str:
     return shell.strip()
 
 
-def generate_llms_ctx_txt(
-    examples: List[Dict[str, Any]], sections: List[Dict[str, Any]], output_dir: Path
-) -> None:
+def generate_llms_ctx_txt(catalog: ExampleCatalog, output_dir: Path) -> None:
     """Generate llms-ctx.txt file with organized headers and full example code."""
     logger.info("Generating llms-ctx.txt")
 
     output_file = output_dir / "llms-ctx.txt"
 
-    # Group examples by section
-    examples_by_section = {}
-    for example in examples:
-        section_id = example.get("section_id", "999-misc")
-        if section_id not in examples_by_section:
-            examples_by_section[section_id] = []
-        examples_by_section[section_id].append(example)
-
-    with open(output_file, "w") as f:
+    with site_output.open(output_file) as f:
         # Main heading and introduction
         f.write("# Gemini by Example\n\n")
         f.write(
@@ -898,37 +841,37 @@ def generate_llms_ctx_txt(
 
         # Table of contents
         f.write("## Table of Contents\n\n")
-        for section in sorted(sections, key=lambda s: s["order"]):
-            section_examples = examples_by_section.get(section["id"], [])
+        for section in catalog.ordered_sections:
+            section_examples = catalog.by_section.get(section.id, [])
             if not section_examples:
                 continue
 
-            f.write(f"* {section['title']}\n")
-            for example in sorted(section_examples, key=lambda e: e["order"]):
-                f.write(f"  * {example['title']}\n")
+            f.write(f"* {section.title}\n")
+            for example in section_examples:
+                f.write(f"  * {example.title}\n")
         f.write("\n")
 
         # Each section with its examples
-        for section in sorted(sections, key=lambda s: s["order"]):
-            section_examples = examples_by_section.get(section["id"], [])
+        for section in catalog.ordered_sections:
+            section_examples = catalog.by_section.get(section.id, [])
             if not section_examples:
                 continue
 
             # Section heading
-            f.write(f"## {section['title']}\n\n")
+            f.write(f"## {section.title}\n\n")
 
             # Section description if available
-            if section.get("description"):
-                f.write(f"{section['description']}\n\n")
+            if section.description:
+                f.write(f"{section.description}\n\n")
 
             # Each example in the section
-            for example in sorted(section_examples, key=lambda e: e["order"]):
+            for example in section_examples:
                 # Example heading
-                f.write(f"### {example['title']}\n\n")
+                f.write(f"### {example.title}\n\n")
 
                 # Example description if available
-                if example.get("description"):
-                    f.write(f"{example['description']}\n\n")
+                if example.description:
+                    f.write(f"{example.description}\n\n")
 
                 # Python code
                 python_code = extract_code_from_example(example)
@@ -945,13 +888,13 @@ def generate_llms_ctx_txt(
                     f.write("\n```\n\n")
 
                 # Image references if any
-                if example.get("image_data"):
+                if example.image_data:
                     f.write(
                         "*This example includes images which can be viewed on the website.*\n\n"
                     )
 
                 # Documentation links if any
-                documentation_links = example.get("documentation_links", [])
+                documentation_links = example.documentation_links
                 if documentation_links:
                     f.write("For more information, see the original documentation:\n")
                     for link in documentation_links:
@@ -962,22 +905,14 @@ def generate_llms_ctx_txt(
 
 
 def generate_llms_txt(
-    examples: List[Dict[str, Any]], sections: List[Dict[str, Any]], output_dir: Path
+    catalog: ExampleCatalog, output_dir: Path, updated: Optional[int] = None
 ) -> None:
     """Generate llms.txt file with simplified content and links to examples."""
     logger.info("Generating simplified llms.txt")
 
     output_file = output_dir / "llms.txt"
 
-    # Group examples by section
-    examples_by_section = {}
-    for example in examples:
-        section_id = example.get("section_id", "999-misc")
-        if section_id not in examples_by_section:
-            examples_by_section[section_id] = []
-        examples_by_section[section_id].append(example)
-
-    with open(output_file, "w") as f:
+    with site_output.open(output_file) as f:
         # Main heading and introduction
         f.write("# Gemini by Example\n\n")
         f.write(
@@ -1003,23 +938,23 @@ def generate_llms_txt(
         )
 
         # Each section with its examples
-        for section in sorted(sections, key=lambda s: s["order"]):
-            section_examples = examples_by_section.get(section["id"], [])
+        for section in catalog.ordered_sections:
+            section_examples = catalog.by_section.get(section.id, [])
             if not section_examples:
                 continue
 
             # Section heading
-            f.write(f"## {section['title']}\n\n")
+            f.write(f"## {section.title}\n\n")
 
             # Each example in the section as a bullet point
-            for example in sorted(section_examples, key=lambda e: e["order"]):
+            for example in section_examples:
                 f.write(
-                    f"- [{example['title']}](https://geminibyexample.com/{example['id']}/)"
+                    f"- [{example.title}](https://geminibyexample.com/{example.id}/)"
                 )
-                if example.get("description"):
+                if example.description:
                     # Clean description - replace newlines with spaces and get first sentence
                     clean_desc = (
-                        example["description"].replace("\n", " ").replace("\r", " ")
+                        example.description.replace("\n", " ").replace("\r", " ")
                     )
                     while (
                         "  " in clean_desc
@@ -1031,8 +966,7 @@ def generate_llms_txt(
             f.write("\n")
             
         # Add footer information
-        from datetime import datetime
-        current_date = datetime.now().strftime("%B %-d, %Y")
+        current_date = format_date(updated)
         
         f.write("## Resources\n\n")
         f.write("- [Official Gemini Documentation](https://ai.google.dev/gemini-api/docs)\n")
@@ -1044,60 +978,113 @@ def generate_llms_txt(
     logger.info(f"Generated simplified llms.txt at {output_file}")
 
 
-def clean_docs_directory(output_dir: Path) -> None:
+def site_dates(tree: SourceTree) -> Tuple[Dict[str, int], Optional[int]]:
     """
-    Clean up old files and example directories in the docs directory.
+    Work out the "last updated" dates shown on the site.
 
-    Preserves important files like CNAME, .nojekyll, etc.
+    Dates only depend on the inputs (see sitegen.timestamps), so unchanged
+    inputs always produce byte-identical pages.
 
     Args:
-        output_dir: Path to the docs directory
+        tree: Manifest of the examples tree
+
+    Returns:
+        The timestamp of the newest input file of each example by id, and
+        the newest of those and data/sections.json for site-wide pages
+    """
+    project_root = tree.examples_dir.parent
+    sections_file = project_root / "data" / "sections.json"
+    commit_times = git_commit_times(
+        project_root, tree.examples_dir.name, "data/sections.json"
+    )
+    epoch = source_date_epoch()
+
+    dates = {}
+    for sources in tree.examples:
+        files = [
+            (source_file.path.resolve(), source_file.mtime_ns)
+            for source_file in sources.files
+            if source_file.kind in INPUT_KINDS
+        ]
+        timestamp = last_updated(files, commit_times, epoch)
+        if timestamp is not None:
+            dates[sources.name] = timestamp
+
+    # Sites with a flat list of examples have no sections file
+    site_files = []
+    if sections_file.exists():
+        site_files.append((sections_file.resolve(), sections_file.stat().st_mtime_ns))
+    sections_date = last_updated(site_files, commit_times, epoch)
+    timestamps = list(dates.values())
+    if sections_date is not None:
+        timestamps.append(sections_date)
+    return dates, max(timestamps, default=None)
+
+
+def remove_orphans(output_dir: Path) -> None:
     """
-    logger.info("Cleaning up old example directories and files in %s" % output_dir)
+    Delete the files earlier builds left in the docs directory.
 
-    # Files to preserve (never delete these)
-    preserve_files = {
-        "CNAME",  # Custom domain configuration
-        ".nojekyll",  # GitHub Pages configuration
-        ".gitignore",  # Git ignore file
-    }
+    The build owns static/ and every example directory, including those of
+    examples that no longer exist: files in them that this build did not
+    produce are deleted. Files directly in the docs directory, like CNAME
+    and .nojekyll, are never touched.
 
-    # Directories to preserve (never delete these)
-    preserve_dirs = {
-        "static"  # Static assets directory
+    Args:
+        output_dir: Path to the docs directory
+    """
+    produced = site_output.produced
+    owned = {
+        output_dir / path.relative_to(output_dir).parts[0]
+        for path in produced
+        if path.parent != output_dir
     }
+    owned.update(
+        item
+        for item in output_dir.iterdir()
+        if item.is_dir() and EXAMPLE_DIR_PATTERN.match(item.name)
+    )
+
+    removed = site_output.remove_orphans(sorted(owned))
+    for path in removed:
+        logger.info("Removed %s" % path)
+
+    logger.info(
+        f"Wrote {sum(produced.values())} of {len(produced)} output files, "
+        f"removed {len(removed)} orphaned files"
+    )
+
+
+def precompress_output(paths: List[Path], jobs: int = 1) -> None:
+    """
+    Write .gz (and .br) siblings of the text files among the output files.
 
-    # Remove index.html
-    index_file = output_dir / "index.html"
-    if index_file.exists():
-        index_file.unlink()
-        logger.info("Removed %s" % index_file)
-
-    # Remove llms.txt and llms-ctx.txt
-    llms_file = output_dir / "llms.txt"
-    if llms_file.exists():
-        llms_file.unlink()
-        logger.info("Removed %s" % llms_file)
-
-    llms_ctx_file = output_dir / "llms-ctx.txt"
-    if llms_ctx_file.exists():
-        llms_ctx_file.unlink()
-        logger.info("Removed %s" % llms_ctx_file)
-
-    # Remove all example directories (folders that match the pattern \d{3}-*)
-    for item in output_dir.iterdir():
-        if item.is_dir() and item.name not in preserve_dirs:
-            # Check if it's an example directory (matches pattern 001-*, 002-*, etc.)
-            if re.match(r"^\d{3}-", item.name):
-                shutil.rmtree(item)
-                logger.info("Removed directory %s" % item)
-
-
-def generate_static_site() -> None:
-    """Generate the complete static site."""
-    data = load_examples_data()
-    examples = data.get("examples", [])
-    sections = data.get("sections", [])
+    Args:
+        paths: Files produced by the build
+        jobs: Number of worker processes used to compress changed files
+    """
+    cache_dir = Path(__file__).parent / ".build_cache" / "compressed"
+    compressed = precompress(paths, cache_dir, jobs)
+    logger.info(f"Precompressed {compressed} output files not found in the cache")
+
+
+def generate_static_site(
+    catalog: Optional[ExampleCatalog] = None,
+    tree: Optional[SourceTree] = None,
+    jobs: int = 1,
+) -> None:
+    """
+    Generate the complete static site.
+
+    Args:
+        catalog: Compiled examples to render. If not given, they are loaded
+            from the data file written by build_examples.py.
+        tree: Manifest of the examples tree shared with the examples build
+        jobs: Number of worker processes used to render example pages
+    """
+    if catalog is None:
+        catalog = load_examples_data()
+    examples = catalog.examples
 
     if not examples:
         logger.error("No examples found. Exiting.")
@@ -1111,44 +1098,467 @@ def generate_static_site() -> None:
     output_dir.mkdir(exist_ok=True, parents=True)
     logger.info("Generating static site in %s" % output_dir)
 
-    # Clean up old files and directories
-    clean_docs_directory(output_dir)
+    # Start a fresh record of the files this build produces
+    site_output.take()
+
+    # Date pages by their inputs, not by when they were built
+    with profiler.phase("dates"):
+        if tree is None:
+            tree = SourceTree.scan(script_dir / "examples")
+        dates, site_date = site_dates(tree)
 
     # Copy static files
-    copy_static_files(static_dir, output_dir)
+    with profiler.phase("static copy"):
+        copy_static_files(static_dir, output_dir, catalog)
 
     # Generate llms-ctx.txt file (original format with full examples)
-    generate_llms_ctx_txt(examples, sections, output_dir)
+    with profiler.phase("llms-ctx.txt"):
+        generate_llms_ctx_txt(catalog, output_dir)
 
     # Generate llms.txt file (simplified format with links)
-    generate_llms_txt(examples, sections, output_dir)
+    with profiler.phase("llms.txt"):
+        generate_llms_txt(catalog, output_dir, site_date)
 
     # Generate index page
-    generate_index_html(examples, sections, output_dir)
+    with profiler.phase("index"):
+        generate_index_html(catalog, output_dir, site_date)
+
+    # Work out the previous/next links of every page once
+    with profiler.phase("navigation"):
+        navigation = Navigation(examples)
+
+    # Let readers search the examples without a server
+    with profiler.phase("search index"):
+        generate_search_index(catalog, output_dir)
 
     # Generate example pages
-    for example in examples:
-        generate_example_html(example, examples, output_dir)
+    render_example_pages(catalog, output_dir, tree, jobs, navigation, dates)
+
+    # Let servers send compressed files without compressing them per request
+    with profiler.phase("precompress"):
+        precompress_output(list(site_output.produced), jobs)
+
+    # Delete what earlier builds produced and this one did not
+    with profiler.phase("remove orphans"):
+        remove_orphans(output_dir)
 
     logger.info(
         "Static site generation complete! The site is available at %s" % output_dir
     )
 
 
-if __name__ == "__main__":
-    # First run the examples builder by importing it directly
+def compile_site_data(
+    write_data: bool = True,
+    data_format: str = "json",
+    use_cache: bool = True,
+    jobs: int = 1,
+) -> Tuple[SourceTree, ExampleCatalog]:
+    """
+    Scan the examples tree and compile it into a catalog.
+
+    Args:
+        write_data: Whether to also write the compiled data file
+        data_format: Encoding of the data file (see encoding.OUTPUT_FORMATS)
+        use_cache: Whether to reuse unchanged examples from the build manifest
+        jobs: Number of worker processes used to parse changed examples
+
+    Returns:
+        The scanned source tree and the compiled catalog
+    """
+    project_root = Path(__file__).parent
+    examples_dir = project_root / "examples"
+
+    # Scan the examples tree once and share it between both stages
+    logger.info("Scanning examples directory: %s" % examples_dir)
+    tree = scan_source_tree(examples_dir, project_root, use_cache)
+
     logger.info("Running examples builder first...")
-    import sys
+    catalog = build_examples_data(
+        examples_dir, project_root, use_cache=use_cache, jobs=jobs, tree=tree
+    )
+    if write_data:
+        write_examples_data(
+            catalog,
+            default_output_file(project_root, data_format),
+            data_format,
+            project_root / MANIFEST_FILE,
+        )
+    return tree, catalog
 
-    # Add the build_examples directory to sys.path if needed
-    build_examples_dir = Path(__file__).parent / "build_examples"
-    if str(build_examples_dir) not in sys.path:
-        sys.path.append(str(build_examples_dir))
 
-    # Import and run the main function from build_examples
-    from build_examples import main as build_examples_main
+def build_site(
+    write_data: bool = True,
+    data_format: str = "json",
+    use_cache: bool = True,
+    jobs: int = 1,
+) -> None:
+    """
+    Build the examples data and the static site in one process.
 
-    build_examples_main()
+    The compiled catalog is handed straight to the site generator, so the
+    data file is only an optional artifact and is never read back.
+
+    Args:
+        write_data: Whether to also write the compiled data file
+        data_format: Encoding of the data file (see encoding.OUTPUT_FORMATS)
+        use_cache: Whether to reuse unchanged examples from the build manifest
+        jobs: Number of worker processes used to parse changed examples and
+            render example pages
+    """
+    tree, catalog = compile_site_data(write_data, data_format, use_cache, jobs)
 
     # Then generate the static site
-    generate_static_site()
+    generate_static_site(catalog, tree, jobs)
+
+
+def find_pages_to_render(
+    previous: ExampleCatalog, catalog: ExampleCatalog, touched: Set[str]
+) -> Set[str]:
+    """
+    Work out which example pages are affected by a change.
+
+    A page depends on its own example (including its section) and on the
+    ids and titles of the examples its navigation links point to (the next
+    one is also its prefetch hint). Pages of
+    examples whose directory was touched are always re-rendered, since
+    their images may have changed without changing the compiled data.
+
+    Args:
+        previous: Catalog the current pages were rendered from
+        catalog: Newly compiled catalog
+        touched: Ids of example directories with changed files
+
+    Returns:
+        Ids of the example pages to re-render
+    """
+    previous_navigation = Navigation(previous.examples)
+    navigation = Navigation(catalog.examples)
+    return {
+        example.id
+        for example in catalog.examples
+        if example.id in touched
+        or previous.by_id.get(example.id) != example
+        or previous_navigation.links(example.id) != navigation.links(example.id)
+    }
+
+
+def rebuild_site(
+    previous: ExampleCatalog,
+    catalog: ExampleCatalog,
+    touched: Set[str],
+    output_dir: Path,
+    tree: Optional[SourceTree] = None,
+) -> int:
+    """
+    Re-render only the parts of the site affected by a change.
+
+    Args:
+        previous: Catalog the current pages were rendered from
+        catalog: Newly compiled catalog
+        touched: Ids of example directories with changed files
+        output_dir: Path to the docs directory
+        tree: Manifest of the examples tree
+
+    Returns:
+        Number of example pages that were re-rendered
+    """
+    # Drop the pages of deleted examples
+    for example_id in sorted(previous.by_id.keys() - catalog.by_id.keys()):
+        shutil.rmtree(output_dir / example_id, ignore_errors=True)
+        logger.info("Removed page of deleted example %s" % example_id)
+
+    navigation = Navigation(catalog.examples)
+    dates, site_date = site_dates(tree) if tree is not None else ({}, None)
+
+    # The index, llms files and the search index list every example
+    # and section, and the index and llms.txt show the date of the newest
+    # example
+    if (
+        previous.examples != catalog.examples
+        or previous.sections != catalog.sections
+        or touched
+    ):
+        with profiler.phase("llms-ctx.txt"):
+            generate_llms_ctx_txt(catalog, output_dir)
+        with profiler.phase("llms.txt"):
+            generate_llms_txt(catalog, output_dir, site_date)
+        with profiler.phase("index"):
+            generate_index_html(catalog, output_dir, site_date)
+        with profiler.phase("search index"):
+            generate_search_index(catalog, output_dir)
+
+    with profiler.phase("find affected pages"):
+        pages = find_pages_to_render(previous, catalog, touched)
+    for example in catalog.examples:
+        if example.id in pages:
+            with profiler.phase("example page", example=example.id):
+                generate_example_html(
+                    example,
+                    catalog,
+                    output_dir,
+                    tree,
+                    navigation,
+                    dates.get(example.id),
+                )
+    return len(pages)
+
+
+def touched_examples(paths: Set[Path], examples_dir: Path) -> Set[str]:
+    """Return the names of the example directories containing any of paths."""
+    touched = set()
+    for path in paths:
+        try:
+            relative = path.relative_to(examples_dir)
+        except ValueError:
+            continue
+        if relative.parts and re.match(r"^\d+", relative.parts[0]):
+            touched.add(relative.parts[0])
+    return touched
+
+
+def watch_site(
+    write_data: bool = True,
+    data_format: str = "json",
+    use_cache: bool = True,
+    jobs: int = 1,
+    live_reload: bool = True,
+    reload_port: int = DEFAULT_PORT,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_SERVE_PORT,
+) -> None:
+    """
+    Build the site, then rebuild the affected pages whenever a source changes.
+
+    Watches examples/, data/sections.json and static/, and serves the site
+    (see sitegen.server). Pages opened from the server are told to reload
+    over a local websocket after every rebuild. The server adds the script
+    that does this as it serves them, so the pages in docs/ stay as a
+    normal build writes them.
+
+    Args:
+        write_data: Whether to also write the compiled data file
+        data_format: Encoding of the data file (see encoding.OUTPUT_FORMATS)
+        use_cache: Whether to reuse unchanged examples from the build manifest
+        jobs: Number of worker processes used to parse changed examples
+        live_reload: Whether to run the live reload server
+        reload_port: Port of the live reload server
+        host: Address the site is served on
+        port: Port the site is served on
+    """
+    project_root = Path(__file__).parent.resolve()
+    examples_dir = project_root / "examples"
+    sections_file = project_root / "data" / "sections.json"
+    static_dir = project_root / "static"
+    output_dir = project_root / "docs"
+
+    reload_server = None
+    if live_reload:
+        reload_server = LiveReloadServer(port=reload_port)
+        try:
+            reload_server.start()
+        except OSError as e:
+            logger.warning(f"Live reload disabled, cannot listen on port {reload_port}: {e}")
+            reload_server = None
+
+    tree, catalog = compile_site_data(write_data, data_format, use_cache, jobs)
+    generate_static_site(catalog, tree, jobs)
+
+    site_server = None
+    try:
+        site_server = SiteServer(
+            output_dir,
+            host,
+            port,
+            html_snippet=(
+                client_script(reload_server.port) if reload_server is not None else None
+            ),
+        )
+    except OSError as e:
+        logger.warning(f"Not serving the site, cannot listen on port {port}: {e}")
+    else:
+        threading.Thread(target=site_server.serve_forever, daemon=True).start()
+        host, port = site_server.server_address[:2]
+        logger.info(f"Serving {output_dir} at http://{host}:{port}/")
+
+    watcher = FileWatcher([examples_dir, sections_file, static_dir])
+    logger.info(f"Watching for changes using {watcher.backend} (press Ctrl+C to stop)")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            start_time = time.perf_counter()
+
+            try:
+                site_output.take()
+                pages = 0
+                previous_assets = dict(STATIC_ASSETS)
+                if any(static_dir in path.parents for path in changed):
+                    with profiler.phase("static copy"):
+                        copy_static_files(static_dir, output_dir, catalog)
+
+                if any(
+                    path == sections_file or examples_dir in path.parents
+                    for path in changed
+                ):
+                    previous = catalog
+                    tree, catalog = compile_site_data(
+                        write_data, data_format, use_cache, jobs
+                    )
+                    # The fonts only hold the characters the examples use
+                    if code_characters(catalog) != code_characters(previous):
+                        with profiler.phase("static copy"):
+                            copy_static_files(static_dir, output_dir, catalog)
+                    pages += rebuild_site(
+                        previous,
+                        catalog,
+                        touched_examples(changed, examples_dir),
+                        output_dir,
+                        tree,
+                    )
+
+                if STATIC_ASSETS != previous_assets:
+                    # Every page links to the assets by fingerprint
+                    dates, site_date = site_dates(tree)
+                    generate_index_html(catalog, output_dir, site_date)
+                    render_example_pages(catalog, output_dir, tree, jobs, dates=dates)
+                    pages = len(catalog.examples)
+                with profiler.phase("precompress"):
+                    written = [p for p, w in site_output.produced.items() if w]
+                    precompress_output(written, jobs)
+            except Exception as e:
+                logger.error(f"Rebuild failed: {e}")
+                continue
+
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            logger.info(f"Rebuilt {pages} example pages in {elapsed_ms:.0f} ms")
+            if reload_server is not None:
+                reload_server.broadcast("reload")
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
+    finally:
+        watcher.close()
+        if site_server is not None:
+            site_server.shutdown()
+            site_server.server_close()
+        if reload_server is not None:
+            reload_server.close()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Build the Gemini by Example data and static site"
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=("build", "watch", "serve"),
+        default="build",
+        help="Build the site once (default), build it and rebuild on changes, "
+        "or serve the built site locally",
+    )
+    parser.add_argument(
+        "--no-data-file",
+        action="store_true",
+        help="Do not write the compiled examples data file to data/",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Encoding of the examples data file (default: json)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the build manifest and re-parse every example",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes used to parse examples and render pages "
+        "(default: 1)",
+    )
+    parser.add_argument(
+        "--reload-port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port of the live reload websocket in watch mode (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--no-live-reload",
+        action="store_true",
+        help="Do not reload open pages after rebuilds in watch mode",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address the serve and watch commands serve the site on "
+        "(default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVE_PORT,
+        help="Port the serve and watch commands serve the site on "
+        f"(default: {DEFAULT_SERVE_PORT})",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="Minify the HTML pages, keeping <pre> blocks as they are",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=str(DEFAULT_PROFILE_FILE),
+        metavar="TRACE_FILE",
+        help="Time each build phase, log a summary table and write a Chrome "
+        "trace to TRACE_FILE (default: .build_cache/profile-trace.json)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the site build."""
+    global MINIFY_HTML
+
+    args = parse_args()
+    if args.profile:
+        profiler.enable()
+    MINIFY_HTML = args.minify
+
+    if args.command == "watch":
+        # The profile covers the initial build and every rebuild
+        watch_site(
+            write_data=not args.no_data_file,
+            data_format=args.format,
+            use_cache=not args.no_cache,
+            jobs=args.jobs,
+            live_reload=not args.no_live_reload,
+            reload_port=args.reload_port,
+            host=args.host,
+            port=args.port,
+        )
+    elif args.command == "serve":
+        docs_dir = Path(__file__).parent / "docs"
+        if not (docs_dir / "index.html").exists():
+            logger.error(f"No site in {docs_dir}, run a build first")
+            sys.exit(1)
+        serve_site(docs_dir, args.host, args.port)
+    else:
+        build_site(
+            write_data=not args.no_data_file,
+            data_format=args.format,
+            use_cache=not args.no_cache,
+            jobs=args.jobs,
+        )
+
+    if args.profile:
+        profiler.report(Path(args.profile))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Helpers for build_static_site.py.
+
+These modules only depend on the standard library, plus optional packages
+they can do without, and never import the build scripts themselves, so
+build_static_site.py can use them freely.
+"""
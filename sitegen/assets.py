@@ -0,0 +1,113 @@
+"""
+Fingerprinted static assets.
+
+Stylesheets and scripts are published under a name that contains a hash of
+their content, so css/site.css is written as css/site.<hash>.css. A page
+that references the fingerprinted name can be cached by browsers for as
+long as they like: when the file changes, so do its name and every
+reference to it.
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Dict
+
+from sitegen.output import site_output
+
+logger = logging.getLogger(__name__)
+
+# Files published under a fingerprinted name
+FINGERPRINTED_SUFFIXES = {".css", ".js"}
+
+# Length of the content hash in fingerprinted names
+FINGERPRINT_LENGTH = 10
+
+# Matches fingerprinted names, e.g. "site.0123456789.css"
+FINGERPRINT_PATTERN = re.compile(
+    rf"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{FINGERPRINT_LENGTH}}})(?P<suffix>\.[^.]+)$"
+)
+
+
+def fingerprinted_name(name: str, data: bytes) -> str:
+    """
+    Return the name a file is published under.
+
+    Args:
+        name: File name, e.g. "site.css"
+        data: Contents of the file
+
+    Returns:
+        The name with a hash of the contents before the suffix
+    """
+    path = Path(name)
+    digest = hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def _remove_outdated(published: Path, source_name: str) -> None:
+    """Remove earlier published versions of a fingerprinted file."""
+    source = Path(source_name)
+    for existing in published.parent.glob(f"{source.stem}*{source.suffix}"):
+        if existing == published:
+            continue
+        match = FINGERPRINT_PATTERN.match(existing.name)
+        unhashed = existing.name == source.name
+        if unhashed or (match and match.group("stem") == source.stem):
+            existing.unlink()
+            logger.info(f"Removed outdated asset {existing}")
+
+
+def publish_asset(target_dir: Path, name: str, data: bytes) -> str:
+    """
+    Publish content under a fingerprinted name, removing earlier versions.
+
+    Args:
+        target_dir: The static output directory
+        name: Path of the file relative to it, e.g. "css/site.css"
+        data: Contents of the file
+
+    Returns:
+        The published path relative to target_dir, e.g. "css/site.0123456789.css"
+    """
+    target = target_dir / name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    published = target.with_name(fingerprinted_name(target.name, data))
+    # The name guarantees the content of a published file
+    if published.exists():
+        site_output.keep(published)
+    else:
+        site_output.write(published, data)
+        logger.info(f"Published {name} as {published.name}")
+    _remove_outdated(published, target.name)
+    return published.relative_to(target_dir).as_posix()
+
+
+def publish_static_files(source_dir: Path, target_dir: Path) -> Dict[str, str]:
+    """
+    Copy a static directory, fingerprinting stylesheets and scripts.
+
+    Stylesheets and scripts are published with publish_asset. Other files
+    are copied under their own name if they changed.
+
+    Args:
+        source_dir: The static source directory
+        target_dir: Where to publish it
+
+    Returns:
+        Published path of each fingerprinted file, both relative to the
+        directory, e.g. {"css/site.css": "css/site.0123456789.css"}
+    """
+    assets = {}
+    for source in sorted(source_dir.rglob("*")):
+        if not source.is_file():
+            continue
+        relative = source.relative_to(source_dir).as_posix()
+        if source.suffix in FINGERPRINTED_SUFFIXES:
+            assets[relative] = publish_asset(target_dir, relative, source.read_bytes())
+        else:
+            target = target_dir / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            site_output.copy(source, target)
+    return assets
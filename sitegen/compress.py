@@ -0,0 +1,125 @@
+"""
+Precompressed siblings of the site's text files.
+
+Static hosts such as nginx (gzip_static, brotli_static) serve index.html.gz
+or index.html.br in place of index.html to clients that accept them, which
+saves compressing the file on every request. precompress writes these
+siblings at the highest compression levels, as they are made only once per
+content: results are cached in the build cache under the hash of the file.
+
+Gzip output has no timestamp or file name, so it is reproducible. Brotli
+siblings need the optional brotli package.
+"""
+
+import gzip
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from pathlib import Path
+from typing import Callable, Iterable, List, Tuple
+
+from sitegen.output import open_atomic, site_output
+
+logger = logging.getLogger(__name__)
+
+# Text formats worth compressing; images and fonts are compressed already
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".json", ".txt", ".svg", ".xml", ".py"}
+
+# Smaller files fit in a packet or two either way
+MIN_SIZE = 512
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+@lru_cache(maxsize=None)
+def encoders() -> Tuple[Tuple[str, Callable[[bytes], bytes]], ...]:
+    """Return the (sibling suffix, compress function) pairs available."""
+    try:
+        import brotli
+    except ImportError:
+        logger.info("brotli is not installed, so no .br files (pip install brotli)")
+        return ((".gz", _gzip),)
+
+    def _brotli(data: bytes) -> bytes:
+        return brotli.compress(data, quality=11)
+
+    return ((".gz", _gzip), (".br", _brotli))
+
+
+def _cache_path(cache_dir: Path, digest: str, suffix: str) -> Path:
+    return cache_dir / f"{digest}{suffix}"
+
+
+def _compress_file(path: Path, digest: str, cache_dir: Path) -> None:
+    """Compress a file into the cache with every encoder missing there."""
+    data = path.read_bytes()
+    for suffix, compress in encoders():
+        cached = _cache_path(cache_dir, digest, suffix)
+        if not cached.exists():
+            with open_atomic(cached, "wb") as f:
+                f.write(compress(data))
+
+
+def precompress(paths: Iterable[Path], cache_dir: Path, jobs: int = 1) -> int:
+    """
+    Write compressed siblings next to text files, e.g. index.html.gz.
+
+    Files are compressed in jobs processes, unless the cache already holds
+    their compressed content. A sibling is only published if it is smaller
+    than the file, and stale siblings of files too small to compress are
+    removed.
+
+    Args:
+        paths: Output files; those without a compressible suffix are skipped
+        cache_dir: Directory holding compressed content by hash
+        jobs: Number of worker processes to use
+
+    Returns:
+        Number of files that had to be compressed
+    """
+    suffixes = [suffix for suffix, _ in encoders()]
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    files: List[Tuple[Path, str, int]] = []
+    pending: List[Tuple[Path, str]] = []
+    for path in sorted(paths):
+        if path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        data = path.read_bytes()
+        if len(data) < MIN_SIZE:
+            for suffix in suffixes:
+                path.with_name(path.name + suffix).unlink(missing_ok=True)
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        files.append((path, digest, len(data)))
+        if not all(_cache_path(cache_dir, digest, s).exists() for s in suffixes):
+            pending.append((path, digest))
+
+    if jobs <= 1 or len(pending) <= 1:
+        for path, digest in pending:
+            _compress_file(path, digest, cache_dir)
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+            # Consume the results to surface errors from the workers
+            list(
+                executor.map(
+                    _compress_file,
+                    [path for path, _ in pending],
+                    [digest for _, digest in pending],
+                    repeat(cache_dir),
+                )
+            )
+
+    for path, digest, size in files:
+        for suffix in suffixes:
+            cached = _cache_path(cache_dir, digest, suffix)
+            sibling = path.with_name(path.name + suffix)
+            if cached.stat().st_size < size:
+                site_output.link(cached, sibling)
+            else:
+                sibling.unlink(missing_ok=True)
+    return len(pending)
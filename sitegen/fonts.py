@@ -0,0 +1,156 @@
+"""
+Self-hosted web fonts, subset to the characters the site shows.
+
+Loading fonts from a CDN costs every first page view a DNS lookup and a
+connection to another host before code can be drawn in its font. Instead,
+the font files are kept in the repository (fonts/, with their license) and
+publish_fonts publishes them with the site under fingerprinted names,
+together with a stylesheet of @font-face rules. Pages preload the fonts so
+they arrive with the CSS. Builds never touch the network, so the same
+sources always give the same site.
+
+With the fontTools and brotli packages (see requirements.txt) the fonts
+are cut down to the glyphs of the characters the examples use, keeping
+ligatures and other OpenType features, which makes them a fraction of
+their size. Without them, the whole fonts are published.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple
+
+from sitegen.assets import publish_asset
+from sitegen.output import open_atomic
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class WebFont:
+    """A font file to self-host, with its @font-face descriptors."""
+
+    family: str
+    filename: str
+    weight: str = "normal"
+
+
+# Fonts of code blocks (see static/css/code.css), from Fira Code 6.2
+WEB_FONTS = (
+    WebFont("Fira Code", "FiraCode-Regular.woff2", weight="400"),
+    WebFont("Fira Code", "FiraCode-Bold.woff2", weight="700"),
+)
+
+# @font-face format() and MIME type of each font file suffix
+FONT_FORMATS = {
+    ".woff2": ("woff2", "font/woff2"),
+    ".woff": ("woff", "font/woff"),
+    ".ttf": ("truetype", "font/ttf"),
+    ".otf": ("opentype", "font/otf"),
+}
+
+
+@lru_cache(maxsize=None)
+def _import_subset():
+    """Return fontTools.subset if fonts can be subset here, else None."""
+    try:
+        # fontTools reads and writes WOFF2 fonts with brotli
+        import brotli  # noqa: F401
+        from fontTools import subset
+    except ImportError:
+        logger.info(
+            "fontTools or brotli is not installed, so fonts are not subset "
+            "(pip install fonttools brotli)"
+        )
+        return None
+    # fontTools logs each table it subsets
+    logging.getLogger("fontTools").setLevel(logging.WARNING)
+    return subset
+
+
+def subset_font(source: Path, text: str, cache_dir: Path) -> Tuple[bytes, str]:
+    """
+    Cut a font down to the glyphs needed to show some text.
+
+    Results are cached by the font, the text and the fontTools version.
+
+    Args:
+        source: The font file
+        text: Every character the font has to show
+        cache_dir: Directory holding subset fonts
+
+    Returns:
+        The contents and file suffix of the subset font, or of the original
+        font if it cannot be subset
+    """
+    subset = _import_subset()
+    if subset is None:
+        return source.read_bytes(), source.suffix
+
+    import fontTools
+
+    digest = hashlib.sha256(source.read_bytes())
+    digest.update(f"\0{text}\0{fontTools.version}".encode())
+    cached = cache_dir / f"{source.stem}-{digest.hexdigest()[:16]}.woff2"
+    if cached.exists():
+        return cached.read_bytes(), cached.suffix
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    # Keep ligatures, contextual alternates and the other features
+    options.layout_features = ["*"]
+    try:
+        font = subset.load_font(str(source), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(text=text)
+        subsetter.subset(font)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open_atomic(cached, "wb") as f:
+            subset.save_font(font, f, options)
+    except Exception as e:
+        logger.warning(f"Cannot subset font {source}, publishing all of it: {e}")
+        return source.read_bytes(), source.suffix
+    logger.info(f"Subset font {source.name} to {len(set(text))} characters")
+    return cached.read_bytes(), cached.suffix
+
+
+def publish_fonts(
+    text: str, fonts_dir: Path, target_dir: Path, cache_dir: Path
+) -> Dict[str, str]:
+    """
+    Publish WEB_FONTS and a stylesheet with their @font-face rules.
+
+    Args:
+        text: Every character the fonts have to show
+        fonts_dir: Directory holding the font files of WEB_FONTS
+        target_dir: The static output directory
+        cache_dir: Directory holding subset fonts
+
+    Returns:
+        Published path of each font and of "css/fonts.css", both relative to
+        target_dir (see publish_asset). Empty if any font file is missing.
+    """
+    assets = {}
+    rules = []
+    for font in WEB_FONTS:
+        source = fonts_dir / font.filename
+        if not source.exists():
+            logger.warning(f"Font {source} not found, so no fonts are published")
+            return {}
+        data, suffix = subset_font(source, text, cache_dir)
+        name = f"fonts/{source.stem}{suffix}"
+        assets[name] = publish_asset(target_dir, name, data)
+        rules.append(
+            f"@font-face {{\n"
+            f"    font-family: '{font.family}';\n"
+            f"    src: url('../{assets[name]}') format('{FONT_FORMATS[suffix][0]}');\n"
+            f"    font-weight: {font.weight};\n"
+            f"    font-display: swap;\n"
+            f"}}\n"
+        )
+    assets["css/fonts.css"] = publish_asset(
+        target_dir, "css/fonts.css", "".join(rules).encode()
+    )
+    return assets
@@ -0,0 +1,171 @@
+"""
+Syntax highlighting of code blocks at build time.
+
+Code is tokenized with Pygments and wrapped in spans with the class names
+highlight.js uses (hljs-keyword, hljs-string, ...), so pages look the same
+as when highlight.js ran in the browser, without loading or running it.
+
+Lexing is the slowest part of rendering a page, so highlighted HTML is
+cached in the build cache under a hash of the code, one file per code
+block. Without Pygments, code is shown escaped but not highlighted.
+"""
+
+import hashlib
+import logging
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sitegen.output import open_atomic
+
+logger = logging.getLogger(__name__)
+
+# Pygments lexer of each language name used in the templates
+LEXERS = {"python": "PythonLexer", "shell": "BashLexer"}
+
+# highlight.js class of each Pygments token type. Types not listed take the
+# class of their closest listed parent, or none.
+TOKEN_CLASSES = {
+    "Keyword": "hljs-keyword",
+    "Keyword.Constant": "hljs-literal",
+    "Operator.Word": "hljs-keyword",
+    "Name.Builtin": "hljs-built_in",
+    "Name.Builtin.Pseudo": None,
+    "Name.Function": "hljs-title function_",
+    "Name.Function.Magic": "hljs-title function_",
+    "Name.Class": "hljs-title class_",
+    "Name.Decorator": "hljs-meta",
+    "Name.Variable": "hljs-variable",
+    "Literal.String": "hljs-string",
+    "Literal.String.Interpol": "hljs-subst",
+    "Literal.String.Escape": "hljs-char escape_",
+    "Literal.Number": "hljs-number",
+    "Comment": "hljs-comment",
+    "Comment.Hashbang": "hljs-meta",
+}
+
+
+@lru_cache(maxsize=None)
+def _import_lexers():
+    try:
+        from pygments import lexers
+    except ImportError:
+        logger.info("Pygments is not installed, so code is not highlighted")
+        return None
+    return lexers
+
+
+@lru_cache(maxsize=None)
+def _lexer(language: str):
+    """Return the Pygments lexer for a language, or None if unavailable."""
+    lexers = _import_lexers()
+    if lexers is None:
+        return None
+    # Keep the code as it is: no stripped or added newlines
+    return getattr(lexers, LEXERS[language])(stripnl=False, ensurenl=False)
+
+
+@lru_cache(maxsize=None)
+def _pygments_version() -> str:
+    import pygments
+
+    return pygments.__version__
+
+
+@lru_cache(maxsize=None)
+def _token_class(token_type) -> Optional[str]:
+    """Return the highlight.js class of a Pygments token type."""
+    while token_type:
+        name = ".".join(token_type)
+        if name in TOKEN_CLASSES:
+            return TOKEN_CLASSES[name]
+        token_type = token_type.parent
+    return None
+
+
+def highlight_html(code: str, language: str) -> str:
+    """
+    Highlight code without caching.
+
+    Args:
+        code: The code to highlight
+        language: A key of LEXERS
+
+    Returns:
+        The escaped code, with tokens wrapped in highlight.js spans
+    """
+    lexer = _lexer(language)
+    if lexer is None:
+        return escape(code)
+
+    parts = []
+    # Join runs of tokens with the same class into one span, leaving the
+    # whitespace between tokens outside of spans
+    run_class = None
+    run = []
+    for token_type, value in lexer.get_tokens(code):
+        css_class = _token_class(token_type) if value.strip() else None
+        if css_class != run_class and run:
+            text = escape("".join(run))
+            parts.append(
+                f'<span class="{run_class}">{text}</span>' if run_class else text
+            )
+            run = []
+        run_class = css_class
+        run.append(value)
+    if run:
+        text = escape("".join(run))
+        parts.append(f'<span class="{run_class}">{text}</span>' if run_class else text)
+    return "".join(parts)
+
+
+class Highlighter:
+    """
+    Highlights code blocks, caching the results in memory and on disk.
+
+    Attributes:
+        cache_dir: Directory holding the highlighted HTML of each code block
+        memo: Highlighted HTML by language and code, for this process
+    """
+
+    __slots__ = ("cache_dir", "memo")
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.memo: Dict[Tuple[str, str], str] = {}
+
+    def __call__(self, code: str, language: str) -> str:
+        """
+        Highlight code, reusing the result for code seen before.
+
+        Args:
+            code: The code to highlight
+            language: A key of LEXERS
+
+        Returns:
+            The escaped code, with tokens wrapped in highlight.js spans
+        """
+        html = self.memo.get((language, code))
+        if html is not None:
+            return html
+        if _lexer(language) is None:
+            return escape(code)
+
+        # A newer Pygments may tokenize differently
+        key = hashlib.sha256(
+            f"{_pygments_version()}\0{language}\0{code}".encode()
+        ).hexdigest()
+        cached = self.cache_dir / f"{key}.html"
+        try:
+            html = cached.read_bytes().decode()
+        except FileNotFoundError:
+            html = highlight_html(code, language)
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with open_atomic(cached, "wb") as f:
+                    f.write(html.encode())
+            except OSError as e:
+                logger.warning(f"Cannot cache highlighted code in {cached}: {e}")
+        self.memo[language, code] = html
+        return html
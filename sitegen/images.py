@@ -0,0 +1,218 @@
+"""
+Example images: intrinsic sizes, responsive variants and publishing.
+
+image_size reads the width and height of PNG, GIF, JPEG and WebP files
+from their headers, without decoding the image, so pages can reserve the
+space an image takes before it loads.
+
+With the optional Pillow package, publish_image also writes WebP (and AVIF,
+where Pillow supports it) variants of each image at a few widths for a
+srcset. Encoding is slow, so variants are cached in the build cache under
+the hash of the source image and only generated once per image, width and
+format. Pillow is not in requirements.txt; without it the variants are
+skipped and pages show the original image only.
+"""
+
+import hashlib
+import logging
+import struct
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from sitegen.output import open_atomic, site_output
+
+logger = logging.getLogger(__name__)
+
+# Widths of the generated variants; images are never scaled up
+VARIANT_WIDTHS = (480, 960, 1440)
+
+# (MIME type, Pillow format, suffix, save options) of each variant format,
+# best compression first, as browsers pick the first <source> they support
+VARIANT_FORMATS = (
+    ("image/avif", "AVIF", ".avif", {"quality": 60}),
+    ("image/webp", "WEBP", ".webp", {"quality": 80}),
+)
+
+# Display width of images on example pages, for the browser to pick a variant
+IMAGE_SIZES = "(max-width: 1100px) 100vw, 1060px"
+
+# JPEG start-of-frame markers, which hold the image size
+JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF
+}  # fmt: skip
+
+
+@dataclass(slots=True)
+class PublishedImage:
+    """An image as shown on an example page."""
+
+    filename: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    # (MIME type, srcset) of each variant format
+    sources: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def _jpeg_size(f) -> Optional[Tuple[int, int]]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        # Markers without a length
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            continue
+        header = f.read(2)
+        if len(header) < 2:
+            return None
+        (length,) = struct.unpack(">H", header)
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">xHH", frame)
+            return width, height
+        f.seek(length - 2, 1)
+
+
+def image_size(path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Read the width and height of an image from its header.
+
+    Args:
+        path: A PNG, GIF, JPEG or WebP file
+
+    Returns:
+        (width, height) in pixels, or None if the format is not recognized
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(30)
+            if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+                return struct.unpack(">II", header[16:24])
+            if header[:6] in (b"GIF87a", b"GIF89a"):
+                return struct.unpack("<HH", header[6:10])
+            if header.startswith(b"\xff\xd8"):
+                return _jpeg_size(f)
+            if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+                chunk = header[12:16]
+                if chunk == b"VP8 ":
+                    width, height = struct.unpack("<HH", header[26:30])
+                    return width & 0x3FFF, height & 0x3FFF
+                if chunk == b"VP8L":
+                    (bits,) = struct.unpack("<I", header[21:25])
+                    return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+                if chunk == b"VP8X":
+                    width = int.from_bytes(header[24:27], "little") + 1
+                    height = int.from_bytes(header[27:30], "little") + 1
+                    return width, height
+    except (OSError, struct.error) as e:
+        logger.warning(f"Cannot read the size of image {path}: {e}")
+    return None
+
+
+@lru_cache(maxsize=None)
+def variant_formats() -> tuple:
+    """Return the entries of VARIANT_FORMATS the installed Pillow can write."""
+    try:
+        from PIL import features
+    except ImportError:
+        logger.info("Pillow is not installed, so no WebP/AVIF image variants")
+        return ()
+    return tuple(entry for entry in VARIANT_FORMATS if features.check(entry[1].lower()))
+
+
+def variant_widths(width: int) -> List[int]:
+    """Return the widths to generate variants of an image at."""
+    # Widths close to the original would save little over the full size
+    return [w for w in VARIANT_WIDTHS if w <= width * 0.8] + [width]
+
+
+def _generate_variant(source: Path, target: Path, width: int, entry: tuple) -> None:
+    """Write one resized, re-encoded variant of an image."""
+    from PIL import Image
+
+    _, pillow_format, _, options = entry
+    with Image.open(source) as image:
+        if image.mode not in ("RGB", "RGBA"):
+            # Keep the alpha channel of LA images and of palette or grey
+            # images with a transparent colour
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        if width < image.width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        with open_atomic(target, "wb") as f:
+            image.save(f, format=pillow_format, **options)
+
+
+def publish_image(
+    source: Path,
+    images_dir: Path,
+    filename: str,
+    cache_dir: Path,
+    source_hash: Optional[str] = None,
+) -> PublishedImage:
+    """
+    Publish an image and its variants into an example's images directory.
+
+    The original is hard-linked (or copied) and left alone if it is already
+    up to date. Variants are taken from the cache, generating the missing
+    ones first.
+
+    Args:
+        source: The source image
+        images_dir: The images directory of the example's page
+        filename: Name of the published image
+        cache_dir: Directory holding generated variants
+        source_hash: SHA-256 of the source, if already known
+
+    Returns:
+        What the page needs to show the image
+    """
+    if site_output.link(source, images_dir / filename):
+        logger.info(f"Copied image {source} to {images_dir / filename}")
+
+    size = image_size(source)
+    if size is None:
+        return PublishedImage(filename)
+    published = PublishedImage(filename, *size)
+
+    formats = variant_formats()
+    if not formats:
+        return published
+
+    if source_hash is None:
+        source_hash = hashlib.sha256(source.read_bytes()).hexdigest()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    stem = Path(filename).stem
+
+    generated = 0
+    for entry in formats:
+        mime_type, _, suffix, _ = entry
+        candidates = []
+        for width in variant_widths(size[0]):
+            cached = cache_dir / f"{source_hash[:16]}-{width}{suffix}"
+            if not cached.exists():
+                try:
+                    _generate_variant(source, cached, width, entry)
+                except Exception as e:
+                    logger.error(f"Failed to create {suffix} variant of {source}: {e}")
+                    continue
+                generated += 1
+            variant_name = f"{stem}-{width}w{suffix}"
+            site_output.link(cached, images_dir / variant_name)
+            candidates.append(f"images/{variant_name} {width}w")
+        if candidates:
+            published.sources.append((mime_type, ", ".join(candidates)))
+
+    if generated:
+        logger.info(f"Generated {generated} variants of image {source}")
+    return published
@@ -0,0 +1,202 @@
+"""
+Minimal websocket server that tells open browser tabs to reload.
+
+In watch mode the preview server (sitegen.server.SiteServer) adds
+client_script() to pages as it serves them, so it never ends up in the
+built files. The script connects back to this server, and
+broadcast("reload") refreshes every connected tab after a rebuild. Only the parts of RFC 6455 needed for that
+are implemented: the opening handshake, unmasked text frames from the
+server and the closing handshake.
+"""
+
+import base64
+import hashlib
+import logging
+import socket
+import threading
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 35729
+
+# Magic value from RFC 6455 used to compute Sec-WebSocket-Accept
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_TEXT = 0x1
+OPCODE_CLOSE = 0x8
+
+
+def client_script(port: int) -> str:
+    """
+    Return the script tag that connects a page to the live reload server.
+
+    The page reloads when told to, and also when the connection comes back
+    after the server was restarted.
+    """
+    return f"""    <script>
+        (function() {{
+            var reconnecting = false;
+            function connect() {{
+                var socket = new WebSocket('ws://' + (location.hostname || 'localhost') + ':{port}/');
+                socket.onopen = function() {{
+                    if (reconnecting) {{
+                        location.reload();
+                    }}
+                }};
+                socket.onmessage = function(event) {{
+                    if (event.data === 'reload') {{
+                        location.reload();
+                    }}
+                }};
+                socket.onclose = function() {{
+                    reconnecting = true;
+                    setTimeout(connect, 1000);
+                }};
+            }}
+            connect();
+        }})();
+    </script>
+"""
+
+
+def encode_frame(payload: bytes, opcode: int = OPCODE_TEXT) -> bytes:
+    """Encode a single unmasked, unfragmented websocket frame."""
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 1 << 16:
+        header += bytes([126]) + length.to_bytes(2, "big")
+    else:
+        header += bytes([127]) + length.to_bytes(8, "big")
+    return header + payload
+
+
+def accept_key(key: str) -> str:
+    """Compute the Sec-WebSocket-Accept value for a client key."""
+    digest = hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+class LiveReloadServer:
+    """
+    Accept websocket connections from open pages and broadcast to them.
+
+    The server runs on daemon threads, so it never keeps the process alive.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self._socket: Optional[socket.socket] = None
+        self._clients: Set[socket.socket] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Bind the listening socket and start accepting connections."""
+        self._socket = socket.create_server((self.host, self.port))
+        self.port = self._socket.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        logger.info(f"Live reload server listening on ws://{self.host}:{self.port}/")
+
+    def _accept_loop(self) -> None:
+        while self._socket is not None:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self._handle_client, args=(connection,), daemon=True
+            ).start()
+
+    def _handshake(self, connection: socket.socket) -> bool:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = connection.recv(4096)
+            if not chunk or len(request) > 65536:
+                return False
+            request += chunk
+
+        key = None
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "sec-websocket-key":
+                key = value.strip()
+
+        if key is None:
+            connection.sendall(
+                b"HTTP/1.1 426 Upgrade Required\r\n"
+                b"Upgrade: websocket\r\nContent-Length: 0\r\n\r\n"
+            )
+            return False
+
+        connection.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n"
+            ).encode("ascii")
+        )
+        return True
+
+    def _handle_client(self, connection: socket.socket) -> None:
+        try:
+            if not self._handshake(connection):
+                return
+            with self._lock:
+                self._clients.add(connection)
+
+            # Pages never send anything but a close frame, so just wait for it
+            while True:
+                data = connection.recv(4096)
+                if not data:
+                    break
+                if data[0] & 0x0F == OPCODE_CLOSE:
+                    connection.sendall(encode_frame(b"", OPCODE_CLOSE))
+                    break
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._clients.discard(connection)
+            connection.close()
+
+    def broadcast(self, message: str) -> int:
+        """
+        Send a text message to every connected page.
+
+        Args:
+            message: The message to send
+
+        Returns:
+            Number of pages the message was delivered to
+        """
+        frame = encode_frame(message.encode("utf-8"))
+        with self._lock:
+            clients = list(self._clients)
+
+        delivered = 0
+        for connection in clients:
+            try:
+                connection.sendall(frame)
+                delivered += 1
+            except OSError:
+                with self._lock:
+                    self._clients.discard(connection)
+        return delivered
+
+    def close(self) -> None:
+        """Stop accepting connections and drop every connected page."""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        with self._lock:
+            clients = list(self._clients)
+            self._clients.clear()
+        for connection in clients:
+            try:
+                connection.close()
+            except OSError:
+                pass
@@ -0,0 +1,121 @@
+"""
+Minification of the site's HTML pages.
+
+Pages are written from indented templates, so much of their size is the
+indentation of the templates and comments. minify_html removes comments
+and collapses every run of whitespace between and within tags to a single
+space, or to a newline where the run spanned lines. Line breaks are kept
+so that minified pages still diff line by line. The contents of <pre>,
+<textarea>, <script> and <style> elements and attribute values are
+left exactly as they are, and so is how pages render: collapsing
+whitespace that is not preformatted does not change what browsers show.
+
+The result only depends on the input, and is cached in the build cache
+under the hash of the page, so unchanged pages are not minified again.
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+
+from sitegen.output import open_atomic
+
+logger = logging.getLogger(__name__)
+
+# Part of the cache key; change it whenever minify_html changes its output
+MINIFY_VERSION = "1"
+
+# A comment, an element whose content is kept verbatim, a tag, or text
+HTML_TOKEN = re.compile(
+    r"(?P<comment><!--.*?-->)"
+    r"|(?P<verbatim>(?P<open><(?P<name>pre|textarea|script|style)\b[^>]*>)"
+    r"(?P<content>.*?</(?P=name)\s*>))"
+    r"|(?P<tag><[^>]*>)"
+    r"|(?P<text>[^<]+|<)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Whitespace as HTML defines it; unlike \s, not the no-break space
+WHITESPACE = re.compile(r"[ \t\n\r\f]+")
+
+# Quoted attribute values within a tag
+QUOTED = re.compile(r"(\"[^\"]*\"|'[^']*')")
+
+
+def _collapse(match: re.Match) -> str:
+    return "\n" if "\n" in match.group() else " "
+
+
+def _minify_tag(tag: str) -> str:
+    """Collapse the whitespace between the attributes of a tag."""
+    parts = QUOTED.split(tag)
+    # Odd parts are quoted values
+    for i in range(0, len(parts), 2):
+        parts[i] = WHITESPACE.sub(" ", parts[i])
+    parts[-1] = re.sub(r" (?=/?>$)", "", parts[-1])
+    return "".join(parts)
+
+
+def minify_html(html: str) -> str:
+    """
+    Minify an HTML page without caching.
+
+    Args:
+        html: The page
+
+    Returns:
+        The page without comments and with collapsed whitespace
+    """
+    parts = []
+    for match in HTML_TOKEN.finditer(html):
+        kind = match.lastgroup
+        if kind == "comment":
+            continue
+        elif kind == "tag":
+            parts.append(_minify_tag(match.group()))
+        elif kind == "text":
+            parts.append(WHITESPACE.sub(_collapse, match.group()))
+        else:
+            parts.append(_minify_tag(match.group("open")))
+            parts.append(match.group("content"))
+    return "".join(parts)
+
+
+class HtmlMinifier:
+    """
+    Minifies pages, caching the results on disk.
+
+    Attributes:
+        cache_dir: Directory holding the minified version of each page
+    """
+
+    __slots__ = ("cache_dir",)
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    def __call__(self, page: bytes) -> bytes:
+        """
+        Minify a page, reusing the result for a page seen before.
+
+        Args:
+            page: The UTF-8 encoded page
+
+        Returns:
+            The minified page, UTF-8 encoded
+        """
+        digest = hashlib.sha256(MINIFY_VERSION.encode() + b"\0" + page)
+        cached = self.cache_dir / f"{digest.hexdigest()}.html"
+        try:
+            return cached.read_bytes()
+        except FileNotFoundError:
+            pass
+        minified = minify_html(page.decode()).encode()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open_atomic(cached, "wb") as f:
+                f.write(minified)
+        except OSError as e:
+            logger.warning(f"Cannot cache minified page in {cached}: {e}")
+        return minified
@@ -0,0 +1,102 @@
+"""
+Previous/next navigation between example pages.
+
+Navigation computes the links of every page in one pass, with the same
+semantics find_next_example and find_prev_example in build_static_site.py
+have always had: the next example is the first one with a higher order in
+the same section, or failing that the first one with a higher order among
+all examples (and the other way round for the previous example). Examples
+with equal order keep their catalog order, like the stable sorts in those
+functions.
+
+The next page's link doubles as a prefetch hint, which generate_html_head
+in build_static_site.py emits in each page's head.
+
+Examples only need id, title, order and section_id attributes.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def _neighbours(examples: Sequence[Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Find the previous and next example by order within one group.
+
+    Args:
+        examples: The group, in catalog order
+
+    Returns:
+        Previous and next example of each example id (missing if none)
+    """
+    ordered = sorted(examples, key=lambda e: e.order)
+    orders = [e.order for e in ordered]
+
+    prev_by_id = {}
+    next_by_id = {}
+    for example in ordered:
+        # Examples sharing the current order are neither before nor after it
+        first = bisect_left(orders, example.order)
+        after = bisect_right(orders, example.order)
+        if first > 0:
+            # The first of the group with the highest lower order
+            prev_by_id[example.id] = ordered[bisect_left(orders, orders[first - 1])]
+        if after < len(ordered):
+            next_by_id[example.id] = ordered[after]
+    return prev_by_id, next_by_id
+
+
+class Navigation:
+    """
+    Previous/next links of every example page, computed once.
+
+    Attributes:
+        examples: Examples in reading order
+    """
+
+    __slots__ = ("_next", "_prev", "examples")
+
+    def __init__(self, examples: Sequence[Any]):
+        self.examples = list(examples)
+
+        global_prev, global_next = _neighbours(self.examples)
+
+        sections: Dict[str, List[Any]] = {}
+        for example in self.examples:
+            if example.section_id:
+                sections.setdefault(example.section_id, []).append(example)
+
+        section_prev: Dict[str, Any] = {}
+        section_next: Dict[str, Any] = {}
+        for section_examples in sections.values():
+            prev_by_id, next_by_id = _neighbours(section_examples)
+            section_prev.update(prev_by_id)
+            section_next.update(next_by_id)
+
+        # Stay within the section when possible, else fall back to all examples
+        self._prev: Dict[str, Optional[Any]] = {}
+        self._next: Dict[str, Optional[Any]] = {}
+        for example in self.examples:
+            self._prev[example.id] = section_prev.get(
+                example.id, global_prev.get(example.id)
+            )
+            self._next[example.id] = section_next.get(
+                example.id, global_next.get(example.id)
+            )
+
+    def prev(self, example: Any) -> Optional[Any]:
+        """Return the example linked as "Previous" from an example's page."""
+        return self._prev.get(example.id)
+
+    def next(self, example: Any) -> Optional[Any]:
+        """Return the example linked as "Next" from an example's page."""
+        return self._next.get(example.id)
+
+    def links(self, example_id: str) -> Tuple[Optional[tuple], Optional[tuple]]:
+        """Return the (id, title) pairs an example's page links to."""
+        prev_example = self._prev.get(example_id)
+        next_example = self._next.get(example_id)
+        return (
+            (prev_example.id, prev_example.title) if prev_example else None,
+            (next_example.id, next_example.title) if next_example else None,
+        )
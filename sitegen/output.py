@@ -0,0 +1,208 @@
+"""
+Writing generated files into the output directory.
+"""
+
+import io
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Union
+
+
+@contextmanager
+def open_atomic(path: Path, mode: str = "w") -> Iterator[IO]:
+    """
+    Open a file for writing so that readers never see it half written.
+
+    Everything is written to a temporary file next to path, which replaces
+    path in one rename once the block completes. If the block raises, the
+    temporary file is removed and path is left untouched.
+
+    Args:
+        path: The file to write
+        mode: "w" for text or "wb" for bytes
+
+    Yields:
+        The open temporary file
+    """
+    # The pid keeps concurrent writers in different processes apart
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _has_content(path: Path, data: bytes) -> bool:
+    """Return whether path exists and holds exactly data."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+
+def _is_copy(source: Path, path: Path) -> bool:
+    """Return whether path exists and has the same content as source."""
+    source_stat = source.stat()
+    try:
+        target_stat = path.stat()
+    except FileNotFoundError:
+        return False
+    if target_stat.st_size != source_stat.st_size:
+        return False
+    # Links and copy2 keep the mtime, so a matching size and mtime means
+    # the file was published before; otherwise compare the contents
+    return target_stat.st_mtime_ns == source_stat.st_mtime_ns or _has_content(
+        path, source.read_bytes()
+    )
+
+
+class OutputSync:
+    """
+    Writes the output of a build, leaving files whose content is unchanged.
+
+    Each file goes through write, open, copy or link, which compare the new content
+    with the file on disk and only replace it if they differ. Unchanged
+    files keep their mtime, so servers keep their ETags and git sees no
+    change. Every file produced is recorded, and remove_orphans deletes the
+    files an earlier build left behind that this one did not produce.
+
+    Attributes:
+        produced: Files produced since the last take(), each mapped to
+            whether it was written
+    """
+
+    __slots__ = ("produced",)
+
+    def __init__(self):
+        self.produced: Dict[Path, bool] = {}
+
+    def write(self, path: Path, data: Union[str, bytes]) -> bool:
+        """
+        Write a file atomically, unless it already has this content.
+
+        Args:
+            path: The file to write
+            data: Its content; text is encoded as UTF-8
+
+        Returns:
+            Whether the file was written
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        written = not _has_content(path, data)
+        if written:
+            with open_atomic(path, "wb") as f:
+                f.write(data)
+        self.produced[path] = written
+        return written
+
+    @contextmanager
+    def open(self, path: Path, mode: str = "w") -> Iterator[IO]:
+        """
+        Open a file for writing into memory, then write it as write() does.
+
+        Args:
+            path: The file to write
+            mode: "w" for text or "wb" for bytes
+
+        Yields:
+            An in-memory file
+        """
+        buffer = io.BytesIO() if "b" in mode else io.StringIO()
+        yield buffer
+        self.write(path, buffer.getvalue())
+
+    def copy(self, source: Path, path: Path) -> bool:
+        """
+        Copy a file with its metadata, unless path already has its content.
+
+        Args:
+            source: The file to copy
+            path: Where to copy it
+
+        Returns:
+            Whether the file was copied
+        """
+        written = not _is_copy(source, path)
+        if written:
+            shutil.copy2(source, path)
+        self.produced[path] = written
+        return written
+
+    def link(self, source: Path, path: Path) -> bool:
+        """
+        Hard-link a file, unless path already has its content.
+
+        Linking avoids copying large files such as images. Where hard links
+        are not possible, e.g. across file systems, the file is copied.
+
+        Args:
+            source: The file to link to
+            path: Where to link it
+
+        Returns:
+            Whether the file was linked or copied
+        """
+        written = not _is_copy(source, path)
+        if written:
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp_path.unlink(missing_ok=True)
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                shutil.copy2(source, tmp_path)
+            os.replace(tmp_path, path)
+        self.produced[path] = written
+        return written
+
+    def keep(self, path: Path) -> None:
+        """Record a file that is known to be up to date as produced."""
+        self.produced[path] = False
+
+    def record(self, produced: Dict[Path, bool]) -> None:
+        """Record files produced elsewhere, e.g. in a worker process."""
+        self.produced.update(produced)
+
+    def take(self) -> Dict[Path, bool]:
+        """Return the files produced since the last call and forget them."""
+        produced = self.produced
+        self.produced = {}
+        return produced
+
+    def remove_orphans(self, directories: Iterable[Path]) -> List[Path]:
+        """
+        Delete the files in directories that were not produced.
+
+        Directories left empty are removed as well.
+
+        Args:
+            directories: Directories whose whole content the build owns
+
+        Returns:
+            The files that were deleted
+        """
+        removed = []
+        for directory in directories:
+            if not directory.is_dir():
+                continue
+            for path in sorted(directory.rglob("*"), reverse=True):
+                if path.is_dir():
+                    if not any(path.iterdir()):
+                        path.rmdir()
+                elif path not in self.produced:
+                    path.unlink()
+                    removed.append(path)
+            if not any(directory.iterdir()):
+                directory.rmdir()
+        return removed
+
+
+# Shared by all build steps, so one build's output is synced as a whole
+site_output = OutputSync()
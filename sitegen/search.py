@@ -0,0 +1,175 @@
+"""
+Full-text search index of the examples, for static/js/search.js.
+
+The index is inverted: it maps each term to the examples it occurs in, with
+a score that weighs where it occurs (a title counts more than code). Terms
+come from titles, descriptions, annotations, identifiers and strings in
+the code, and shell commands. Words are lowercased and lightly stemmed.
+Identifiers are kept whole as well as split into their words, so both
+"generate_content" and "content" find generate_content.
+
+Terms are sharded by their first character, so a query only downloads the
+shards of its terms' first characters. Within a shard the terms are
+sorted, so prefixes can be looked up with a binary search as the reader
+types. The shards are published under fingerprinted names and listed in
+search/index.json with the examples' titles.
+
+Examples only need id, title, description and section_title attributes,
+code_segments with annotation and display_code, and shell_segments with
+explanation and command.
+"""
+
+import json
+import keyword
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from sitegen.assets import publish_asset
+from sitegen.output import site_output
+
+# Weight of a term occurring in each part of an example
+FIELD_WEIGHTS = {
+    "title": 10,
+    "section": 3,
+    "description": 4,
+    "annotation": 2,
+    "code": 1,
+    "shell": 1,
+}
+
+# Occurrences beyond this many per field do not add to a term's score
+MAX_OCCURRENCES = 3
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+
+# Words of camelCase and snake_case identifiers
+WORD_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+TAG_PATTERN = re.compile(r"<[^>]*>")
+
+# (suffix, replacement) rules of stem(); search.js has the same ones
+STEM_RULES = (("ies", "y"), ("sses", "ss"), ("ing", ""), ("ed", ""))
+
+
+def stem(word: str) -> str:
+    """
+    Reduce a lowercase word to its stem, e.g. "generated" to "generat".
+
+    A deliberately light stemmer: plural and verb endings and a final "e"
+    are removed, leaving at least three characters. static/js/search.js
+    stems queries the same way.
+    """
+    for suffix, replacement in STEM_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)] + replacement
+            break
+    else:
+        if len(word) > 3 and word[-1] == "s" and not word.endswith(("ss", "us", "is")):
+            word = word[:-1]
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def terms(text: str, code: bool = False) -> Iterator[str]:
+    """
+    Extract the index terms of a text.
+
+    Args:
+        text: Plain text, HTML or code
+        code: Whether text is code, whose language keywords are skipped
+
+    Yields:
+        Stemmed terms, with repeats
+    """
+    for token in TOKEN_PATTERN.findall(TAG_PATTERN.sub(" ", text)):
+        if code and keyword.iskeyword(token):
+            continue
+        words = WORD_PATTERN.findall(token)
+        if len(words) != 1 or words[0] != token:
+            yield stem(token.lower())
+        for word in words:
+            yield stem(word.lower())
+
+
+def _example_fields(example: Any) -> Iterator[Tuple[str, str, bool]]:
+    """Yield the (field, text, is_code) parts of an example."""
+    yield "title", example.title, False
+    yield "section", example.section_title or "", False
+    yield "description", example.description, False
+    for segment in example.code_segments:
+        yield "annotation", segment.annotation, False
+        yield "code", segment.display_code, True
+    for segment in example.shell_segments:
+        yield "annotation", segment.explanation or "", False
+        yield "shell", segment.command, False
+
+
+def build_search_index(examples: Sequence[Any]) -> Dict[str, Dict[int, int]]:
+    """
+    Score every term of every example.
+
+    Args:
+        examples: The examples, in catalog order
+
+    Returns:
+        Score of each example (by position) for each term
+    """
+    index: Dict[str, Dict[int, int]] = defaultdict(dict)
+    for number, example in enumerate(examples):
+        counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        for field, text, is_code in _example_fields(example):
+            for term in terms(text, code=is_code):
+                counts[term, field] += 1
+        for (term, field), count in counts.items():
+            postings = index[term]
+            score = FIELD_WEIGHTS[field] * min(count, MAX_OCCURRENCES)
+            postings[number] = postings.get(number, 0) + score
+    return index
+
+
+def _to_json(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def write_search_index(examples: Sequence[Any], search_dir: Path) -> int:
+    """
+    Write the search index of the examples into a directory.
+
+    Each shard holds the sorted terms with one first character and, for
+    each term, a flat [example, score, example, score, ...] list of
+    postings, best first. index.json lists the examples as [id, title,
+    section title] and the published name of each shard.
+
+    Args:
+        examples: The examples to index, in catalog order
+        search_dir: The search directory of the site
+
+    Returns:
+        Number of terms in the index
+    """
+    index = build_search_index(examples)
+    shards: Dict[str, List[str]] = defaultdict(list)
+    for term in sorted(index):
+        shards[term[0]].append(term)
+
+    published = {}
+    for key, shard_terms in sorted(shards.items()):
+        postings = []
+        for term in shard_terms:
+            ranked = sorted(index[term].items(), key=lambda item: (-item[1], item[0]))
+            postings.append([value for posting in ranked for value in posting])
+        data = _to_json({"terms": shard_terms, "postings": postings})
+        published[key] = publish_asset(search_dir, f"{key}.json", data)
+
+    manifest = {
+        "docs": [
+            [example.id, example.title, example.section_title or ""]
+            for example in examples
+        ],
+        "shards": published,
+    }
+    site_output.write(search_dir / "index.json", _to_json(manifest))
+    return len(index)
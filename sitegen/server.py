@@ -0,0 +1,379 @@
+"""
+Local preview server for the built site.
+
+Unlike python -m http.server, it answers requests the way a production
+static host does, so pages can be profiled locally:
+
+- Strong ETags from the hash of each file's content, and 304 responses to
+  requests that already have the current version (If-None-Match, or
+  If-Modified-Since without it).
+- The precompressed .br or .gz sibling of a file (see sitegen.compress)
+  for clients that accept it, with Vary: Accept-Encoding.
+- Single byte ranges (Range and If-Range), e.g. to read part of
+  llms-ctx.txt.
+- Long-lived caching of fingerprinted assets (see sitegen.assets), while
+  every other file is revalidated on each use.
+
+Every request is logged with its status, encoding, size and the time taken
+to answer it. Watch mode serves the site with the live reload script added
+to every page (see SiteServer.html_snippet).
+"""
+
+import email.utils
+import hashlib
+import logging
+import mimetypes
+import posixpath
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from sitegen.assets import FINGERPRINT_PATTERN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8000
+
+# Precompressed siblings, in order of preference, by content coding
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Types that mimetypes does not know on every platform
+MIME_TYPES = {
+    ".js": "text/javascript",
+    ".json": "application/json",
+    ".woff2": "font/woff2",
+    ".woff": "font/woff",
+    ".avif": "image/avif",
+    ".webp": "image/webp",
+}
+
+# Cache-Control of fingerprinted assets and of every other file
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+CHUNK_SIZE = 64 * 1024
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def content_type(path: Path) -> str:
+    """Return the Content-Type of a file, with a charset for text."""
+    mime = MIME_TYPES.get(path.suffix) or mimetypes.guess_type(path.name)[0]
+    if mime is None:
+        return "application/octet-stream"
+    if mime.startswith("text/") or mime in ("application/json", "image/svg+xml"):
+        return f"{mime}; charset=utf-8"
+    return mime
+
+
+def accepted_encodings(header: Optional[str]) -> List[str]:
+    """
+    Parse an Accept-Encoding header.
+
+    Args:
+        header: The header value, if the request has one
+
+    Returns:
+        Content codings with a non-zero quality, e.g. ["gzip", "br"]
+    """
+    encodings = []
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            encodings.append(coding.strip().lower())
+    return encodings
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header with a single byte range.
+
+    Args:
+        header: The header value, e.g. "bytes=0-1023" or "bytes=-500"
+        size: Size of the file in bytes
+
+    Returns:
+        First and last byte of the range, clamped to the file, or None if
+        the range starts past the end of the file or asks for the end of an
+        empty file
+
+    Raises:
+        ValueError: If the header is not a valid single byte range (e.g.
+            "bytes=5-3"), in which case it is ignored and the whole file
+            sent, as RFC 9110 requires
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None or match.groups() == ("", ""):
+        raise ValueError(f"Unsupported range: {header}")
+    first, last = match.groups()
+    if first == "":
+        # The last n bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and start > int(last):
+        raise ValueError(f"Invalid range: {header}")
+    if start >= size:
+        return None
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def add_snippet(page: bytes, snippet: bytes) -> bytes:
+    """Insert HTML at the end of a page's body."""
+    end = page.rfind(b"</body>")
+    if end == -1:
+        return page + snippet
+    return page[:end] + snippet + page[end:]
+
+
+class SiteServer(ThreadingHTTPServer):
+    """
+    Serves a built site, one thread per connection.
+
+    Attributes:
+        docs_dir: The site's root directory
+        html_snippet: HTML added to the end of every page as it is served,
+            e.g. the live reload script of watch mode, which thus never
+            ends up in the files
+        etags: Content hash of each file served, with the mtime and size it
+            was computed for
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        docs_dir: Path,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        html_snippet: Optional[str] = None,
+    ):
+        self.docs_dir = docs_dir.resolve()
+        self.html_snippet = html_snippet.encode() if html_snippet is not None else None
+        self.etags: Dict[Path, Tuple[int, int, str]] = {}
+        self._etags_lock = threading.Lock()
+        super().__init__((host, port), SiteRequestHandler)
+
+    def etag(self, path: Path, mtime_ns: int, size: int) -> str:
+        """Return the strong ETag of a file, hashing it once per version."""
+        with self._etags_lock:
+            cached = self.etags.get(path)
+        if cached is not None and cached[:2] == (mtime_ns, size):
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:32]}"'
+        with self._etags_lock:
+            self.etags[path] = (mtime_ns, size, etag)
+        return etag
+
+
+class SiteRequestHandler(BaseHTTPRequestHandler):
+    """Answers GET and HEAD requests for the files of a SiteServer."""
+
+    server: SiteServer
+    protocol_version = "HTTP/1.1"
+    server_version = "SiteServer"
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def log_message(self, format: str, *args) -> None:
+        # Requests are logged by _serve with their timing instead
+        logger.debug(format % args)
+
+    def log_error(self, format: str, *args) -> None:
+        logger.warning(format % args)
+
+    def _resolve(self, url_path: str) -> Optional[Path]:
+        """Map a URL path to a file in the site, or None if there is none."""
+        path = posixpath.normpath(unquote(url_path))
+        parts = [part for part in path.split("/") if part]
+        # Hidden files include the temporary files of a running build
+        if any(part.startswith(".") for part in parts):
+            return None
+        file = self.server.docs_dir.joinpath(*parts)
+        if file.is_dir():
+            file = file / "index.html"
+        return file if file.is_file() else None
+
+    def _serve(self, send_body: bool) -> None:
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        url_path = url.path
+        file = self._resolve(url_path)
+        if file is None:
+            self._send_empty(HTTPStatus.NOT_FOUND, start)
+            return
+        if file.name == "index.html" and not url_path.endswith(("/", ".html")):
+            # Let relative links in the page resolve against its directory
+            location = f"{url_path}/" + (f"?{url.query}" if url.query else "")
+            self._send_empty(
+                HTTPStatus.MOVED_PERMANENTLY, start, {"Location": location}
+            )
+            return
+
+        encoding = None
+        body_file = file
+        data = None
+        stat = file.stat()
+        if self.server.html_snippet is not None and file.suffix == ".html":
+            # Pages get the snippet as they are served, so they are sent
+            # uncompressed and tagged by what is sent
+            data = add_snippet(file.read_bytes(), self.server.html_snippet)
+            etag = f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+            size = len(data)
+        else:
+            # Serve the smallest version the client accepts
+            accepted = accepted_encodings(self.headers.get("Accept-Encoding"))
+            for coding, suffix in ENCODINGS:
+                sibling = file.with_name(file.name + suffix)
+                if coding in accepted and sibling.is_file():
+                    encoding, body_file = coding, sibling
+                    break
+            stat = body_file.stat()
+            etag = self.server.etag(body_file, stat.st_mtime_ns, stat.st_size)
+            size = stat.st_size
+        last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Cache-Control": (
+                IMMUTABLE if FINGERPRINT_PATTERN.match(file.name) else REVALIDATE
+            ),
+            "Vary": "Accept-Encoding",
+        }
+
+        if self._not_modified(etag, stat.st_mtime):
+            self._send_empty(HTTPStatus.NOT_MODIFIED, start, headers, encoding)
+            return
+
+        status = HTTPStatus.OK
+        first, last = 0, size - 1
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) in (etag, last_modified):
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                byte_range = (first, last)
+            else:
+                if byte_range is None:
+                    headers["Content-Range"] = f"bytes */{size}"
+                    self._send_empty(
+                        HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, start, headers
+                    )
+                    return
+                status = HTTPStatus.PARTIAL_CONTENT
+                headers["Content-Range"] = (
+                    f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+                )
+            first, last = byte_range
+        length = last - first + 1
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type(file))
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body and data is not None:
+            self.wfile.write(data[first : last + 1])
+        elif send_body:
+            with open(body_file, "rb") as f:
+                f.seek(first)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        self._log_request(status, encoding, length if send_body else 0, start)
+
+    def _not_modified(self, etag: str, mtime: float) -> bool:
+        """Return whether the client's cached copy is current."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            # Weak comparison, as RFC 9110 requires for If-None-Match
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since.timestamp()
+
+    def _send_empty(
+        self,
+        status: HTTPStatus,
+        start: float,
+        headers: Optional[Dict[str, str]] = None,
+        encoding: Optional[str] = None,
+    ) -> None:
+        """Send a response without a body."""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        # A 304 has no Content-Length of its own; it would describe the
+        # cached representation (RFC 9110, section 8.6)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", "0")
+        self.end_headers()
+        self._log_request(status, encoding, 0, start)
+
+    def _log_request(
+        self, status: int, encoding: Optional[str], sent: int, start: float
+    ) -> None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"{self.command} {self.path} {status} {encoding or '-'} "
+            f"{sent} B in {elapsed_ms:.1f} ms"
+        )
+
+
+def serve_site(
+    docs_dir: Path, host: str = "127.0.0.1", port: int = DEFAULT_PORT
+) -> None:
+    """
+    Serve a built site until interrupted.
+
+    Args:
+        docs_dir: The site's root directory
+        host: Address to listen on
+        port: Port to listen on, or 0 for any free port
+    """
+    with SiteServer(docs_dir, host, port) as server:
+        host, port = server.server_address[:2]
+        logger.info(
+            f"Serving {docs_dir} at http://{host}:{port}/ (press Ctrl+C to stop)"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Stopped serving")
@@ -0,0 +1,216 @@
+"""
+Precompiled HTML templates.
+
+Templates use a small subset of Jinja syntax:
+
+    {{ expression }}        insert str(expression)
+    {{ expression | e }}    insert it HTML-escaped
+    {% if ... %} / {% elif ... %} / {% else %} / {% endif %}
+    {% for ... in ... %} / {% endfor %}
+    {% set name = expression %}
+    {# comment #}
+
+Expressions are plain Python, evaluated with the template's declared
+parameters and loop variables as locals. As with Jinja's trim_blocks and
+lstrip_blocks options, a block tag or comment on a line of its own does
+not leave its indentation or line break in the output.
+
+Each template is compiled once into a Python function that collects the
+output in a single list, with everything between two tags appended as one
+concatenation, so rendering a page costs one function call.
+"""
+
+import re
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+TOKEN_PATTERN = re.compile(r"{{(.*?)}}|{%(.*?)%}|{#.*?#}", re.DOTALL)
+FILTER_PATTERN = re.compile(r"^(.*?)\s*\|\s*(e|escape)\s*$", re.DOTALL)
+
+# Block keywords and the keyword that closes them
+BLOCK_ENDS = {"if": "endif", "for": "endfor"}
+
+
+class TemplateSyntaxError(Exception):
+    """Raised when a template cannot be compiled."""
+
+
+def _line_number(source: str, position: int) -> int:
+    return source.count("\n", 0, position) + 1
+
+
+def generate_code(source: str, params: Sequence[str], name: str) -> str:
+    """
+    Translate a template into the source of a Python render function.
+
+    Args:
+        source: The template text
+        params: Names of the render function's parameters
+        name: Template name used in error messages
+
+    Returns:
+        Python source defining render(*params), which returns the output
+        as a list of strings
+    """
+    code = [
+        f"def render({', '.join(params)}):",
+        "    _parts = []",
+        "    _append = _parts.append",
+    ]
+    depth = 1
+    open_blocks: List[str] = []
+
+    # Output between two tags is appended as one concatenation
+    pending: List[str] = []
+
+    def emit(line: str) -> None:
+        code.append("    " * depth + line)
+
+    def flush() -> None:
+        if pending:
+            emit(f"_append({' + '.join(pending)})")
+            pending.clear()
+
+    position = 0
+    at_line_start = True
+    trim_newline = False
+    for match in TOKEN_PATTERN.finditer(source):
+        text = source[position : match.start()]
+        position = match.end()
+        expression, statement = match.group(1), match.group(2)
+        is_block = expression is None
+
+        if trim_newline and text.startswith("\n"):
+            text = text[1:]
+        if "\n" in text:
+            at_line_start = True
+
+        if is_block:
+            # Drop the indentation of a block tag that starts its line
+            line_start = text.rfind("\n") + 1
+            if at_line_start and not text[line_start:].strip(" \t"):
+                text = text[:line_start]
+        if text:
+            pending.append(repr(text))
+
+        line = _line_number(source, match.start())
+        if expression is not None:
+            expression = expression.strip()
+            filtered = FILTER_PATTERN.match(expression)
+            if filtered:
+                pending.append(f"_escape(str({filtered.group(1)}))")
+            else:
+                pending.append(f"str({expression})")
+            at_line_start = False
+            trim_newline = False
+            continue
+
+        # Block tags and comments swallow the line break that follows them
+        at_line_start = source.startswith("\n", position)
+        trim_newline = True
+        if statement is None:
+            continue
+        flush()
+
+        statement = statement.strip()
+        keyword = statement.split(None, 1)[0] if statement else ""
+        if keyword in BLOCK_ENDS:
+            emit(f"{statement}:")
+            depth += 1
+            emit("pass")
+            open_blocks.append(keyword)
+        elif keyword in ("elif", "else"):
+            if not open_blocks or open_blocks[-1] != "if":
+                raise TemplateSyntaxError(f"{name}:{line}: {keyword} outside if")
+            depth -= 1
+            emit(f"{statement}:")
+            depth += 1
+            emit("pass")
+        elif keyword in BLOCK_ENDS.values():
+            if not open_blocks or BLOCK_ENDS[open_blocks[-1]] != keyword:
+                raise TemplateSyntaxError(f"{name}:{line}: unexpected {keyword}")
+            open_blocks.pop()
+            depth -= 1
+        elif keyword == "set":
+            emit(statement[len("set") :].strip())
+        else:
+            raise TemplateSyntaxError(f"{name}:{line}: unknown tag {statement!r}")
+
+    if open_blocks:
+        raise TemplateSyntaxError(f"{name}: unclosed {open_blocks[-1]} block")
+
+    text = source[position:]
+    if trim_newline and text.startswith("\n"):
+        text = text[1:]
+    if text:
+        pending.append(repr(text))
+    flush()
+    emit("return _parts")
+    return "\n".join(code) + "\n"
+
+
+class Template:
+    """
+    A template compiled into a Python function.
+
+    Attributes:
+        name: Template name, used in error messages and tracebacks
+        params: Names the template is rendered with
+        code: Generated Python source of the render function
+    """
+
+    __slots__ = ("_render", "code", "name", "params")
+
+    def __init__(self, source: str, params: Sequence[str], name: str = "<template>"):
+        self.name = name
+        self.params = tuple(params)
+        self.code = generate_code(source, self.params, name)
+        namespace: Dict[str, Any] = {"_escape": escape}
+        try:
+            # Templates only come from the repository's templates/ directory
+            # (see load_template), so the generated code is as trusted as
+            # the build scripts themselves
+            exec(compile(self.code, name, "exec"), namespace)  # noqa: S102
+        except SyntaxError as e:
+            raise TemplateSyntaxError(f"{name}: invalid expression: {e}") from e
+        self._render = namespace["render"]
+
+    def render(self, **context: Any) -> str:
+        """Render the template with values for all of its parameters."""
+        return "".join(self._render(**context))
+
+    def render_bytes(self, **context: Any) -> bytes:
+        """
+        Render the template as UTF-8.
+
+        The parts are encoded one at a time: a single non-ASCII character
+        would otherwise take the whole page off CPython's fast path for
+        encoding ASCII text, which costs more than rendering it.
+        """
+        return b"".join([part.encode() for part in self._render(**context)])
+
+
+# Directory holding the site's .html templates
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+
+_compiled: Dict[str, Template] = {}
+
+
+def load_template(name: str, params: Sequence[str]) -> Template:
+    """
+    Return a template from the templates directory, compiling it on first use.
+
+    Args:
+        name: File name inside templates/
+        params: Names the template is rendered with
+
+    Returns:
+        The compiled template
+    """
+    template = _compiled.get(name)
+    if template is None or template.params != tuple(params):
+        source = (TEMPLATES_DIR / name).read_text(encoding="utf-8")
+        template = Template(source, params, name)
+        _compiled[name] = template
+    return template
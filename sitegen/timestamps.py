@@ -0,0 +1,138 @@
+"""
+Content-derived "last updated" dates.
+
+A page's date is the newest modification time of the files it is built
+from, so rebuilding unchanged inputs reproduces the same bytes. Files that
+are committed and unmodified in git use the date of their last commit
+instead, since a fresh checkout gives every file the time of the checkout.
+If SOURCE_DATE_EPOCH is set, no date is later than it
+(https://reproducible-builds.org/specs/source-date-epoch/).
+"""
+
+import logging
+import os
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def source_date_epoch() -> Optional[int]:
+    """Return SOURCE_DATE_EPOCH as a timestamp, if it is set and valid."""
+    value = os.environ.get("SOURCE_DATE_EPOCH")
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid SOURCE_DATE_EPOCH: {value!r}")
+        return None
+
+
+def _git(directory: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "core.quotepath=off", *args],
+        cwd=directory,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def git_commit_times(directory: Path, *pathspecs: str) -> Dict[Path, int]:
+    """
+    Find the last commit time of the files under a directory.
+
+    Files with uncommitted changes and untracked files are left out, as
+    their content is newer than any commit.
+
+    Args:
+        directory: Directory inside a git work tree
+        *pathspecs: Limit the search to these paths (default: all of directory)
+
+    Returns:
+        Commit timestamp of each committed, unmodified file, keyed by
+        resolved path. Empty if git or the repository is not available.
+    """
+    pathspecs = pathspecs or (".",)
+    try:
+        top_level = Path(_git(directory, "rev-parse", "--show-toplevel").strip())
+        log = _git(
+            directory, "log", "--format=%x00%ct", "--name-only", "--", *pathspecs
+        )
+        status = _git(
+            directory,
+            "status",
+            "--porcelain",
+            "-z",
+            "--untracked-files=all",
+            "--",
+            *pathspecs,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.info(f"Using file modification times, git history unavailable: {e}")
+        return {}
+
+    # The log is newest first, so the first time seen for a file is its last
+    times: Dict[Path, int] = {}
+    for commit in log.split("\0")[1:]:
+        timestamp, _, names = commit.partition("\n")
+        for name in names.splitlines():
+            if name:
+                times.setdefault(top_level / name, int(timestamp))
+
+    # "XY path" entries, unquoted; renames and copies are "XY new" followed
+    # by an entry with the old path, which is no longer in the tree
+    entries = iter(status.split("\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        times.pop(top_level / entry[3:], None)
+        if entry[0] in "RC" or entry[1] in "RC":
+            next(entries, None)
+    return times
+
+
+def last_updated(
+    files: Iterable[Tuple[Path, int]],
+    commit_times: Dict[Path, int],
+    epoch: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Return the date of the newest of a set of files.
+
+    Args:
+        files: Resolved path and modification time (in ns) of each file
+        commit_times: Result of git_commit_times
+        epoch: Latest date allowed, usually source_date_epoch()
+
+    Returns:
+        A timestamp, or None if there are no files
+    """
+    newest = None
+    for path, mtime_ns in files:
+        timestamp = commit_times.get(path, mtime_ns // 1_000_000_000)
+        if newest is None or timestamp > newest:
+            newest = timestamp
+    if newest is not None and epoch is not None:
+        newest = min(newest, epoch)
+    return newest
+
+
+def format_date(timestamp: Optional[int] = None) -> str:
+    """
+    Format a timestamp the way pages show their "last updated" date.
+
+    Args:
+        timestamp: Seconds since the epoch; the current time if None
+
+    Returns:
+        The date in UTC, e.g. "March 4, 2025"
+    """
+    if timestamp is None:
+        moment = datetime.now(timezone.utc)
+    else:
+        moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.strftime("%B %-d, %Y")
@@ -0,0 +1,219 @@
+"""
+File watching for the site's watch mode.
+
+On Linux, FileWatcher uses inotify through ctypes, so changes are picked up
+as soon as an editor saves a file without polling the tree. On other
+platforms (or if inotify is unavailable) it falls back to comparing
+modification times every half second.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify event flags from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ATTRIB
+)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_editor_artifact(name: str) -> bool:
+    """Return True for swap, backup and hidden files editors leave behind."""
+    return (
+        name.startswith(".")
+        or name.endswith(("~", ".swp", ".swx", ".tmp"))
+        or name == "4913"
+    )
+
+
+class FileWatcher:
+    """
+    Watch a set of files and directory trees for changes.
+
+    Directories are watched recursively. Files are watched through their
+    parent directory, and only events for that file are reported.
+    """
+
+    def __init__(self, paths: Iterable[Path], debounce: float = 0.1):
+        self.debounce = debounce
+        self.roots = []
+        self.files = set()
+        for path in paths:
+            path = Path(path).resolve()
+            if path.is_dir():
+                self.roots.append(path)
+            else:
+                self.files.add(path)
+
+        self._fd = None
+        self._watches: Dict[int, Path] = {}
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+
+        if sys.platform.startswith("linux"):
+            try:
+                self._start_inotify()
+            except OSError as e:
+                logger.warning(f"inotify unavailable ({e}), falling back to polling")
+                self._fd = None
+        if self._fd is None:
+            self._snapshot = self._take_snapshot()
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    def _start_inotify(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._fd = fd
+
+        for root in self.roots:
+            self._watch_tree(root)
+        for parent in {path.parent for path in self.files}:
+            self._watch_directory(parent)
+
+    def _watch_directory(self, directory: Path) -> None:
+        wd = self._add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"{directory}: {os.strerror(errno)}")
+        self._watches[wd] = directory
+
+    def _watch_tree(self, root: Path) -> None:
+        for directory, _, _ in os.walk(root):
+            self._watch_directory(Path(directory))
+
+    def _is_relevant(self, path: Path) -> bool:
+        if is_editor_artifact(path.name):
+            return False
+        if path in self.files:
+            return True
+        return any(root == path or root in path.parents for root in self.roots)
+
+    def _read_events(self) -> Set[Path]:
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + name_len].rstrip(b"\0")
+                offset += name_len
+
+                directory = self._watches.get(wd)
+                if directory is None or mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                path = directory / os.fsdecode(name) if name else directory
+
+                # Start watching directories created inside a watched tree
+                if (
+                    mask & IN_ISDIR
+                    and mask & (IN_CREATE | IN_MOVED_TO)
+                    and any(root in path.parents for root in self.roots)
+                ):
+                    self._watch_tree(path)
+
+                if self._is_relevant(path):
+                    changed.add(path)
+
+    def _take_snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.files:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        for root in self.roots:
+            for directory, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = Path(directory) / filename
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll(self) -> Set[Path]:
+        snapshot = self._take_snapshot()
+        changed = {
+            path
+            for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        return {path for path in changed if self._is_relevant(path)}
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Block until something changes and return the changed paths.
+
+        Events arriving within the debounce interval of each other are
+        reported together, so one save produces one rebuild.
+
+        Args:
+            timeout: Give up and return an empty set after this many seconds
+
+        Returns:
+            Set of changed file and directory paths
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: Set[Path] = set()
+
+        while True:
+            remaining = (
+                None if deadline is None else max(0, deadline - time.monotonic())
+            )
+            if self._fd is not None:
+                wait_for = self.debounce if changed else remaining
+                readable, _, _ = select.select([self._fd], [], [], wait_for)
+                batch = self._read_events() if readable else set()
+            else:
+                time.sleep(self.debounce if changed else 0.5)
+                batch = self._poll()
+
+            if batch:
+                changed |= batch
+                continue
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
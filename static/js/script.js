@@ -6,38 +6,134 @@
 function copyCode(button) {
     const codeBlock = button.closest('.code').querySelector('pre');
     const code = codeBlock.textContent;
-    
-    navigator.clipboard.writeText(code).then(() => {
-        // Show "Copied!" tooltip
-        const tooltip = document.createElement('span');
-        tooltip.textContent = 'Copied!';
-        tooltip.className = 'tooltip';
-        button.parentElement.appendChild(tooltip);
-        
-        // Remove tooltip after 1 second
-        setTimeout(() => tooltip.remove(), 1000);
+    copyToClipboard(code, button);
+}
+
+// Function to copy all Python code
+document.addEventListener('DOMContentLoaded', function() {
+    const copyAllButton = document.getElementById('copy-all-python');
+    if (copyAllButton) {
+        copyAllButton.addEventListener('click', function() {
+            // The full script is published next to the page. Where it cannot
+            // be fetched (e.g. pages opened from disk), join the code blocks.
+            const code = fetch(copyAllButton.dataset.src)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(response.statusText);
+                    }
+                    return response.text();
+                })
+                .catch(() => Array.from(
+                    document.querySelectorAll('pre code.language-python'),
+                    block => block.textContent + '\n'
+                ).join(''));
+            copyPendingText(code, copyAllButton);
+        });
+    }
+});
+
+// Copy text that is still loading. Some browsers only allow writing to the
+// clipboard during the click, so they are handed the pending text.
+function copyPendingText(textPromise, element) {
+    if (navigator.clipboard && window.ClipboardItem) {
+        const item = new ClipboardItem({
+            'text/plain': textPromise.then(text => new Blob([text], { type: 'text/plain' }))
+        });
+        navigator.clipboard.write([item]).then(() => {
+            showTooltip(element, 'Copied!');
+        }).catch(() => {
+            textPromise.then(text => copyToClipboard(text, element));
+        });
+        return;
+    }
+    textPromise.then(text => copyToClipboard(text, element));
+}
+
+// Shared function to copy text and show tooltip
+function copyToClipboard(text, element) {
+    // For older browsers, fallback to textarea method
+    if (!navigator.clipboard) {
+        const textArea = document.createElement('textarea');
+        textArea.value = text;
+        textArea.style.position = 'fixed';  // Avoid scrolling to bottom
+        document.body.appendChild(textArea);
+        textArea.focus();
+        textArea.select();
+
+        try {
+            document.execCommand('copy');
+            showTooltip(element, 'Copied!');
+        } catch (err) {
+            console.error('Failed to copy text: ', err);
+            showTooltip(element, 'Error!');
+        }
+
+        document.body.removeChild(textArea);
+        return;
+    }
+
+    // Use clipboard API if available
+    navigator.clipboard.writeText(text).then(() => {
+        showTooltip(element, 'Copied!');
     }).catch(err => {
         console.error('Failed to copy text: ', err);
+        showTooltip(element, 'Error!');
     });
 }
 
+// Helper to show tooltip
+function showTooltip(element, message) {
+    // Check if there's already a tooltip
+    let tooltip = element.parentElement.querySelector('.tooltip');
+    if (tooltip) {
+        tooltip.textContent = message;
+    } else {
+        // Create and append new tooltip
+        tooltip = document.createElement('span');
+        tooltip.textContent = message;
+        tooltip.className = 'tooltip';
+        tooltip.style.position = 'absolute';
+        tooltip.style.background = '#333';
+        tooltip.style.color = 'white';
+        tooltip.style.padding = '2px 8px';
+        tooltip.style.borderRadius = '4px';
+        tooltip.style.fontSize = '12px';
+        tooltip.style.top = '-25px';
+        tooltip.style.right = '0';
+
+        // Make sure the parent has position relative for tooltip positioning
+        if (getComputedStyle(element.parentElement).position === 'static') {
+            element.parentElement.style.position = 'relative';
+        }
+
+        element.parentElement.appendChild(tooltip);
+    }
+
+    // Remove tooltip after 1.5 seconds
+    setTimeout(() => tooltip.remove(), 1500);
+}
+
 // Enable keyboard navigation between examples
 document.addEventListener('keydown', function(e) {
     if (e.ctrlKey || e.altKey || e.shiftKey || e.metaKey) {
         return;
     }
-    
+    // Leave the arrow keys to text fields such as the search box
+    if (e.target.closest('input, textarea')) {
+        return;
+    }
+
     if (e.key === 'ArrowRight') {
         const nextLink = document.querySelector('.next a');
         if (nextLink) {
             window.location.href = nextLink.getAttribute('href');
         }
     }
-    
+
     if (e.key === 'ArrowLeft') {
         const prevLink = document.querySelector('.prev a');
         if (prevLink) {
             window.location.href = prevLink.getAttribute('href');
         }
     }
-}); 
+});
@@ -0,0 +1,232 @@
+/**
+ * Search box of Gemini by Example
+ *
+ * Queries the index written by sitegen/search.py: search/index.json lists
+ * the examples and the shard of each first character, and each shard holds
+ * sorted terms with their [example, score, ...] postings. Only the shards
+ * of the query's words are downloaded, once each.
+ */
+
+(function() {
+    const MAX_RESULTS = 10;
+
+    // Same as TOKEN_PATTERN and WORD_PATTERN in sitegen/search.py
+    const TOKEN_PATTERN = /[A-Za-z0-9_]+/g;
+    const WORD_PATTERN = /[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+/g;
+    const STEM_RULES = [['ies', 'y'], ['sses', 'ss'], ['ing', ''], ['ed', '']];
+
+    let manifest = null;
+    const shards = new Map();
+    let latestQuery = 0;
+
+    // Same as stem() in sitegen/search.py
+    function stem(word) {
+        let stemmed = false;
+        for (const [suffix, replacement] of STEM_RULES) {
+            if (word.endsWith(suffix) && word.length - suffix.length >= 3) {
+                word = word.slice(0, -suffix.length) + replacement;
+                stemmed = true;
+                break;
+            }
+        }
+        if (!stemmed && word.endsWith('s') && !/(ss|us|is)$/.test(word) && word.length > 3) {
+            word = word.slice(0, -1);
+        }
+        if (word.endsWith('e') && word.length > 3) {
+            word = word.slice(0, -1);
+        }
+        return word;
+    }
+
+    // Lowercase words of a query; identifiers are split like in the index
+    function queryWords(query) {
+        const words = [];
+        for (const token of query.match(TOKEN_PATTERN) || []) {
+            for (const word of token.match(WORD_PATTERN) || []) {
+                words.push(word.toLowerCase());
+            }
+        }
+        return words;
+    }
+
+    function fetchJson(url) {
+        return fetch(url).then(response => {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            return response.json();
+        });
+    }
+
+    function loadManifest(root) {
+        if (!manifest) {
+            manifest = fetchJson(root + '/search/index.json').catch(err => {
+                manifest = null;
+                throw err;
+            });
+        }
+        return manifest;
+    }
+
+    function loadShard(root, index, key) {
+        if (!(key in index.shards)) {
+            return Promise.resolve(null);
+        }
+        if (!shards.has(key)) {
+            shards.set(key, fetchJson(root + '/search/' + index.shards[key]).catch(err => {
+                shards.delete(key);
+                throw err;
+            }));
+        }
+        return shards.get(key);
+    }
+
+    // Position of the first term not less than prefix
+    function lowerBound(terms, prefix) {
+        let low = 0;
+        let high = terms.length;
+        while (low < high) {
+            const middle = (low + high) >> 1;
+            if (terms[middle] < prefix) {
+                low = middle + 1;
+            } else {
+                high = middle;
+            }
+        }
+        return low;
+    }
+
+    // Score of each example for a word: full for its stem, half for terms
+    // it is a prefix of (as when the word is still being typed)
+    function wordScores(shard, word) {
+        const scores = new Map();
+        if (!shard) {
+            return scores;
+        }
+        const exact = stem(word);
+        const add = (position, weight) => {
+            const postings = shard.postings[position];
+            for (let i = 0; i < postings.length; i += 2) {
+                const score = postings[i + 1] * weight;
+                if (score > (scores.get(postings[i]) || 0)) {
+                    scores.set(postings[i], score);
+                }
+            }
+        };
+        const position = lowerBound(shard.terms, exact);
+        if (shard.terms[position] === exact) {
+            add(position, 1);
+        }
+        for (let i = lowerBound(shard.terms, word); i < shard.terms.length; i++) {
+            if (!shard.terms[i].startsWith(word)) {
+                break;
+            }
+            if (shard.terms[i] !== exact) {
+                add(i, 0.5);
+            }
+        }
+        return scores;
+    }
+
+    // Examples matching every word, best first
+    function rank(index, words, shardsByWord) {
+        let totals = null;
+        words.forEach((word, i) => {
+            const scores = wordScores(shardsByWord[i], word);
+            if (totals === null) {
+                totals = scores;
+                return;
+            }
+            const combined = new Map();
+            for (const [doc, score] of scores) {
+                if (totals.has(doc)) {
+                    combined.set(doc, totals.get(doc) + score);
+                }
+            }
+            totals = combined;
+        });
+        return Array.from(totals || [])
+            .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+            .slice(0, MAX_RESULTS)
+            .map(([doc]) => index.docs[doc]);
+    }
+
+    function search(root, query) {
+        const words = queryWords(query);
+        if (!words.length) {
+            return Promise.resolve([]);
+        }
+        return loadManifest(root).then(index => Promise.all(
+            words.map(word => loadShard(root, index, word[0]))
+        ).then(shardsByWord => rank(index, words, shardsByWord)));
+    }
+
+    function showResults(input, list, results) {
+        list.replaceChildren();
+        if (!input.value.trim()) {
+            list.hidden = true;
+            return;
+        }
+        if (!results.length) {
+            const item = document.createElement('li');
+            item.className = 'search-empty';
+            item.textContent = 'No examples found';
+            list.appendChild(item);
+        }
+        for (const [id, title, section] of results) {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.href = input.dataset.root + '/' + id + '/';
+            link.textContent = title;
+            item.appendChild(link);
+            if (section) {
+                const label = document.createElement('span');
+                label.className = 'search-section';
+                label.textContent = section;
+                item.appendChild(label);
+            }
+            list.appendChild(item);
+        }
+        list.hidden = false;
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const input = document.getElementById('search');
+        const list = document.getElementById('search-results');
+        if (!input || !list) {
+            return;
+        }
+        const root = input.dataset.root;
+
+        // Fetch the manifest once the reader is about to type
+        input.addEventListener('focus', () => loadManifest(root).catch(() => {}), { once: true });
+
+        input.addEventListener('input', function() {
+            const queryNumber = ++latestQuery;
+            search(root, input.value).then(results => {
+                // Drop answers to queries that were typed over meanwhile
+                if (queryNumber === latestQuery) {
+                    showResults(input, list, results);
+                }
+            }).catch(err => console.error('Search failed: ', err));
+        });
+
+        input.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') {
+                list.hidden = true;
+                input.blur();
+            } else if (e.key === 'Enter') {
+                const first = list.querySelector('a');
+                if (first) {
+                    window.location.href = first.getAttribute('href');
+                }
+            }
+        });
+
+        document.addEventListener('click', function(e) {
+            if (!e.target.closest('.search')) {
+                list.hidden = true;
+            }
+        });
+    });
+})();